@@ -0,0 +1,252 @@
+import argparse
+import asyncio
+import dataclasses
+import heapq
+import json
+import random
+import sys
+from typing import Any, AsyncIterator, Mapping, Sequence
+
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+
+SCAN_BATCH = 500
+
+TOTAL_FIELD = "*"
+
+
+def _size(value: Any) -> int:
+    return len(json.dumps(value, default=str))
+
+
+def session_name(key: StorageKey) -> str:
+    if key.thread_id:
+        return f"{key.chat_id}:{key.thread_id}:{key.user_id}"
+
+    return f"{key.chat_id}:{key.user_id}"
+
+
+def item_sizes(form_data: Any) -> dict[str, int]:
+    if isinstance(form_data, Mapping):
+        return {
+            key: _size(key) + _size(value) + 2 for key, value in form_data.items()
+        }
+
+    return {TOTAL_FIELD: _size(form_data)}
+
+
+@dataclasses.dataclass
+class SizeHistogram:
+    count: int = 0
+    total: int = 0
+    max: int = 0
+    buckets: dict[int, int] = dataclasses.field(default_factory=dict)
+
+    def add(self, size: int):
+        self.count += 1
+        self.total += size
+        self.max = max(self.max, size)
+
+        bucket = size.bit_length()
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> int:
+        if not self.count:
+            return 0
+
+        rank = q * self.count
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min(self.max, (1 << bucket) - 1)
+
+        return self.max
+
+
+class SizeRecorder:
+    sample_rate: float
+    top: int
+    forms: dict[str, SizeHistogram]
+    fields: dict[tuple[str, str], SizeHistogram]
+
+    _largest: dict[tuple[str, str], int]
+
+    def __init__(self, sample_rate: float = 1.0, top: int = 20):
+        self.sample_rate = sample_rate
+        self.top = top
+        self.forms = {}
+        self.fields = {}
+
+        self._largest = {}
+
+    def record(
+        self, form_name: str, form_data: Any, session: str | None = None
+    ) -> int | None:
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return None
+
+        sizes = item_sizes(form_data)
+        total = sum(sizes.values()) + 2
+
+        self.forms.setdefault(form_name, SizeHistogram()).add(total)
+        for key, size in sizes.items():
+            self.fields.setdefault((form_name, key), SizeHistogram()).add(size)
+
+        if session is not None and self.top > 0:
+            self._largest[(form_name, session)] = total
+            if len(self._largest) > self.top * 4:
+                self._largest = dict(
+                    heapq.nlargest(
+                        self.top, self._largest.items(), key=lambda item: item[1]
+                    )
+                )
+
+        return total
+
+    def largest_sessions(self) -> list[tuple[str, str, int]]:
+        return [
+            (form_name, session, size)
+            for (form_name, session), size in heapq.nlargest(
+                self.top, self._largest.items(), key=lambda item: item[1]
+            )
+        ]
+
+    def form_fields(self, form_name: str) -> list[tuple[str, SizeHistogram]]:
+        return sorted(
+            (
+                (key, histogram)
+                for (name, key), histogram in self.fields.items()
+                if name == form_name
+            ),
+            key=lambda item: item[1].total,
+            reverse=True,
+        )
+
+    def format_report(self) -> str:
+        lines = [
+            f"{'form / field':<40} {'count':>8} {'total':>12} "
+            f"{'mean':>8} {'p50':>8} {'p99':>8} {'max':>8}"
+        ]
+
+        def row(name: str, histogram: SizeHistogram) -> str:
+            return (
+                f"{name[:40]:<40} {histogram.count:>8} {histogram.total:>12} "
+                f"{histogram.mean:>8.0f} {histogram.quantile(0.5):>8} "
+                f"{histogram.quantile(0.99):>8} {histogram.max:>8}"
+            )
+
+        for form_name, histogram in sorted(
+            self.forms.items(), key=lambda item: item[1].total, reverse=True
+        ):
+            lines.append(row(form_name, histogram))
+            for key, field_histogram in self.form_fields(form_name):
+                lines.append(row(f"  {key}", field_histogram))
+
+        largest = self.largest_sessions()
+        if largest:
+            lines.append("")
+            lines.append(f"{'largest sessions':<40} {'form':<20} {'size':>8}")
+            for form_name, session, size in largest:
+                lines.append(f"{session[:40]:<40} {form_name[:20]:<20} {size:>8}")
+
+        return "\n".join(lines)
+
+
+def record_session(
+    recorder: SizeRecorder,
+    session: str,
+    data: Mapping[str, Any],
+    forms: Sequence[str] | None = None,
+):
+    for key, value in data.items():
+        if forms is not None and key not in forms:
+            continue
+
+        if isinstance(value, dict):
+            recorder.record(key, value, session)
+
+
+def record_memory_storage(
+    recorder: SizeRecorder,
+    storage: MemoryStorage,
+    forms: Sequence[str] | None = None,
+):
+    for key, record in list(storage.storage.items()):
+        record_session(recorder, session_name(key), record.data, forms)
+
+
+async def scan_redis(
+    redis: Any, prefix: str = "fsm", batch: int = SCAN_BATCH
+) -> AsyncIterator[tuple[str, dict[str, Any]]]:
+    pattern = f"{prefix}:*:data"
+    keys: list[Any] = []
+
+    async def load(keys: list[Any]):
+        values = await redis.mget(keys)
+        for key, value in zip(keys, values):
+            if value is None:
+                continue
+
+            if isinstance(key, bytes):
+                key = key.decode()
+
+            try:
+                data = json.loads(value)
+            except ValueError:
+                continue
+
+            if isinstance(data, dict):
+                yield key[len(prefix) + 1 : -len(":data")], data
+
+    async for key in redis.scan_iter(match=pattern, count=batch):
+        keys.append(key)
+        if len(keys) >= batch:
+            async for item in load(keys):
+                yield item
+            keys = []
+
+    if keys:
+        async for item in load(keys):
+            yield item
+
+
+async def scan(
+    url: str, prefix: str, top: int, forms: Sequence[str] | None
+) -> SizeRecorder:
+    from redis.asyncio import Redis
+
+    recorder = SizeRecorder(top=top)
+    redis = Redis.from_url(url)
+    try:
+        async for session, data in scan_redis(redis, prefix):
+            record_session(recorder, session, data, forms)
+    finally:
+        await redis.aclose()
+
+    return recorder
+
+
+def main(argv: Sequence[str] | None = None):
+    parser = argparse.ArgumentParser(
+        prog="python -m aiogram_forms.accounting",
+        description="Report the size of form data kept in a Redis FSM storage",
+    )
+    parser.add_argument("url", help="Redis URL, e.g. redis://localhost:6379/0")
+    parser.add_argument("--prefix", default="fsm", help="key prefix of the storage")
+    parser.add_argument("--top", type=int, default=20, help="largest sessions shown")
+    parser.add_argument(
+        "--form", action="append", dest="forms", help="report only these forms"
+    )
+    args = parser.parse_args(argv)
+
+    recorder = asyncio.run(scan(args.url, args.prefix, args.top, args.forms))
+    print(recorder.format_report())
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,433 @@
+import asyncio
+from collections import OrderedDict
+import dataclasses
+import json
+import logging
+from pathlib import Path
+import time
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    Protocol,
+)
+
+from aiogram import Bot
+from aiogram.exceptions import (
+    TelegramBadRequest,
+    TelegramForbiddenError,
+    TelegramMigrateToChat,
+    TelegramNetworkError,
+    TelegramRetryAfter,
+    TelegramServerError,
+)
+from aiogram.types import InlineKeyboardMarkup, ReplyKeyboardMarkup
+
+from aiogram_forms.scheduling import Priority, priority
+from aiogram_forms.utils import gather_calls
+
+logger = logging.getLogger(__name__)
+
+BROADCAST_SENT = "sent"
+BROADCAST_FAILED = "failed"
+BROADCAST_ERROR = "error"
+
+PERMANENT_ERRORS = (TelegramForbiddenError, TelegramBadRequest, TelegramMigrateToChat)
+TRANSIENT_ERRORS = (TelegramNetworkError, TelegramServerError)
+
+
+class TokenBucket:
+    rate: float
+    capacity: float
+
+    _tokens: float
+    _updated_at: float
+    _paused_until: float
+    _lock: asyncio.Lock
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def pause(self, delay: float):
+        self._paused_until = max(self._paused_until, time.monotonic() + delay)
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated_at) * self.rate
+                )
+                self._updated_at = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class BroadcastProgress(Protocol):
+    async def completed(self) -> set[int]: ...
+
+    async def record(
+        self,
+        chat_id: int,
+        status: str,
+        message_id: int | None = None,
+        error: str | None = None,
+    ) -> None: ...
+
+    async def flush(self) -> None: ...
+
+
+class JsonLinesProgress:
+    path: Path
+
+    _buffer: list[str]
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+
+        self._buffer = []
+
+    async def completed(self) -> set[int]:
+        try:
+            file = open(self.path)
+        except FileNotFoundError:
+            return set()
+
+        completed = set()
+        with file:
+            for line in file:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+
+                if entry.get("status") in (BROADCAST_SENT, BROADCAST_FAILED):
+                    completed.add(entry["chat_id"])
+
+        return completed
+
+    async def record(
+        self,
+        chat_id: int,
+        status: str,
+        message_id: int | None = None,
+        error: str | None = None,
+    ) -> None:
+        self._buffer.append(
+            json.dumps(
+                {
+                    "chat_id": chat_id,
+                    "status": status,
+                    "message_id": message_id,
+                    "error": error,
+                }
+            )
+        )
+
+    async def flush(self) -> None:
+        if not self._buffer:
+            return
+
+        lines, self._buffer = self._buffer, []
+        with open(self.path, "a") as file:
+            file.write("\n".join(lines) + "\n")
+
+
+@dataclasses.dataclass
+class BroadcastReport:
+    sent: int = 0
+    failed: int = 0
+    skipped: int = 0
+    retries: int = 0
+    errors: dict[int, str] = dataclasses.field(default_factory=dict)
+    started_at: float = dataclasses.field(default_factory=time.monotonic)
+
+    @property
+    def processed(self) -> int:
+        return self.sent + self.failed
+
+    @property
+    def rate(self) -> float:
+        elapsed = time.monotonic() - self.started_at
+        return self.processed / elapsed if elapsed > 0 else 0.0
+
+
+class Broadcaster:
+    bot: Bot
+    rate: float
+    per_chat_interval: float
+    concurrency: int
+    write_batch: int
+    max_retries: int
+    max_flood_retries: int
+    max_errors: int
+    progress: BroadcastProgress | None
+    on_progress: Callable[[BroadcastReport], Any] | None
+    report_every: int
+
+    _bucket: TokenBucket
+    _last_sent: OrderedDict[int, float]
+
+    def __init__(
+        self,
+        bot: Bot,
+        rate: float = 25.0,
+        per_chat_interval: float = 1.0,
+        concurrency: int = 16,
+        write_batch: int = 100,
+        max_retries: int = 3,
+        max_flood_retries: int = 10,
+        max_errors: int = 1000,
+        progress: BroadcastProgress | None = None,
+        on_progress: Callable[[BroadcastReport], Any] | None = None,
+        report_every: int = 1000,
+    ):
+        self.bot = bot
+        self.rate = rate
+        self.per_chat_interval = per_chat_interval
+        self.concurrency = concurrency
+        self.write_batch = write_batch
+        self.max_retries = max_retries
+        self.max_flood_retries = max_flood_retries
+        self.max_errors = max_errors
+        self.progress = progress
+        self.on_progress = on_progress
+        self.report_every = report_every
+
+        self._bucket = TokenBucket(rate)
+        self._last_sent = OrderedDict()
+
+    async def _wait_chat(self, chat_id: int):
+        expired = time.monotonic() - self.per_chat_interval
+        while self._last_sent:
+            oldest, last_sent = next(iter(self._last_sent.items()))
+            if last_sent > expired:
+                break
+
+            del self._last_sent[oldest]
+
+        last_sent = self._last_sent.get(chat_id)
+        if last_sent is not None:
+            delay = last_sent + self.per_chat_interval - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+        self._last_sent[chat_id] = time.monotonic()
+        self._last_sent.move_to_end(chat_id)
+
+    async def _send(
+        self,
+        chat_id: int,
+        text: str,
+        reply_markup: InlineKeyboardMarkup | ReplyKeyboardMarkup | None,
+        report: BroadcastReport,
+    ) -> int:
+        attempt = 0
+        floods = 0
+        while True:
+            await self._wait_chat(chat_id)
+            await self._bucket.acquire()
+
+            try:
+                message = await self.bot.send_message(
+                    chat_id=chat_id, text=text, reply_markup=reply_markup
+                )
+                return message.message_id
+
+            except TelegramRetryAfter as e:
+                if floods >= self.max_flood_retries:
+                    raise
+
+                logger.warning(f"Flood limit exceeded, pausing for {e.retry_after}s")
+                self._bucket.pause(e.retry_after)
+                floods += 1
+                report.retries += 1
+                continue
+
+            except TRANSIENT_ERRORS:
+                if attempt >= self.max_retries:
+                    raise
+
+                await asyncio.sleep(2**attempt)
+
+            attempt += 1
+            report.retries += 1
+
+    async def run(
+        self,
+        chat_ids: AsyncIterable[int] | Iterable[int],
+        text: str,
+        reply_markup: InlineKeyboardMarkup | ReplyKeyboardMarkup | None,
+        save: Callable[[list[tuple[int, int]]], Awaitable[Any]],
+        prepare: Callable[[int], Awaitable[Any]] | None = None,
+        write_concurrency: int = 32,
+    ) -> BroadcastReport:
+        report = BroadcastReport()
+        completed = set() if self.progress is None else await self.progress.completed()
+
+        queue: asyncio.Queue[int | None] = asyncio.Queue(maxsize=self.concurrency * 2)
+        sent: list[tuple[int, int]] = []
+        write_lock = asyncio.Lock()
+
+        async def flush_sent():
+            async with write_lock:
+                batch, sent[:] = list(sent), []
+                if not batch:
+                    return
+
+                await save(batch)
+
+                if self.progress is not None:
+                    for chat_id, message_id in batch:
+                        await self.progress.record(
+                            chat_id, BROADCAST_SENT, message_id=message_id
+                        )
+                    await self.progress.flush()
+
+        async def fail(chat_id: int, status: str, error: Exception):
+            logger.debug(f"Broadcast to {chat_id} failed: {error}")
+            report.failed += 1
+            if len(report.errors) < self.max_errors:
+                report.errors[chat_id] = str(error)
+
+            if self.progress is not None:
+                await self.progress.record(chat_id, status, error=str(error))
+
+        async def prepare_chat(chat_id: int) -> Exception | None:
+            try:
+                await prepare(chat_id)
+            except Exception as e:
+                return e
+
+            return None
+
+        async def prepare_chunk(chunk: list[int]) -> list[Exception | None]:
+            return await gather_calls(
+                *(prepare_chat(chat_id) for chat_id in chunk), limit=write_concurrency
+            )
+
+        async def enqueue(chunk: list[int], errors: list[Exception | None]):
+            for chat_id, error in zip(chunk, errors):
+                if error is None:
+                    await queue.put(chat_id)
+                    continue
+
+                logger.warning(f"Exception {error} raised in broadcast to {chat_id}")
+                await fail(chat_id, BROADCAST_ERROR, error)
+
+        async def pending_chats() -> AsyncIterator[int]:
+            if isinstance(chat_ids, AsyncIterable):
+                async for chat_id in chat_ids:
+                    yield chat_id
+            else:
+                for chat_id in chat_ids:
+                    yield chat_id
+
+        async def worker():
+            while (chat_id := await queue.get()) is not None:
+                try:
+                    message_id = await self._send(chat_id, text, reply_markup, report)
+
+                except PERMANENT_ERRORS as e:
+                    await fail(chat_id, BROADCAST_FAILED, e)
+
+                except (TelegramRetryAfter, *TRANSIENT_ERRORS) as e:
+                    await fail(chat_id, BROADCAST_ERROR, e)
+
+                except Exception as e:
+                    logger.warning(f"Exception {e} raised in broadcast to {chat_id}")
+                    await fail(chat_id, BROADCAST_ERROR, e)
+
+                else:
+                    report.sent += 1
+                    sent.append((chat_id, message_id))
+                    if len(sent) >= self.write_batch:
+                        await flush_sent()
+
+                if report.processed % self.report_every == 0:
+                    logger.info(
+                        f"Broadcast: {report.sent} sent, {report.failed} failed, "
+                        f"{report.skipped} skipped ({report.rate:.1f}/s)"
+                    )
+                    if self.on_progress is not None:
+                        self.on_progress(report)
+
+        with priority(Priority.BACKGROUND):
+            workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+
+        chunk: list[int] = []
+        ahead: tuple[list[int], asyncio.Task] | None = None
+
+        async def prepare_ahead():
+            nonlocal chunk, ahead
+            prepared = None
+            if ahead is not None:
+                prepared = ahead[0], await ahead[1]
+
+            with priority(Priority.BACKGROUND):
+                preparing = asyncio.create_task(prepare_chunk(chunk))
+
+            ahead, chunk = (chunk, preparing), []
+            if prepared is not None:
+                await enqueue(*prepared)
+
+        try:
+            async for chat_id in pending_chats():
+                if chat_id in completed:
+                    report.skipped += 1
+                    continue
+
+                if prepare is None:
+                    await queue.put(chat_id)
+                    continue
+
+                chunk.append(chat_id)
+                if len(chunk) >= self.write_batch:
+                    await prepare_ahead()
+
+            if chunk:
+                await prepare_ahead()
+
+            if ahead is not None:
+                prepared = ahead[0], await ahead[1]
+                ahead = None
+                await enqueue(*prepared)
+
+            for _ in workers:
+                await queue.put(None)
+
+            await asyncio.gather(*workers)
+
+        finally:
+            for task in workers:
+                task.cancel()
+
+            if ahead is not None:
+                ahead[1].cancel()
+
+            await flush_sent()
+
+            if self.progress is not None:
+                await self.progress.flush()
+
+        if self.on_progress is not None:
+            self.on_progress(report)
+
+        return report
@@ -1,64 +1,175 @@
-from typing import Any, MutableMapping
+import asyncio
+from collections import OrderedDict
+import copy
+import logging
+from typing import Any, AsyncIterable, Awaitable, Iterable, MutableMapping
 
 from aiogram import F, Router
 from aiogram.filters import Command
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
+from aiogram.fsm.storage.base import BaseStorage, StorageKey
 from aiogram.types import (
     CallbackQuery,
-    InlineKeyboardButton,
     InlineKeyboardMarkup,
     Message,
+    ReplyKeyboardMarkup,
 )
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
-from aiogram_forms.buttons import create_close_form_button
-from aiogram_forms.callbacks.factories import FormCloseCallback, FormFieldCallback
+from aiogram_forms.accounting import SizeRecorder, session_name
+from aiogram_forms.broadcast import BroadcastReport, Broadcaster
+from aiogram_forms.buttons import STATE_TARGET_CLOSE, create_close_form_button
+from aiogram_forms.callbacks.factories import (
+    FormCloseCallback,
+    FormFieldCallback,
+    FormStateCallback,
+)
 from aiogram_forms.fields.abstract_fields import (
     FormField,
     InlineReplyField,
     MessageReplyField,
 )
 from aiogram_forms.fields.click_fields import ClickHandler
+from aiogram_forms.fields.media_fields import MediaGroupField
+from aiogram_forms.i18n import get_locale
 from aiogram_forms.modifiers.formatters import MessageFormatter
-from aiogram_forms.utils import delete_message, edit_message
+from aiogram_forms.modifiers.visibles import CompiledVisibility
+from aiogram_forms.profiling import Handler, UpdateProfiler
+from aiogram_forms.scheduling import Priority, PriorityScheduler, priority
+from aiogram_forms.schema import FormSchema
+from aiogram_forms.stateless import StateCodec
+from aiogram_forms.utils import (
+    FORM_VERSION_KEY,
+    MessageDeleter,
+    RenderTracker,
+    answer_callback,
+    delete_message,
+    edit_message,
+    gather_calls,
+    sent_messages,
+    stamp_form_data,
+    user_form_data,
+)
+
+logger = logging.getLogger(__name__)
 
 
 class FormBuilder:
     name: str
     menu_message: MessageFormatter
     preserve_data_on_restart = False
+    webhook_reply = False
+    message_deleter: MessageDeleter | None = None
+    state_codec: StateCodec | None = None
+    profiler: UpdateProfiler | None = None
+    schema: FormSchema | None = None
+    size_recorder: SizeRecorder | None = None
+    scheduler: PriorityScheduler | None = None
+    render_concurrency: int = 8
+    render_timeout: float | None = None
+    render_cache_size: int = 1024
 
     _fields: MutableMapping[str, FormField]
     _keyboard_builder: InlineKeyboardBuilder | None = None
     _states_group: type[StatesGroup]
     _states: MutableMapping[str, State]
-    _close_button: InlineKeyboardButton
+    _visibility: CompiledVisibility
+    _button_texts: OrderedDict[tuple[str, str | None], str]
+    _field_callbacks: MutableMapping[str, str]
+    _renders: RenderTracker
 
     def __init__(
-        self, name: str, menu_message: MessageFormatter, preserve_data_on_restart=False
+        self,
+        name: str,
+        menu_message: MessageFormatter,
+        preserve_data_on_restart=False,
+        render_concurrency: int = 8,
+        render_timeout: float | None = None,
+        webhook_reply=False,
+        message_deleter: MessageDeleter | None = None,
+        stateless_secret: bytes | None = None,
+        profiler: UpdateProfiler | None = None,
+        schema: FormSchema | None = None,
+        size_recorder: SizeRecorder | None = None,
+        scheduler: PriorityScheduler | None = None,
     ):
         self.name = name
         self.menu_message = menu_message
         self.preserve_data_on_restart = preserve_data_on_restart
+        self.render_concurrency = render_concurrency
+        self.render_timeout = render_timeout
+        self.webhook_reply = webhook_reply
+        self.message_deleter = message_deleter
+        self.profiler = profiler
+        self.schema = schema
+        self.size_recorder = size_recorder
+        self.scheduler = scheduler
+
+        if stateless_secret is not None:
+            self.state_codec = StateCodec(name, stateless_secret)
 
         self._fields = {}
         self._states_group = type(f"{name}-states", (StatesGroup,), {})
         self._states = {}
-        self._close_button = create_close_form_button(self.name)
+        self._visibility = CompiledVisibility()
+        self._button_texts = OrderedDict()
+        self._field_callbacks = {}
+        self._renders = RenderTracker()
 
     def add_field(self, field: FormField):
         if field.name in self._fields:
             raise ValueError(f"Field {field.name} already exists")
 
+        if self.state_codec is not None:
+            self.state_codec.add(field)
+
+            if isinstance(field, InlineReplyField):
+                field.state_codec = self.state_codec
+
         self._fields[field.name] = field
         field.parent_form_name = self.name
+        field.webhook_reply = self.webhook_reply
+        field.profiler = self.profiler
+        field.render_tracker = self._renders
+        field.form_schema = self.schema
+        field.size_recorder = self.size_recorder
+
+        self._visibility.add(field.name, field.visible)
+        self._field_callbacks[field.name] = FormFieldCallback.pack_values(
+            form_name=self.name,
+            field_name=field.name,
+        )
+        field.form_visibility = self._visibility
 
         if isinstance(field, MessageReplyField):
             field.fsm_state.set_parent(self._states_group)
 
+            if field.message_deleter is None:
+                field.message_deleter = self.message_deleter
+
             self._states[field.name] = field.fsm_state
 
+    def set_schema(self, schema: FormSchema | None = None):
+        if schema is None:
+            schema = FormSchema.from_fields(self.name, self._fields.values())
+
+        self.schema = schema
+        for field in self._fields.values():
+            field.form_schema = schema
+
+    def _profiled(
+        self, handler: Handler, handler_type: str, field_name: str | None = None
+    ) -> Handler:
+        if self.profiler is None:
+            return handler
+
+        return self.profiler.wrap(handler, self.name, field_name, handler_type)
+
+    @property
+    def fields(self) -> list[FormField]:
+        return list(self._fields.values())
+
     @property
     def root_message_name(self) -> str:
         return f"{self.name}-root_message"
@@ -73,112 +184,291 @@ class FormBuilder:
 
         return form_data
 
+    def _fallback_button_text(self, field: FormField, locale: str | None) -> str:
+        text = self._button_texts.get((field.name, locale))
+        if text is not None:
+            return text
+
+        if field.fallback_button_text is not None:
+            return field.fallback_button_text
+
+        return field.name
+
+    async def _render_button_text(
+        self,
+        field: FormField,
+        data: dict[str, Any],
+        semaphore: asyncio.Semaphore,
+        **kwargs,
+    ) -> str:
+        if isinstance(field.button_text, str):
+            return field.button_text
+
+        locale = get_locale(**kwargs)
+
+        async with semaphore:
+            try:
+                text = await asyncio.wait_for(
+                    field.button_text(data, **kwargs), self.render_timeout
+                )
+            except asyncio.TimeoutError:
+                logger.warning(f"Rendering button text of {field.name} timed out")
+                return self._fallback_button_text(field, locale)
+
+        self._button_texts[(field.name, locale)] = text
+        self._button_texts.move_to_end((field.name, locale))
+        if len(self._button_texts) > self.render_cache_size:
+            self._button_texts.popitem(last=False)
+
+        return text
+
     async def _menu_keyboard(
         self, form_data: dict[str, Any], **kwargs
     ) -> InlineKeyboardMarkup:
         builder = InlineKeyboardBuilder()
 
-        for name, field in self._fields.items():
-
-            if not all(visible(form_data, **kwargs) for visible in field.visible):
-                continue
+        data = user_form_data(form_data)
+        visibility = self._visibility.evaluate(
+            data, version=form_data.get(FORM_VERSION_KEY), **kwargs
+        )
+        fields = [field for name, field in self._fields.items() if visibility[name]]
 
-            if isinstance(field.button_text, str):
-                button_text = field.button_text
-            else:
-                button_text = await field.button_text(form_data, **kwargs)
+        semaphore = asyncio.Semaphore(self.render_concurrency)
+        buttons_texts = await asyncio.gather(
+            *(
+                self._render_button_text(field, data, semaphore, **kwargs)
+                for field in fields
+            )
+        )
 
+        for field, button_text in zip(fields, buttons_texts):
             builder.button(
                 text=button_text,
-                callback_data=FormFieldCallback(
-                    form_name=self.name,
-                    field_name=name,
-                ),
+                callback_data=self._field_callbacks[field.name],
             )
         builder.adjust(1)
-        builder.row(self._close_button)
+        builder.row(self._close_button(form_data, **kwargs))
 
         return builder.as_markup()
 
-    async def update_root_message(
-        self,
-        state: FSMContext,
-        event_message: Message,
-        field: FormField | None = None,
-        **kwargs,
-    ):
-        form_data = await self.get_form_data(state)
+    def _close_button(self, form_data: dict[str, Any], **kwargs):
+        locale = get_locale(**kwargs)
+        if self.state_codec is not None:
+            return self.state_codec.button(form_data, STATE_TARGET_CLOSE, locale)
+
+        return create_close_form_button(self.name, locale)
+
+    def dump_caches(self) -> dict[str, Any]:
+        return {
+            "visibility": self._visibility.dump_cache(),
+            "button_texts": [
+                [name, locale, text]
+                for (name, locale), text in self._button_texts.items()
+            ],
+        }
+
+    def load_caches(self, data: dict[str, Any]):
+        self._visibility.load_cache(data.get("visibility", {}))
+
+        for name, locale, text in data.get("button_texts", []):
+            if name in self._fields:
+                self._button_texts[(name, locale)] = text
 
-        inline_markup = None
-        reply_markup = None
+        while len(self._button_texts) > self.render_cache_size:
+            self._button_texts.popitem(last=False)
 
+    async def _render_text(
+        self, form_data: dict[str, Any], field: FormField | None = None, **kwargs
+    ) -> str:
         if field is None or field.prompt_formatter is None:
-            text = await self.menu_message(form_data, **kwargs)
-        else:
-            text = await field.prompt_formatter(form_data, **kwargs)
+            return await self.menu_message(user_form_data(form_data), **kwargs)
+
+        return await field.prompt_formatter(user_form_data(form_data), **kwargs)
 
+    async def _render_markup(
+        self, form_data: dict[str, Any], field: FormField | None = None, **kwargs
+    ) -> InlineKeyboardMarkup | ReplyKeyboardMarkup | None:
         if field is None:
-            inline_markup = await self._menu_keyboard(form_data, **kwargs)
+            return await self._menu_keyboard(form_data, **kwargs)
+
+        if isinstance(field, InlineReplyField):
+            return await field.inline_markup(form_data, **kwargs)
 
-        elif isinstance(field, InlineReplyField):
-            inline_markup = await field.inline_markup(form_data, **kwargs)
+        if isinstance(field, MessageReplyField) and field.text_hints:
+            return await field.reply_markup(form_data, **kwargs)
+
+        return None
+
+    async def _render(
+        self, form_data: dict[str, Any], field: FormField | None = None, **kwargs
+    ) -> tuple[str, InlineKeyboardMarkup | ReplyKeyboardMarkup | None]:
+        render = gather_calls(
+            self._render_text(form_data, field, **kwargs),
+            self._render_markup(form_data, field, **kwargs),
+        )
+        if self.scheduler is not None:
+            render = self.scheduler.run(render)
 
-        elif isinstance(field, MessageReplyField) and field.text_hints:
-            reply_markup = await field.reply_markup(form_data, **kwargs)
+        text, markup = await render
+        return text, markup
 
+    async def update_root_message(
+        self,
+        state: FSMContext,
+        event_message: Message,
+        field: FormField | None = None,
+        **kwargs,
+    ):
         chat_id = event_message.chat.id
         bot = event_message.bot
 
         if bot is None:
             raise ValueError("Bot is not attached to event message")
 
-        root_message_id = await state.get_value(self.root_message_name)
-
-        message_edited = False
+        form_data, root_message_id = await gather_calls(
+            self.get_form_data(state),
+            state.get_value(self.root_message_name),
+        )
 
         if form_data.get("finished") and root_message_id is not None:
-            await state.update_data({self.root_message_name: None, self.name: None})
-            return await delete_message(
-                chat_id=chat_id,
-                message_id=root_message_id,
-                bot=bot,
+            self._renders.cancel(bot.id, chat_id, root_message_id)
+            _, _, deleted = await gather_calls(
+                self._release_form_data(form_data, **kwargs),
+                state.update_data({self.root_message_name: None, self.name: None}),
+                delete_message(
+                    chat_id=chat_id,
+                    message_id=root_message_id,
+                    bot=bot,
+                ),
             )
+            return deleted
 
-        if root_message_id is not None:
-            if reply_markup is None:
+        async def render_and_edit():
+            text, markup = await self._render(form_data, field, **kwargs)
+
+            if root_message_id is not None and not isinstance(
+                markup, ReplyKeyboardMarkup
+            ):
                 message_edited = await edit_message(
                     chat_id=chat_id,
                     message_id=root_message_id,
                     bot=bot,
                     text=text,
-                    inline_markup=inline_markup,
+                    inline_markup=markup,
                 )
-        if message_edited:
+                if message_edited:
+                    return None
+
+            return text, markup
+
+        if root_message_id is None:
+            rendered = await render_and_edit()
+        else:
+            rendered = await self._renders.run(
+                bot.id, chat_id, root_message_id, render_and_edit()
+            )
+
+        if rendered is None:
             return
 
+        text, markup = rendered
+        calls: list[Awaitable[Any]] = [
+            bot.send_message(chat_id=chat_id, text=text, reply_markup=markup)
+        ]
         if root_message_id is not None:
-            await delete_message(
-                chat_id=chat_id,
-                message_id=root_message_id,
-                bot=bot,
+            calls.append(
+                delete_message(
+                    chat_id=chat_id,
+                    message_id=root_message_id,
+                    bot=bot,
+                )
             )
 
-        root = await bot.send_message(
-            chat_id=chat_id,
-            text=text,
-            reply_markup=inline_markup if inline_markup else reply_markup,
-        )
+        root, *_ = await gather_calls(*calls)
+        if isinstance(markup, InlineKeyboardMarkup):
+            sent_messages.remember(bot.id, chat_id, root.message_id, text, markup)
+
         await state.update_data({self.root_message_name: root.message_id})
 
+    async def broadcast(
+        self,
+        broadcaster: Broadcaster,
+        storage: BaseStorage,
+        chat_ids: AsyncIterable[int] | Iterable[int],
+        write_concurrency: int = 32,
+        **kwargs,
+    ) -> BroadcastReport:
+        bot = broadcaster.bot
+
+        if self.state_codec is not None:
+            form_data = self.state_codec.initial_form_data
+        else:
+            form_data = self.initial_form_data
+            stamp_form_data(form_data)
+
+        with priority(Priority.BACKGROUND):
+            text, markup = await self._render(form_data, **kwargs)
+
+        async def prepare(chat_id: int):
+            key = StorageKey(bot_id=bot.id, chat_id=chat_id, user_id=chat_id)
+            data = await storage.get_data(key)
+            if data.get(self.name) is None:
+                data[self.name] = copy.deepcopy(self._dump_form_data(form_data))
+                await storage.set_data(key, data)
+
+        async def save_root(chat_id: int, message_id: int):
+            key = StorageKey(bot_id=bot.id, chat_id=chat_id, user_id=chat_id)
+            data = await storage.get_data(key)
+            if data.get(self.root_message_name) is not None:
+                return
+
+            await storage.update_data(key, {self.root_message_name: message_id})
+
+        async def save(batch: list[tuple[int, int]]):
+            if isinstance(markup, InlineKeyboardMarkup):
+                for chat_id, message_id in batch:
+                    sent_messages.remember(bot.id, chat_id, message_id, text, markup)
+
+            if self.state_codec is not None:
+                return
+
+            await gather_calls(
+                *(save_root(chat_id, message_id) for chat_id, message_id in batch),
+                limit=write_concurrency,
+            )
+
+        return await broadcaster.run(
+            chat_ids,
+            text,
+            markup,
+            save,
+            prepare=None if self.state_codec is not None else prepare,
+            write_concurrency=write_concurrency,
+        )
+
+    def _dump_form_data(self, data: dict[str, Any]) -> Any:
+        if self.schema is None:
+            return data
+
+        return self.schema.encode(data)
+
     async def get_form_data(self, state: FSMContext):
         data = await state.get_value(self.name)
+        if self.schema is not None:
+            return self.schema.decode(data)
+
         if data is None:
             data = {}
 
         return data
 
     async def update_form_data(self, state: FSMContext, data: dict[str, Any]):
-        await state.update_data({self.name: data})
+        stamp_form_data(data)
+        payload = self._dump_form_data(data)
+        if self.size_recorder is not None:
+            self.size_recorder.record(self.name, payload, session_name(state.key))
+
+        await state.update_data({self.name: payload})
 
     def _create_click_handler(self, field: FormField):
         async def click_handler(
@@ -193,26 +483,56 @@ class FormBuilder:
                 await field.handle_click(form_data, **kwargs)
                 await self.update_form_data(state=state, data=form_data)
 
-                await self.update_root_message(state=state, event_message=message)
-                return await callback_query.answer()
+                return await answer_callback(
+                    callback_query,
+                    self.update_root_message(
+                        state=state, event_message=message, **kwargs
+                    ),
+                    webhook_reply=self.webhook_reply,
+                )
 
             if field.name in self._states:
                 await state.set_state(self._states[field.name])
 
-            await self.update_root_message(
-                field=field, state=state, event_message=message, **kwargs
+            return await answer_callback(
+                callback_query,
+                self.update_root_message(
+                    field=field, state=state, event_message=message, **kwargs
+                ),
+                webhook_reply=self.webhook_reply,
             )
-            await callback_query.answer()
 
         return click_handler
 
-    def _form_init_handler(self, router: Router, command_init: str | None = None):
-        async def general_action(state: FSMContext):
-            await state.set_state(None)
+    async def _release_form_data(self, form_data: dict[str, Any], **kwargs):
+        await gather_calls(
+            *(
+                field.release(form_data, **kwargs)
+                for field in self.fields
+                if field.holds_external_data
+            )
+        )
 
-            if not self.preserve_data_on_restart:
-                await state.update_data({self.root_message_name: None})
-                await self.update_form_data(state, self.initial_form_data)
+    def _form_init_handler(self, router: Router, command_init: str | None = None):
+        async def general_action(state: FSMContext, **kwargs):
+            if self.preserve_data_on_restart:
+                return await state.set_state(None)
+
+            if any(field.holds_external_data for field in self.fields):
+                await self._release_form_data(await self.get_form_data(state), **kwargs)
+
+            form_data = self.initial_form_data
+            stamp_form_data(form_data)
+
+            await gather_calls(
+                state.set_state(None),
+                state.update_data(
+                    {
+                        self.root_message_name: None,
+                        self.name: self._dump_form_data(form_data),
+                    }
+                ),
+            )
 
         async def inline_handler(
             callback_query: CallbackQuery, state: FSMContext, **kwargs
@@ -221,23 +541,26 @@ class FormBuilder:
             if not isinstance(message, Message):
                 raise ValueError("callback_query does not have message")
 
-            await general_action(state)
-            await self.update_root_message(state=state, event_message=message, **kwargs)
-            await callback_query.answer()
+            await general_action(state, **kwargs)
+            return await answer_callback(
+                callback_query,
+                self.update_root_message(state=state, event_message=message, **kwargs),
+                webhook_reply=self.webhook_reply,
+            )
 
         async def message_handler(message: Message, state: FSMContext, **kwargs):
-            await general_action(state)
+            await general_action(state, **kwargs)
             await self.update_root_message(state=state, event_message=message, **kwargs)
 
         if command_init is None:
             router.callback_query.register(
-                inline_handler,
+                self._profiled(inline_handler, "init"),
                 FormFieldCallback.filter(F.form_name == self.name),
                 FormFieldCallback.filter(F.field_name.is_(None)),
             )
         else:
             router.message.register(
-                message_handler,
+                self._profiled(message_handler, "command"),
                 Command(command_init),
             )
 
@@ -249,11 +572,14 @@ class FormBuilder:
             if not isinstance(message, Message):
                 raise ValueError("callback_query does not have message")
 
-            await self.update_root_message(state=state, event_message=message, **kwargs)
-            await callback_query.answer()
+            return await answer_callback(
+                callback_query,
+                self.update_root_message(state=state, event_message=message, **kwargs),
+                webhook_reply=self.webhook_reply,
+            )
 
         router.callback_query.register(
-            inline_handler,
+            self._profiled(inline_handler, "menu"),
             FormFieldCallback.filter(F.form_name == self.name),
             FormFieldCallback.filter(F.field_name.is_(None)),
         )
@@ -269,29 +595,221 @@ class FormBuilder:
             if message.bot is None:
                 raise ValueError("Bot is not attached to message")
 
-            await delete_message(
-                chat_id=message.chat.id,
-                message_id=message.message_id,
-                bot=message.bot,
+            self._renders.cancel(message.bot.id, message.chat.id, message.message_id)
+            return await answer_callback(
+                callback_query,
+                delete_message(
+                    chat_id=message.chat.id,
+                    message_id=message.message_id,
+                    bot=message.bot,
+                ),
+                webhook_reply=self.webhook_reply,
             )
-            await callback_query.answer()
 
         router.callback_query.register(
-            close_handler,
+            self._profiled(close_handler, "close"),
             FormCloseCallback.filter(F.form_name == self.name),
         )
 
+    async def _show_stateless(
+        self,
+        event_message: Message,
+        form_data: dict[str, Any],
+        field: FormField | None = None,
+        edit: bool = True,
+        **kwargs,
+    ):
+        bot = event_message.bot
+        if bot is None:
+            raise ValueError("Bot is not attached to event message")
+
+        async def render_and_edit():
+            text, markup = await self._render(form_data, field, **kwargs)
+
+            if edit:
+                message_edited = await edit_message(
+                    chat_id=event_message.chat.id,
+                    message_id=event_message.message_id,
+                    bot=bot,
+                    text=text,
+                    inline_markup=markup,
+                )
+                if message_edited:
+                    return None
+
+            return text, markup
+
+        if edit:
+            rendered = await self._renders.run(
+                bot.id,
+                event_message.chat.id,
+                event_message.message_id,
+                render_and_edit(),
+            )
+        else:
+            rendered = await render_and_edit()
+
+        if rendered is None:
+            return
+
+        text, markup = rendered
+        message = await bot.send_message(
+            chat_id=event_message.chat.id, text=text, reply_markup=markup
+        )
+        if isinstance(markup, InlineKeyboardMarkup):
+            sent_messages.remember(
+                bot.id, message.chat.id, message.message_id, text, markup
+            )
+
+    def _create_stateless_click_handler(self, field: FormField):
+        async def click_handler(
+            callback_query: CallbackQuery, state: FSMContext, **kwargs
+        ):
+            message = callback_query.message
+            if not isinstance(message, Message):
+                raise ValueError("callback_query does not have message")
+
+            if self.state_codec is None:
+                raise ValueError("Form is not stateless")
+
+            if message.bot is None:
+                raise ValueError("Bot is not attached to message")
+
+            form_data = self.state_codec.read(message)
+            if not isinstance(field, ClickHandler):
+                return await answer_callback(
+                    callback_query,
+                    self._show_stateless(message, form_data, field=field, **kwargs),
+                    webhook_reply=self.webhook_reply,
+                )
+
+            await field.handle_click(form_data, **kwargs)
+
+            if form_data.get("finished"):
+                self._renders.cancel(
+                    message.bot.id, message.chat.id, message.message_id
+                )
+                return await answer_callback(
+                    callback_query,
+                    self.update_form_data(state=state, data=form_data),
+                    delete_message(
+                        chat_id=message.chat.id,
+                        message_id=message.message_id,
+                        bot=message.bot,
+                    ),
+                    webhook_reply=self.webhook_reply,
+                )
+
+            self.state_codec.stamp(form_data)
+            return await answer_callback(
+                callback_query,
+                self._show_stateless(message, form_data, **kwargs),
+                webhook_reply=self.webhook_reply,
+            )
+
+        return click_handler
+
+    def _stateless_form_handlers(
+        self, router: Router, command_init: str | None = None
+    ):
+        async def init_handler(callback_query: CallbackQuery, **kwargs):
+            message = callback_query.message
+            if not isinstance(message, Message):
+                raise ValueError("callback_query does not have message")
+
+            if self.state_codec is None:
+                raise ValueError("Form is not stateless")
+
+            return await answer_callback(
+                callback_query,
+                self._show_stateless(
+                    message, self.state_codec.initial_form_data, edit=False, **kwargs
+                ),
+                webhook_reply=self.webhook_reply,
+            )
+
+        async def message_handler(message: Message, **kwargs):
+            if self.state_codec is None:
+                raise ValueError("Form is not stateless")
+
+            await self._show_stateless(
+                message, self.state_codec.initial_form_data, edit=False, **kwargs
+            )
+
+        async def state_handler(
+            callback_query: CallbackQuery,
+            callback_data: FormStateCallback,
+            **kwargs,
+        ):
+            message = callback_query.message
+            if not isinstance(message, Message):
+                raise ValueError("callback_query does not have message")
+
+            if self.state_codec is None:
+                raise ValueError("Form is not stateless")
+
+            if message.bot is None:
+                raise ValueError("Bot is not attached to message")
+
+            if callback_data.target == STATE_TARGET_CLOSE:
+                self._renders.cancel(
+                    message.bot.id, message.chat.id, message.message_id
+                )
+                return await answer_callback(
+                    callback_query,
+                    delete_message(
+                        chat_id=message.chat.id,
+                        message_id=message.message_id,
+                        bot=message.bot,
+                    ),
+                    webhook_reply=self.webhook_reply,
+                )
+
+            form_data = self.state_codec.decode(callback_data.state)
+            if form_data is None:
+                logger.warning(f"State of form {self.name} is invalid")
+                form_data = self.state_codec.initial_form_data
+
+            return await answer_callback(
+                callback_query,
+                self._show_stateless(message, form_data, **kwargs),
+                webhook_reply=self.webhook_reply,
+            )
+
+        router.callback_query.register(
+            self._profiled(init_handler, "init"),
+            FormFieldCallback.filter(F.form_name == self.name),
+            FormFieldCallback.filter(F.field_name.is_(None)),
+        )
+        router.callback_query.register(
+            self._profiled(state_handler, "state"),
+            FormStateCallback.filter(F.form_name == self.name),
+        )
+
+        if command_init is not None:
+            router.message.register(
+                self._profiled(message_handler, "command"),
+                Command(command_init),
+            )
+
     def create_callbacks_handlers(
         self, router: Router, command_init: str | None = None
     ):
-        self._form_init_handler(router, command_init)
-        self._form_menu_handler(router)
-        self._form_close_handler(router)
+        if self.state_codec is not None:
+            self._stateless_form_handlers(router, command_init)
+        else:
+            self._form_init_handler(router, command_init)
+            self._form_menu_handler(router)
+            self._form_close_handler(router)
 
         for name, field in self._fields.items():
+            if self.state_codec is not None:
+                click_handler = self._create_stateless_click_handler(field)
+            else:
+                click_handler = self._create_click_handler(field)
 
             router.callback_query.register(
-                self._create_click_handler(field),
+                self._profiled(click_handler, "click", name),
                 FormFieldCallback.filter(F.form_name == self.name),
                 FormFieldCallback.filter(F.field_name == name),
             )
@@ -302,29 +820,68 @@ class FormBuilder:
 
             if isinstance(field, MessageReplyField):
                 router.message.register(
-                    self._create_message_field_handler(field=field),
+                    self._profiled(
+                        self._create_message_field_handler(field=field),
+                        "message",
+                        name,
+                    ),
                     *field.filters,
                     *filters,
                 )
 
+            if isinstance(field, MediaGroupField):
+                router.message.register(
+                    self._profiled(
+                        self._create_message_field_handler(field=field),
+                        "message",
+                        name,
+                    ),
+                    *field.filters,
+                    F.media_group_id,
+                    self._create_album_filter(field),
+                )
+
             if isinstance(field, InlineReplyField):
                 field.assign_handlers(router)
 
+    def _create_album_filter(self, field: MediaGroupField):
+        async def album_filter(message: Message, state: FSMContext) -> bool:
+            return field.continues_album(message, await self.get_form_data(state))
+
+        return album_filter
+
     def _create_message_field_handler(self, field: MessageReplyField):
         async def message_handler(message: Message, state: FSMContext, **kwargs):
+            messages = await field.collect_messages(message)
+            if not messages:
+                return
+
             form_data = await self.get_form_data(state)
 
-            if await field.validate_message(message, form_data, **kwargs):
-                await field.handle_message(message, form_data, state, **kwargs)
+            valid_messages = [
+                item
+                for item in messages
+                if await field.validate_message(item, form_data, **kwargs)
+            ]
+            if valid_messages:
+                await field.handle_messages(valid_messages, form_data, state, **kwargs)
 
             to_menu = (await state.get_state()) is None
 
             await self.update_form_data(state=state, data=form_data)
-            await self.update_root_message(
-                field=None if to_menu else field,
-                state=state,
-                event_message=message,
-                **kwargs,
+
+            calls = [
+                self.update_root_message(
+                    field=None if to_menu else field,
+                    state=state,
+                    event_message=message,
+                    **kwargs,
+                )
+            ]
+            calls.extend(
+                field.cleanup_message(item, **kwargs) for item in valid_messages
             )
 
+            await gather_calls(*calls)
+
         return message_handler
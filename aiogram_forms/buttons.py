@@ -1,14 +1,57 @@
-from gettext import gettext as _
+from functools import lru_cache
 
 from aiogram.types import InlineKeyboardButton
 
-from aiogram_forms.callbacks.factories import FormCloseCallback, FormPageCallback
+from aiogram_forms.callbacks.factories import (
+    FormCloseCallback,
+    FormFieldCallback,
+    FormPageCallback,
+    FormStateCallback,
+)
+from aiogram_forms.i18n import N_, translate
 
+STATE_TARGET_CLOSE = "close"
+STATE_TARGET_MENU = "menu"
+
+
+@lru_cache(maxsize=1024)
+def create_close_form_button(
+    form_name: str, locale: str | None = None
+) -> InlineKeyboardButton:
+    return InlineKeyboardButton(
+        text=translate(N_("🚫 Close"), locale),
+        callback_data=FormCloseCallback.pack_values(form_name=form_name),
+    )
+
+
+@lru_cache(maxsize=1024)
+def create_return_button(
+    form_name: str, locale: str | None = None
+) -> InlineKeyboardButton:
+    return InlineKeyboardButton(
+        text=translate(N_("⬅️ Back to menu"), locale),
+        callback_data=FormFieldCallback.pack_values(
+            form_name=form_name,
+            field_name=None,
+        ),
+    )
+
+
+def create_state_button(
+    form_name: str, target: str, state: str, locale: str | None = None
+) -> InlineKeyboardButton:
+    if target == STATE_TARGET_CLOSE:
+        text = translate(N_("🚫 Close"), locale)
+    else:
+        text = translate(N_("⬅️ Back to menu"), locale)
 
-def create_close_form_button(form_name: str) -> InlineKeyboardButton:
     return InlineKeyboardButton(
-        text=_("🚫 Close"),
-        callback_data=FormCloseCallback(form_name=form_name).pack(),
+        text=text,
+        callback_data=FormStateCallback.pack_values(
+            form_name=form_name,
+            target=target,
+            state=state,
+        ),
     )
 
 
@@ -21,36 +64,36 @@ def create_pagination_buttons(
         buttons.append(
             InlineKeyboardButton(
                 text="↩️",
-                callback_data=FormPageCallback(
+                callback_data=FormPageCallback.pack_values(
                     form_name=form_name,
                     field_name=field_name,
                     page=page - 1,
                     limit=limit,
-                ).pack(),
+                ),
             )
         )
     else:
         buttons.append(
             InlineKeyboardButton(
                 text="🫷",
-                callback_data=FormPageCallback(
+                callback_data=FormPageCallback.pack_values(
                     form_name=form_name,
                     field_name=field_name,
                     page=page,
                     limit=limit,
-                ).pack(),
+                ),
             )
         )
 
     buttons.append(
         InlineKeyboardButton(
             text=str(page + 1),
-            callback_data=FormPageCallback(
+            callback_data=FormPageCallback.pack_values(
                 form_name=form_name,
                 field_name=field_name,
                 page=page,
                 limit=limit,
-            ).pack(),
+            ),
         )
     )
 
@@ -58,24 +101,24 @@ def create_pagination_buttons(
         buttons.append(
             InlineKeyboardButton(
                 text="↪️",
-                callback_data=FormPageCallback(
+                callback_data=FormPageCallback.pack_values(
                     form_name=form_name,
                     field_name=field_name,
                     page=page + 1,
                     limit=limit,
-                ).pack(),
+                ),
             )
         )
     else:
         buttons.append(
             InlineKeyboardButton(
                 text="🫸",
-                callback_data=FormPageCallback(
+                callback_data=FormPageCallback.pack_values(
                     form_name=form_name,
                     field_name=field_name,
                     page=page,
                     limit=limit,
-                ).pack(),
+                ),
             )
         )
 
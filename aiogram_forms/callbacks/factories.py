@@ -1,32 +1,220 @@
-from typing import Any
-from aiogram.filters.callback_data import CallbackData
+from decimal import Decimal
+from enum import Enum
+from fractions import Fraction
+from functools import lru_cache
+from typing import Any, ClassVar, Literal, Self, get_args
+from uuid import UUID
 
+from aiogram.filters.callback_data import (
+    MAX_CALLBACK_LENGTH,
+    CallbackData,
+    CallbackQueryFilter,
+)
+from aiogram.types import CallbackQuery
+from magic_filter import MagicFilter
+from pydantic_core import PydanticUndefined
+
+
+def _encode_value(name: str, value: Any) -> str:
+    if value is None:
+        return ""
+
+    if isinstance(value, Enum):
+        return str(value.value)
+
+    if isinstance(value, UUID):
+        return value.hex
+
+    if isinstance(value, bool):
+        return str(int(value))
+
+    if isinstance(value, (int, str, float, Decimal, Fraction)):
+        return str(value)
+
+    raise ValueError(
+        f"Attribute {name}={value!r} of type {type(value).__name__!r} "
+        f"can not be packed to callback data"
+    )
+
+
+def _encode(cls: type["FastCallbackData"], name: str, value: Any) -> str:
+    value_type = type(value)
+    if value_type is int:
+        return str(value)
+
+    encoded = value if value_type is str else _encode_value(name, value)
+    if cls.__separator__ in encoded:
+        raise ValueError(
+            f"Separator symbol {cls.__separator__!r} can not be used "
+            f"in value {name}={encoded!r}"
+        )
+
+    return encoded
+
+
+@lru_cache(maxsize=4096)
+def _static_part(cls: type["FastCallbackData"], *values: Any) -> str:
+    return cls.__separator__.join(
+        [
+            cls.__prefix__,
+            *(
+                _encode(cls, name, value)
+                for name, value in zip(cls.__static_names__, values)
+            ),
+        ]
+    )
+
+
+@lru_cache(maxsize=4096)
+def _unpack_values(
+    cls: type["FastCallbackData"], value: str
+) -> tuple[tuple[str, Any], ...]:
+    prefix, *parts = value.split(cls.__separator__)
+    if prefix != cls.__prefix__:
+        raise ValueError(f"Bad prefix ({prefix!r} != {cls.__prefix__!r})")
+
+    if len(parts) != len(cls.model_fields):
+        raise TypeError(
+            f"Callback data {cls.__name__!r} takes {len(cls.model_fields)} "
+            f"arguments but {len(parts)} were given"
+        )
+
+    payload: dict[str, Any] = {}
+    for (name, field), part in zip(cls.model_fields.items(), parts):
+        nullable = not field.is_required() or type(None) in get_args(field.annotation)
+        if part == "" and nullable and field.default != "":
+            part = None if field.default is PydanticUndefined else field.default
+
+        payload[name] = part
+
+    return tuple(cls(**payload))
+
+
+class FastCallbackQueryFilter(CallbackQueryFilter):
+    async def __call__(self, query: CallbackQuery) -> Literal[False] | dict[str, Any]:
+        if not isinstance(query, CallbackQuery) or not query.data:
+            return False
+
+        callback_data = self.callback_data
+        if not query.data.startswith(
+            callback_data.__prefix__ + callback_data.__separator__
+        ):
+            return False
+
+        return await super().__call__(query)
+
+
+class FastCallbackData(CallbackData, prefix="fast"):
+    __static_fields__: ClassVar[int] = 0
+
+    __static_names__: ClassVar[tuple[str, ...]] = ()
+    __dynamic_names__: ClassVar[tuple[str, ...]] = ()
+    __field_defaults__: ClassVar[dict[str, Any]] = {}
+
+    @classmethod
+    def __pydantic_init_subclass__(cls, **kwargs):
+        super().__pydantic_init_subclass__(**kwargs)
+
+        names = tuple(cls.model_fields)
+        cls.__static_names__ = names[: cls.__static_fields__]
+        cls.__dynamic_names__ = names[cls.__static_fields__ :]
+        cls.__field_defaults__ = {
+            name: field.default
+            for name, field in cls.model_fields.items()
+            if field.default is not PydanticUndefined
+        }
+
+    @classmethod
+    def _pack(cls, static: tuple[Any, ...], dynamic: tuple[Any, ...]) -> str:
+        parts = [_static_part(cls, *static)]
+        for name, value in zip(cls.__dynamic_names__, dynamic):
+            parts.append(_encode(cls, name, value))
+
+        callback_data = cls.__separator__.join(parts)
+
+        if len(callback_data) > MAX_CALLBACK_LENGTH // 4 and (
+            len(callback_data.encode()) > MAX_CALLBACK_LENGTH
+        ):
+            raise ValueError(
+                f"Resulted callback data is too long! "
+                f"len({callback_data!r}.encode()) > {MAX_CALLBACK_LENGTH}"
+            )
+
+        return callback_data
+
+    @classmethod
+    def encode_value(cls, name: str, value: Any) -> str:
+        return _encode(cls, name, value)
+
+    @classmethod
+    def pack_values(cls, **values: Any) -> str:
+        values = {**cls.__field_defaults__, **values}
+
+        return cls._pack(
+            tuple(values[name] for name in cls.__static_names__),
+            tuple(values[name] for name in cls.__dynamic_names__),
+        )
+
+    def pack(self) -> str:
+        cls = type(self)
+
+        return cls._pack(
+            tuple(getattr(self, name) for name in cls.__static_names__),
+            tuple(getattr(self, name) for name in cls.__dynamic_names__),
+        )
+
+    @classmethod
+    def unpack(cls, value: str) -> Self:
+        return cls.model_construct(**dict(_unpack_values(cls, value)))
+
+    @classmethod
+    def filter(cls, rule: MagicFilter | None = None) -> CallbackQueryFilter:
+        return FastCallbackQueryFilter(callback_data=cls, rule=rule)
+
+
+class FormFieldCallback(FastCallbackData, prefix="form"):
+    __static_fields__ = 2
 
-class FormFieldCallback(CallbackData, prefix="form"):
     form_name: str
     field_name: str | None = None
 
 
-class FormFieldActionCallback(CallbackData, prefix="formfieldaction"):
+class FormFieldActionCallback(FastCallbackData, prefix="formfieldaction"):
+    __static_fields__ = 3
+
     form_name: str
     field_name: str
     action: str
     value: Any | None = None
 
 
-class FormChoiceFieldCallback(CallbackData, prefix="formfieldchoice"):
+class FormChoiceFieldCallback(FastCallbackData, prefix="formfieldchoice"):
+    __static_fields__ = 2
+
     form_name: str
     field_name: str
     data: Any
     current_page: int
 
 
-class FormCloseCallback(CallbackData, prefix="formclose"):
+class FormCloseCallback(FastCallbackData, prefix="formclose"):
+    __static_fields__ = 1
+
     form_name: str
 
 
-class FormPageCallback(CallbackData, prefix="formpage"):
+class FormPageCallback(FastCallbackData, prefix="formpage"):
+    __static_fields__ = 2
+
     form_name: str
     field_name: str
     page: int = 0
     limit: int = 10
+
+
+class FormStateCallback(FastCallbackData, prefix="formstate"):
+    __static_fields__ = 2
+
+    form_name: str
+    target: str
+    state: str
@@ -1,9 +1,10 @@
 from abc import ABC, abstractmethod
 import dataclasses
-from gettext import gettext as _
-from typing import Any, Sequence
+import logging
+from typing import TYPE_CHECKING, Any, Awaitable, Sequence, TypeVar
 
 from aiogram import F, Router
+from aiogram.exceptions import TelegramAPIError
 from aiogram.filters import Filter
 from aiogram.filters.callback_data import CallbackData
 from aiogram.fsm.context import FSMContext
@@ -18,11 +19,32 @@ from aiogram.types import (
 from aiogram.utils.keyboard import ReplyKeyboardBuilder
 from aiogram.utils.magic_filter import MagicFilter
 
-from aiogram_forms.callbacks.factories import FormFieldActionCallback, FormFieldCallback
+from aiogram_forms.accounting import SizeRecorder, session_name
+from aiogram_forms.buttons import STATE_TARGET_MENU, create_return_button
+from aiogram_forms.callbacks.factories import FormFieldActionCallback
+from aiogram_forms.i18n import get_locale, translate
 from aiogram_forms.modifiers.formatters import MessageFormatter
 from aiogram_forms.modifiers.validators import MessageValidator
-from aiogram_forms.modifiers.visibles import FieldVisible
-from aiogram_forms.utils import delete_message, edit_message
+from aiogram_forms.modifiers.visibles import CompiledVisibility, FieldVisible
+from aiogram_forms.profiling import Handler, UpdateProfiler
+from aiogram_forms.utils import (
+    FORM_VERSION_KEY,
+    MessageDeleter,
+    RenderTracker,
+    answer_callback,
+    delete_message,
+    edit_message,
+    stamp_form_data,
+    user_form_data,
+)
+
+if TYPE_CHECKING:
+    from aiogram_forms.schema import FormSchema
+    from aiogram_forms.stateless import StateCodec
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
 
 
 @dataclasses.dataclass
@@ -35,7 +57,49 @@ class FormField(ABC):
 
     visible: Sequence[FieldVisible] = dataclasses.field(default_factory=list)
 
+    fallback_button_text: str | None = dataclasses.field(kw_only=True, default=None)
+
     parent_form_name: str = dataclasses.field(init=False, default="")
+    webhook_reply: bool = dataclasses.field(init=False, default=False)
+    form_visibility: CompiledVisibility | None = dataclasses.field(
+        init=False, default=None
+    )
+    profiler: UpdateProfiler | None = dataclasses.field(init=False, default=None)
+    render_tracker: RenderTracker | None = dataclasses.field(init=False, default=None)
+    form_schema: "FormSchema | None" = dataclasses.field(init=False, default=None)
+    size_recorder: SizeRecorder | None = dataclasses.field(init=False, default=None)
+
+    def is_visible(self, form_data: dict[str, Any], **kwargs) -> bool:
+        data = user_form_data(form_data)
+        if self.form_visibility is None:
+            return all(visible(data, **kwargs) for visible in self.visible)
+
+        return self.form_visibility.is_visible(
+            self.name, data, version=form_data.get(FORM_VERSION_KEY), **kwargs
+        )
+
+    async def track_render(self, message: Message, render: Awaitable[T]) -> T | None:
+        if self.render_tracker is None or message.bot is None:
+            return await render
+
+        return await self.render_tracker.run(
+            message.bot.id, message.chat.id, message.message_id, render
+        )
+
+    def profiled(self, handler: Handler, handler_type: str) -> Handler:
+        if self.profiler is None:
+            return handler
+
+        return self.profiler.wrap(
+            handler, self.parent_form_name, self.name, handler_type
+        )
+
+    @property
+    def holds_external_data(self) -> bool:
+        return False
+
+    async def release(self, form_data: dict[str, Any], **kwargs):
+        pass
 
 
 @dataclasses.dataclass
@@ -48,6 +112,9 @@ class MessageReplyField(FormField):
     filters: Sequence[Filter | MagicFilter] = dataclasses.field(default_factory=list)
 
     text_hints: Sequence[str] = dataclasses.field(default_factory=list, kw_only=True)
+    message_deleter: MessageDeleter | None = dataclasses.field(
+        kw_only=True, default=None
+    )
 
     def __post_init__(self):
         self.fsm_state = State(self.name)
@@ -58,21 +125,51 @@ class MessageReplyField(FormField):
         if self.one_time_state:
             await state.set_state(None)
 
-        if self.delete_message:
-            if message.bot is None:
-                raise ValueError("Bot is not attached to message")
+    async def collect_messages(self, message: Message) -> list[Message] | None:
+        return [message]
 
-            await delete_message(
+    async def send_error(self, message: Message, text: str, **kwargs):
+        try:
+            await message.answer(translate(text, get_locale(**kwargs)))
+        except TelegramAPIError as e:
+            logger.warning(f"Exception {e} raised when sending error to user")
+
+    async def handle_messages(
+        self,
+        messages: list[Message],
+        form_data: dict[str, Any],
+        state: FSMContext,
+        **kwargs,
+    ):
+        for message in messages:
+            await self.handle_message(message, form_data, state, **kwargs)
+
+    async def cleanup_message(self, message: Message, **kwargs):
+        if not self.delete_message:
+            return
+
+        if message.bot is None:
+            raise ValueError("Bot is not attached to message")
+
+        if self.message_deleter is not None:
+            return await self.message_deleter.schedule(
                 chat_id=message.chat.id,
-                message_id=message.message_id,
                 bot=message.bot,
+                message_id=message.message_id,
             )
 
+        await delete_message(
+            chat_id=message.chat.id,
+            message_id=message.message_id,
+            bot=message.bot,
+        )
+
     async def validate_message(
         self, message: Message, form_data: dict[str, Any], **kwargs
     ) -> bool:
+        data = user_form_data(form_data)
         for validator in self.validators:
-            if not validator(message, form_data, **kwargs):
+            if not validator(message, data, **kwargs):
                 return False
 
         return True
@@ -113,16 +210,16 @@ class Action:
         return None
 
     def callback_data(self, field: FormField, form_data: dict[str, Any], **kwargs):
-        return FormFieldActionCallback(
+        return FormFieldActionCallback.pack_values(
             form_name=field.parent_form_name,
             field_name=field.name,
             action=self.name,
-            value=self.prepare_value(field, form_data, **kwargs),
-        ).pack()
+            value=self.prepare_value(field, user_form_data(form_data), **kwargs),
+        )
 
     def button(self, field: FormField, form_data: dict[str, Any], **kwargs):
         return InlineKeyboardButton(
-            text=self.button_text,
+            text=translate(self.button_text, get_locale(**kwargs)),
             callback_data=self.callback_data(field, form_data, **kwargs),
         )
 
@@ -135,6 +232,8 @@ class InlineReplyField(FormField):
 
     _additional_actions: dict[str, Action] = dataclasses.field(init=False)
 
+    state_codec: "StateCodec | None" = dataclasses.field(init=False, default=None)
+
     def __post_init__(self):
         self._additional_actions = {
             action.name: action for action in self.additional_actions
@@ -152,13 +251,43 @@ class InlineReplyField(FormField):
 
     async def get_parent_form_data(self, state: FSMContext) -> dict[str, Any]:
         data = await state.get_value(self.parent_form_name)
+        if self.form_schema is not None:
+            return self.form_schema.decode(data)  # type: ignore
+
         if data is None:
             data = {}
 
         return data
 
     async def update_parent_form_data(self, state: FSMContext, data: dict[str, Any]):
-        await state.update_data({self.parent_form_name: data})
+        stamp_form_data(data)
+        payload: Any = data
+        if self.form_schema is not None:
+            payload = self.form_schema.encode(data)
+
+        if self.size_recorder is not None:
+            self.size_recorder.record(
+                self.parent_form_name, payload, session_name(state.key)
+            )
+
+        await state.update_data({self.parent_form_name: payload})
+
+    async def load_form_data(
+        self, message: Message, state: FSMContext
+    ) -> dict[str, Any]:
+        if self.state_codec is not None:
+            return self.state_codec.read(message)
+
+        return await self.get_parent_form_data(state)
+
+    async def save_form_data(
+        self, message: Message, state: FSMContext, data: dict[str, Any]
+    ):
+        if self.state_codec is not None:
+            self.state_codec.stamp(data)
+            return
+
+        await self.update_parent_form_data(state, data)
 
     async def inline_handler(
         self,
@@ -171,7 +300,8 @@ class InlineReplyField(FormField):
         if not isinstance(message, Message):
             raise ValueError("callback_query does not have message")
 
-        form_data = await self.get_parent_form_data(state)
+        form_data = await self.load_form_data(message, state)
+        form_data.pop(FORM_VERSION_KEY, None)
 
         if isinstance(callback_data, FormFieldActionCallback):
             action = self._additional_actions.get(callback_data.action)
@@ -183,45 +313,67 @@ class InlineReplyField(FormField):
         else:
             await self.field_action(callback_data, form_data, **kwargs)
 
-        await self.update_parent_form_data(state, form_data)
-
-        if self.prompt_formatter is None:
-            text = None
-        else:
-            text = await self.prompt_formatter(form_data, **kwargs)
+        await self.save_form_data(message, state, form_data)
 
         if hasattr(callback_data, "current_page"):
             page = getattr(callback_data, "current_page")
         else:
             page = 0
 
-        keyboard = await self.inline_markup(form_data, page=page, **kwargs)
+        if message.bot is None:
+            raise ValueError("Bot is not attached to message")
 
+        return await answer_callback(
+            callback_query,
+            self.track_render(
+                message, self.update_view(message, form_data, page=page, **kwargs)
+            ),
+            webhook_reply=self.webhook_reply,
+        )
+
+    async def update_view(
+        self,
+        message: Message,
+        form_data: dict[str, Any],
+        page: int = 0,
+        with_text: bool = True,
+        **kwargs,
+    ) -> bool:
         if message.bot is None:
             raise ValueError("Bot is not attached to message")
 
-        await edit_message(
+        if not with_text or self.prompt_formatter is None:
+            text = None
+        else:
+            text = await self.prompt_formatter(user_form_data(form_data), **kwargs)
+
+        keyboard = await self.inline_markup(form_data, page=page, **kwargs)
+
+        return await edit_message(
             chat_id=message.chat.id,
             message_id=message.message_id,
             bot=message.bot,
             text=text,
             inline_markup=keyboard,
         )
-        await callback_query.answer()
 
     def assign_handlers(self, router: Router):
         router.callback_query.register(
-            self.inline_handler,
+            self.profiled(self.inline_handler, "action"),
             FormFieldActionCallback.filter(F.form_name == self.parent_form_name),
             FormFieldActionCallback.filter(F.field_name == self.name),
         )
 
+    def get_return_button(
+        self, form_data: dict[str, Any] | None = None, **kwargs
+    ) -> InlineKeyboardButton:
+        if self.state_codec is not None and form_data is not None:
+            return self.state_codec.button(
+                form_data, STATE_TARGET_MENU, get_locale(**kwargs)
+            )
+
+        return create_return_button(self.parent_form_name, get_locale(**kwargs))
+
     @property
     def return_button(self):
-        return InlineKeyboardButton(
-            text=_("⬅️ Back to menu"),
-            callback_data=FormFieldCallback(
-                form_name=self.parent_form_name,
-                field_name=None,
-            ).pack(),
-        )
+        return create_return_button(self.parent_form_name)
@@ -2,6 +2,7 @@ import dataclasses
 from typing import Any, Protocol, runtime_checkable
 
 from aiogram_forms.fields.abstract_fields import FormField
+from aiogram_forms.utils import user_form_data
 
 
 @runtime_checkable
@@ -46,9 +47,8 @@ class SubmitField(FormField, ClickHandler):
     form_action: FormAction = dataclasses.field(kw_only=True)
 
     async def handle_click(self, form_data: dict[str, Any], **kwargs):
-        for validator in self.visible:
-            if not validator(form_data, **kwargs):
-                return
+        if not self.is_visible(form_data, **kwargs):
+            return
 
         form_data["finished"] = True
-        await self.form_action(form_data, **kwargs)
+        await self.form_action(user_form_data(form_data), **kwargs)
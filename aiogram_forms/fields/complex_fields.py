@@ -1,10 +1,29 @@
+from collections import OrderedDict
 import dataclasses
-from gettext import gettext as _
+import hashlib
+import json
+import time
 from typing import Any, Callable, Protocol, Sequence, TypeVar
 
-from aiogram_forms.fields.abstract_fields import Action
+from aiogram import F, Router
+from aiogram.filters import Filter
+from aiogram.fsm.context import FSMContext
+from aiogram.types import (
+    InlineKeyboardMarkup,
+    InlineQuery,
+    InlineQueryResultArticle,
+    InputTextMessageContent,
+    Message,
+)
+from aiogram.utils.keyboard import InlineKeyboardBuilder
+from aiogram.utils.magic_filter import MagicFilter
+
+from aiogram_forms.callbacks.factories import FormChoiceFieldCallback
+from aiogram_forms.fields.abstract_fields import Action, MessageReplyField
 from aiogram_forms.fields.inline_fields import ChoiceField
 from aiogram_forms.fields.message_fields import StringField
+from aiogram_forms.i18n import N_, get_locale, translate
+from aiogram_forms.utils import user_form_data
 
 T = TypeVar("T")
 
@@ -22,7 +41,7 @@ class ObjectsLoaderWithFilter[T](Protocol):
 
 class ClearFilterAction(Action):
     name = "clear_filter"
-    button_text = _("🧹 Clear filter")
+    button_text = N_("🧹 Clear filter")
 
     async def __call__(self, field, form_data, value=None, **kwargs):
         form_data[f"{field.name}-filter"] = None
@@ -57,7 +76,7 @@ class DynamicChoiceFieldWithStringFilter[T](StringField, ChoiceField):
         filter_str = self.get_filter_value(form_data)
 
         return await self.choices_loader(
-            form_data=form_data,
+            form_data=user_form_data(form_data),
             filter_str=filter_str,
             offset=offset,
             limit=limit,
@@ -70,3 +89,184 @@ class DynamicChoiceFieldWithStringFilter[T](StringField, ChoiceField):
             text = filter_text.lower()
 
         form_data[f"{self.name}-filter"] = filter_text
+
+
+class ClearSelectionAction(Action):
+    name = "clear_selection"
+    button_text = N_("🧹 Clear selection")
+
+    async def __call__(self, field, form_data, value=None, **kwargs):
+        form_data[field.name] = None
+
+
+@dataclasses.dataclass
+class InlineQueryChoiceField[T](MessageReplyField, ChoiceField):
+    choices_loader: ObjectsLoaderWithFilter[T] = dataclasses.field(kw_only=True)
+
+    option_to_data: Callable[[T], Any] = repr
+    option_to_button: Callable[[T], str] = str
+    option_to_description: Callable[[T], str | None] = dataclasses.field(
+        kw_only=True, default=lambda option: None
+    )
+
+    filters: Sequence[Filter | MagicFilter] = dataclasses.field(
+        default_factory=lambda: [F.via_bot, F.text]
+    )
+
+    results_limit: int = dataclasses.field(kw_only=True, default=20)
+    cache_time: int = dataclasses.field(kw_only=True, default=300)
+    is_personal: bool = dataclasses.field(kw_only=True, default=True)
+    results_cache_size: int = dataclasses.field(kw_only=True, default=1024)
+
+    _results: OrderedDict[tuple[Any, ...], tuple[float, Sequence[T], bool]] = (
+        dataclasses.field(init=False, default_factory=OrderedDict)
+    )
+
+    def __post_init__(self):
+        super().__post_init__()
+
+        self.additional_actions.append(ClearSelectionAction())
+        self._additional_actions = {
+            action.name: action for action in self.additional_actions
+        }
+
+    async def load_options(
+        self, form_data: dict[str, Any], offset: int, limit: int, **kwargs
+    ):
+        return await self.choices_loader(
+            form_data=user_form_data(form_data),
+            filter_str=None,
+            offset=offset,
+            limit=limit,
+            **kwargs,
+        )
+
+    def form_data_digest(self, form_data: dict[str, Any]) -> bytes:
+        data = {
+            name: value for name, value in form_data.items() if name != self.name
+        }
+        dump = json.dumps(data, sort_keys=True, default=repr)
+        return hashlib.sha1(dump.encode()).digest()
+
+    async def search(
+        self,
+        form_data: dict[str, Any],
+        query: InlineQuery,
+        offset: int,
+        **kwargs,
+    ) -> tuple[Sequence[T], bool]:
+        data = user_form_data(form_data)
+        key: tuple[Any, ...] = (query.query, offset, self.form_data_digest(data))
+        if self.is_personal:
+            key = (query.from_user.id, *key)
+
+        cached = self._results.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            self._results.move_to_end(key)
+            return cached[1], cached[2]
+
+        options = await self.choices_loader(
+            form_data=data,
+            filter_str=query.query or None,
+            offset=offset,
+            limit=self.results_limit + 1,
+            **kwargs,
+        )
+        has_more = len(options) > self.results_limit
+        options = options[: self.results_limit]
+
+        self._results[key] = (time.monotonic() + self.cache_time, options, has_more)
+        self._results.move_to_end(key)
+        if len(self._results) > self.results_cache_size:
+            self._results.popitem(last=False)
+
+        return options, has_more
+
+    def result_text(self, option: T) -> str:
+        return FormChoiceFieldCallback.pack_values(
+            form_name=self.parent_form_name,
+            field_name=self.name,
+            data=self.option_to_data(option),
+            current_page=0,
+        )
+
+    async def inline_query_handler(
+        self, inline_query: InlineQuery, state: FSMContext, **kwargs
+    ):
+        form_data = await self.get_parent_form_data(state)
+        offset = int(inline_query.offset) if inline_query.offset.isdigit() else 0
+
+        options, has_more = await self.search(form_data, inline_query, offset, **kwargs)
+        selected = self.get_selected(form_data)
+
+        results = []
+        for i, option in enumerate(options):
+            prefix = "✅ " if self.option_to_data(option) in selected else ""
+            results.append(
+                InlineQueryResultArticle(
+                    id=str(offset + i),
+                    title=f"{prefix}{self.option_to_button(option)}",
+                    description=self.option_to_description(option),
+                    input_message_content=InputTextMessageContent(
+                        message_text=self.result_text(option)
+                    ),
+                )
+            )
+
+        answer = inline_query.answer(
+            results,
+            cache_time=self.cache_time,
+            is_personal=self.is_personal,
+            next_offset=str(offset + len(options)) if has_more else "",
+        )
+        if self.webhook_reply:
+            return answer
+
+        await answer
+
+    async def handle_message(
+        self, message: Message, form_data: dict[str, Any], state: FSMContext, **kwargs
+    ):
+        if message.text is None or message.via_bot is None or message.bot is None:
+            return
+
+        if message.via_bot.id != message.bot.id:
+            return
+
+        try:
+            callback_data = FormChoiceFieldCallback.unpack(message.text)
+        except (TypeError, ValueError):
+            return
+
+        if (
+            callback_data.form_name != self.parent_form_name
+            or callback_data.field_name != self.name
+        ):
+            return
+
+        await super().handle_message(message, form_data, state, **kwargs)
+        await self.field_action(callback_data, form_data, **kwargs)
+
+    async def inline_markup(
+        self, form_data: dict[str, Any], page: int = 0, **kwargs
+    ) -> InlineKeyboardMarkup:
+        builder = InlineKeyboardBuilder()
+        builder.button(
+            text=translate(N_("🔍 Search"), get_locale(**kwargs)),
+            switch_inline_query_current_chat="",
+        )
+
+        for action in self.additional_actions:
+            builder.row(action.button(self, form_data, **kwargs))
+
+        builder.row(self.get_return_button(form_data, **kwargs))
+
+        return builder.as_markup()
+
+    def assign_handlers(self, router: Router):
+        super().assign_handlers(router)
+
+        router.inline_query.register(
+            self.profiled(self.inline_query_handler, "inline_query"),
+            self.fsm_state,
+        )
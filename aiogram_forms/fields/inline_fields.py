@@ -1,6 +1,7 @@
 from abc import abstractmethod
 import dataclasses
-from typing import Any, Callable, Protocol, Sequence, TypeVar
+import logging
+from typing import Any, Callable, Container, Protocol, Sequence, TypeVar
 
 from aiogram import F, Router
 from aiogram.filters.callback_data import CallbackData
@@ -11,7 +12,9 @@ from aiogram.utils.keyboard import InlineKeyboardBuilder
 from aiogram_forms.buttons import create_pagination_buttons
 from aiogram_forms.callbacks.factories import FormChoiceFieldCallback, FormPageCallback
 from aiogram_forms.fields.abstract_fields import InlineReplyField
-from aiogram_forms.utils import edit_message
+from aiogram_forms.utils import answer_callback, user_form_data
+
+logger = logging.getLogger(__name__)
 
 T = TypeVar("T")
 K = TypeVar("K", default=str)
@@ -32,7 +35,7 @@ class ChoiceField[T, K](InlineReplyField):
         self,
         builder: InlineKeyboardBuilder,
         options: Sequence[T],
-        selected: Sequence[K],
+        selected: Container[K],
         page: int,
     ):
         for option in options:
@@ -43,7 +46,7 @@ class ChoiceField[T, K](InlineReplyField):
 
             builder.button(
                 text=f"{prefix}{text}",
-                callback_data=FormChoiceFieldCallback(
+                callback_data=FormChoiceFieldCallback.pack_values(
                     form_name=self.parent_form_name,
                     field_name=self.name,
                     data=value,
@@ -64,29 +67,40 @@ class ChoiceField[T, K](InlineReplyField):
             )
         )
 
+    def convert_data(self, data: Any) -> K:
+        return self.option_data_type(data)
+
+    def get_selected(self, form_data: dict[str, Any]) -> dict[K, None]:
+        selected: list[K] | None = form_data.get(self.name)
+        if selected is None:
+            return {}
+
+        return dict.fromkeys(selected)
+
+    def set_selected(self, form_data: dict[str, Any], selected: dict[K, None]):
+        form_data[self.name] = list(selected)
+
     async def field_action(
         self, callback_data: CallbackData, form_data: dict[str, Any], **kwargs
     ):
         if not isinstance(callback_data, FormChoiceFieldCallback):
             raise ValueError("callback_data is not FormChoiceFieldCallback")
 
-        new_value = self.option_data_type(callback_data.data)
-        selected: list[K] | None = form_data.get(self.name)
+        self.select(form_data, self.convert_data(callback_data.data))
 
-        if selected is None:
-            selected = [new_value]
+    def select(self, form_data: dict[str, Any], new_value: K):
+        selected = self.get_selected(form_data)
 
-        elif callback_data.data in selected:
-            selected.remove(new_value)
-
-        elif len(selected) < self.max_options:
-            selected.append(new_value)
+        if new_value in selected:
+            del selected[new_value]
 
         else:
-            selected.pop(0)
-            selected.append(new_value)
+            if selected and len(selected) >= self.max_options:
+                del selected[next(iter(selected))]
+
+            selected[new_value] = None
 
-        form_data[self.name] = selected
+        self.set_selected(form_data, selected)
 
     async def page_handler(
         self,
@@ -99,33 +113,28 @@ class ChoiceField[T, K](InlineReplyField):
         if not isinstance(message, Message):
             raise ValueError("callback_query does not have message")
 
-        form_data = await self.get_parent_form_data(state)
-        keyboard = await self.inline_markup(
-            form_data, page=callback_data.page, **kwargs
-        )
-
-        if message.bot is None:
-            raise ValueError("Bot is not attached to message")
+        async def render():
+            form_data = await self.load_form_data(message, state)
+            return await self.update_view(
+                message, form_data, page=callback_data.page, with_text=False, **kwargs
+            )
 
-        await edit_message(
-            chat_id=message.chat.id,
-            message_id=message.message_id,
-            bot=message.bot,
-            text=None,
-            inline_markup=keyboard,
+        return await answer_callback(
+            callback_query,
+            self.track_render(message, render()),
+            webhook_reply=self.webhook_reply,
         )
-        await callback_query.answer()
 
     def assign_handlers(self, router: Router):
         super().assign_handlers(router)
 
         router.callback_query.register(
-            self.page_handler,
+            self.profiled(self.page_handler, "page"),
             FormPageCallback.filter(F.form_name == self.parent_form_name),
             FormPageCallback.filter(F.field_name == self.name),
         )
         router.callback_query.register(
-            self.inline_handler,
+            self.profiled(self.inline_handler, "choice"),
             FormChoiceFieldCallback.filter(F.form_name == self.parent_form_name),
             FormChoiceFieldCallback.filter(F.field_name == self.name),
         )
@@ -135,9 +144,7 @@ class ChoiceField[T, K](InlineReplyField):
     ) -> InlineKeyboardMarkup:
         builder = InlineKeyboardBuilder()
 
-        selected: list[K] | None = form_data.get(self.name)
-        if selected is None:
-            selected = []
+        selected = self.get_selected(form_data)
 
         page_options = await self.load_options(
             form_data,
@@ -158,9 +165,9 @@ class ChoiceField[T, K](InlineReplyField):
         self.add_page_keyboard(builder, page, is_last_page)
 
         for action in self.additional_actions:
-            builder.row(action.button(self, form_data))
+            builder.row(action.button(self, form_data, **kwargs))
 
-        builder.row(self.return_button)
+        builder.row(self.get_return_button(form_data, **kwargs))
 
         return builder.as_markup()
 
@@ -173,8 +180,11 @@ class ChoiceField[T, K](InlineReplyField):
 @dataclasses.dataclass
 class StaticChoiceField[K](ChoiceField):
     choices: dict[K, str] = dataclasses.field(kw_only=True)
+    store_as_bitmap: bool = dataclasses.field(kw_only=True, default=False)
 
     _keys: list[K] = dataclasses.field(init=False)
+    _indexes: dict[K, int] = dataclasses.field(init=False)
+    _data_keys: dict[str, K] = dataclasses.field(init=False)
 
     option_to_button: Callable[[K], str] = dataclasses.field(init=False)
     option_to_data: Callable[[K], K] = dataclasses.field(init=False)
@@ -183,9 +193,64 @@ class StaticChoiceField[K](ChoiceField):
         super().__post_init__()
 
         self._keys = list(self.choices.keys())
+        self._indexes = {key: i for i, key in enumerate(self._keys)}
+
+        self._data_keys = {
+            FormChoiceFieldCallback.encode_value("data", key): key for key in self._keys
+        }
+
         self.option_to_button = lambda x: self.choices[x]
         self.option_to_data = lambda x: x
 
+    def convert_data(self, data: Any) -> K:
+        return self._data_keys.get(data, data)
+
+    def select(self, form_data: dict[str, Any], new_value: K):
+        if new_value not in self._indexes:
+            logger.debug(f"Ignoring unknown choice {new_value!r} of {self.name}")
+            return
+
+        super().select(form_data, new_value)
+
+    def get_selected(self, form_data: dict[str, Any]) -> dict[K, None]:
+        if not self.store_as_bitmap:
+            return super().get_selected(form_data)
+
+        bitmap: int = form_data.get(self.name) or 0
+
+        return {key: None for i, key in enumerate(self._keys) if (bitmap >> i) & 1}
+
+    def set_selected(self, form_data: dict[str, Any], selected: dict[K, None]):
+        if not self.store_as_bitmap:
+            return super().set_selected(form_data, selected)
+
+        bitmap = 0
+        for key in selected:
+            if key in self._indexes:
+                bitmap |= 1 << self._indexes[key]
+
+        form_data[self.name] = bitmap
+
+    def get_bitmap(self, form_data: dict[str, Any]) -> int:
+        if self.store_as_bitmap:
+            return form_data.get(self.name) or 0
+
+        bitmap = 0
+        for key in self.get_selected(form_data):
+            if key in self._indexes:
+                bitmap |= 1 << self._indexes[key]
+
+        return bitmap
+
+    def set_bitmap(self, form_data: dict[str, Any], bitmap: int):
+        self.set_selected(
+            form_data,
+            {key: None for i, key in enumerate(self._keys) if (bitmap >> i) & 1},
+        )
+
+    def get_values(self, form_data: dict[str, Any]) -> list[K]:
+        return list(self.get_selected(form_data))
+
     async def load_options(
         self, form_data: dict[str, Any], offset: int, limit: int, **kwargs
     ):
@@ -212,5 +277,5 @@ class DynamicChoiceField[T](ChoiceField):
         self, form_data: dict[str, Any], offset: int, limit: int, **kwargs
     ):
         return await self.choices_loader(
-            form_data=form_data, offset=offset, limit=limit, **kwargs
+            form_data=user_form_data(form_data), offset=offset, limit=limit, **kwargs
         )
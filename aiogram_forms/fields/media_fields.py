@@ -0,0 +1,410 @@
+import asyncio
+import contextlib
+import dataclasses
+import fnmatch
+import logging
+import mimetypes
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, AsyncIterator, Protocol, Sequence
+
+import aiofiles
+from aiogram import Bot, F
+from aiogram.filters import Filter
+from aiogram.fsm.context import FSMContext
+from aiogram.types import Message
+from aiogram.utils.magic_filter import MagicFilter
+
+from aiogram_forms.fields.abstract_fields import MessageReplyField
+from aiogram_forms.i18n import N_
+from aiogram_forms.modifiers.validators import MessageValidator
+
+logger = logging.getLogger(__name__)
+
+MEDIA_KINDS = ("document", "photo", "video", "audio", "voice", "animation")
+DEFAULT_MIME_TYPES = {
+    "photo": "image/jpeg",
+    "voice": "audio/ogg",
+    "video": "video/mp4",
+    "animation": "video/mp4",
+}
+CHUNK_SIZE = 64 * 1024
+MAX_COLLECTED_GROUPS = 1000
+
+
+class FileTooLarge(Exception):
+    pass
+
+
+def media_metadata(
+    message: Message, kinds: Sequence[str] = MEDIA_KINDS
+) -> dict[str, Any] | None:
+    for kind in kinds:
+        media = getattr(message, kind, None)
+        if not media:
+            continue
+
+        if isinstance(media, list):
+            media = media[-1]
+
+        return {
+            "kind": kind,
+            "file_id": media.file_id,
+            "file_unique_id": media.file_unique_id,
+            "file_name": getattr(media, "file_name", None),
+            "mime_type": getattr(media, "mime_type", None)
+            or DEFAULT_MIME_TYPES.get(kind),
+            "file_size": media.file_size,
+        }
+
+    return None
+
+
+@dataclasses.dataclass
+class FileSizeValidator(MessageValidator):
+    max_size: int
+
+    def __call__(self, message: Message, form_data: dict[str, Any], **kwargs) -> bool:
+        metadata = media_metadata(message)
+        if metadata is None:
+            return False
+
+        return metadata["file_size"] is None or metadata["file_size"] <= self.max_size
+
+
+@dataclasses.dataclass
+class MimeTypeValidator(MessageValidator):
+    patterns: Sequence[str]
+
+    def __call__(self, message: Message, form_data: dict[str, Any], **kwargs) -> bool:
+        metadata = media_metadata(message)
+        if metadata is None or metadata["mime_type"] is None:
+            return False
+
+        return any(
+            fnmatch.fnmatch(metadata["mime_type"], pattern) for pattern in self.patterns
+        )
+
+
+class DownloadLimiter:
+    max_downloads: int
+    per_chat: int
+
+    _loop: asyncio.AbstractEventLoop | None
+    _semaphore: asyncio.Semaphore
+    _chats: dict[int, tuple[asyncio.Semaphore, int]]
+
+    def __init__(self, max_downloads: int = 8, per_chat: int = 1):
+        self.max_downloads = max_downloads
+        self.per_chat = per_chat
+
+        self._loop = None
+        self._semaphore = asyncio.Semaphore(max_downloads)
+        self._chats = {}
+
+    def _bind_loop(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+
+        self._loop = loop
+        self._semaphore = asyncio.Semaphore(self.max_downloads)
+        self._chats = {}
+
+    @contextlib.asynccontextmanager
+    async def slot(self, chat_id: int):
+        self._bind_loop()
+
+        semaphore, users = self._chats.get(chat_id, (None, 0))
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.per_chat)
+        self._chats[chat_id] = (semaphore, users + 1)
+
+        try:
+            async with semaphore, self._semaphore:
+                yield
+
+        finally:
+            semaphore, users = self._chats[chat_id]
+            if users == 1:
+                del self._chats[chat_id]
+            else:
+                self._chats[chat_id] = (semaphore, users - 1)
+
+
+class FileSink(Protocol):
+    async def __call__(
+        self, metadata: dict[str, Any], chunks: AsyncIterator[bytes], **kwargs
+    ) -> str: ...
+
+
+class DirectorySink:
+    directory: Path
+
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def file_name(self, metadata: dict[str, Any]) -> str:
+        suffix = ""
+        if metadata.get("file_name"):
+            suffix = Path(metadata["file_name"]).suffix
+        elif metadata.get("mime_type"):
+            suffix = mimetypes.guess_extension(metadata["mime_type"]) or ""
+
+        return f"{metadata['file_unique_id']}{suffix}"
+
+    async def __call__(
+        self, metadata: dict[str, Any], chunks: AsyncIterator[bytes], **kwargs
+    ) -> str:
+        path = self.directory / self.file_name(metadata)
+        partial = path.with_name(f"{path.name}.part")
+
+        try:
+            async with aiofiles.open(partial, "wb") as file:
+                async for chunk in chunks:
+                    await file.write(chunk)
+
+            os.replace(partial, path)
+
+        finally:
+            if partial.exists():
+                partial.unlink()
+
+        return str(path)
+
+
+@dataclasses.dataclass
+class FileField(MessageReplyField):
+    kinds: Sequence[str] = dataclasses.field(kw_only=True, default=MEDIA_KINDS)
+    max_size: int | None = dataclasses.field(kw_only=True, default=None)
+    mime_types: Sequence[str] | None = dataclasses.field(kw_only=True, default=None)
+
+    sink: FileSink | None = dataclasses.field(kw_only=True, default=None)
+    chunk_size: int = dataclasses.field(kw_only=True, default=CHUNK_SIZE)
+    download_limiter: DownloadLimiter = dataclasses.field(
+        kw_only=True, default_factory=DownloadLimiter
+    )
+    error_text: str = dataclasses.field(
+        kw_only=True, default=N_("😢 Could not receive the file, please try again")
+    )
+    too_large_text: str = dataclasses.field(
+        kw_only=True, default=N_("😢 The file is too large")
+    )
+
+    filters: Sequence[Filter | MagicFilter] = dataclasses.field(
+        default_factory=lambda: [
+            F.document | F.photo | F.video | F.audio | F.voice | F.animation
+        ]
+    )
+
+    def __post_init__(self):
+        super().__post_init__()
+
+        self.validators = list(self.validators)
+        if self.max_size is not None:
+            self.validators.append(FileSizeValidator(self.max_size))
+
+        if self.mime_types is not None:
+            self.validators.append(MimeTypeValidator(self.mime_types))
+
+    async def validate_message(
+        self, message: Message, form_data: dict[str, Any], **kwargs
+    ) -> bool:
+        if media_metadata(message, self.kinds) is None:
+            return False
+
+        return await super().validate_message(message, form_data, **kwargs)
+
+    async def _local_chunks(self, path: str) -> AsyncIterator[bytes]:
+        async with aiofiles.open(path, "rb") as file:
+            while chunk := await file.read(self.chunk_size):
+                yield chunk
+
+    async def _chunks(
+        self, bot: Bot, metadata: dict[str, Any]
+    ) -> AsyncIterator[bytes]:
+        file = await bot.get_file(metadata["file_id"])
+        if file.file_path is None:
+            raise ValueError(f"File {metadata['file_id']} has no path")
+
+        if bot.session.api.is_local:
+            chunks = self._local_chunks(file.file_path)
+        else:
+            chunks = bot.session.stream_content(
+                url=bot.session.api.file_url(bot.token, file.file_path),
+                chunk_size=self.chunk_size,
+            )
+
+        size = 0
+        async for chunk in chunks:
+            size += len(chunk)
+            if self.max_size is not None and size > self.max_size:
+                raise FileTooLarge(
+                    f"File {metadata['file_id']} exceeds {self.max_size} bytes"
+                )
+
+            yield chunk
+
+    async def download(
+        self, message: Message, metadata: dict[str, Any], **kwargs
+    ) -> str | None:
+        if self.sink is None or message.bot is None:
+            return None
+
+        async with self.download_limiter.slot(message.chat.id):
+            return await self.sink(
+                metadata, self._chunks(message.bot, metadata), **kwargs
+            )
+
+    async def receive(
+        self, message: Message, errors: list[str] | None = None, **kwargs
+    ) -> dict[str, Any] | None:
+        metadata = media_metadata(message, self.kinds)
+        if metadata is None:
+            return None
+
+        if self.sink is None:
+            return metadata
+
+        try:
+            metadata["location"] = await self.download(message, metadata, **kwargs)
+
+        except FileTooLarge as e:
+            logger.info(str(e))
+            error = self.too_large_text
+
+        except Exception as e:
+            logger.warning(f"Exception {e} raised when downloading file")
+            error = self.error_text
+
+        else:
+            return metadata
+
+        if errors is None:
+            await self.send_error(message, error, **kwargs)
+        else:
+            errors.append(error)
+
+        return None
+
+    async def handle_message(
+        self, message: Message, form_data: dict[str, Any], state: FSMContext, **kwargs
+    ):
+        await super().handle_message(message, form_data, state, **kwargs)
+
+        metadata = await self.receive(message, **kwargs)
+        if metadata is not None:
+            form_data[self.name] = metadata
+
+
+@dataclasses.dataclass
+class MediaGroupField(FileField):
+    kinds: Sequence[str] = dataclasses.field(
+        kw_only=True, default=("photo", "video", "document", "audio")
+    )
+    max_files: int = dataclasses.field(kw_only=True, default=10)
+    group_window: float = dataclasses.field(kw_only=True, default=0.5)
+    max_group_wait: float = dataclasses.field(kw_only=True, default=3.0)
+
+    filters: Sequence[Filter | MagicFilter] = dataclasses.field(
+        default_factory=lambda: [F.photo | F.video | F.document | F.audio]
+    )
+
+    _groups: dict[tuple[int, int, str], list[Message]] = dataclasses.field(
+        init=False, default_factory=dict
+    )
+    _collected: OrderedDict[tuple[int, int, str], None] = dataclasses.field(
+        init=False, default_factory=OrderedDict
+    )
+    _warned: bool = dataclasses.field(init=False, default=False)
+
+    @property
+    def group_key(self) -> str:
+        return f"{self.name}-group"
+
+    def continues_album(self, message: Message, form_data: dict[str, Any]) -> bool:
+        return (
+            message.media_group_id is not None
+            and form_data.get(self.group_key) == message.media_group_id
+        )
+
+    def _check_collected(self, key: tuple[int, int, str]):
+        if key not in self._collected or self._warned:
+            return
+
+        self._warned = True
+        logger.warning(
+            f"Album items for {self.name} arrive after their group was collected, "
+            f"updates are probably handled sequentially; items are merged "
+            f"in storage, one write per item"
+        )
+
+    async def collect_messages(self, message: Message) -> list[Message] | None:
+        if message.media_group_id is None:
+            return [message]
+
+        bot_id = 0 if message.bot is None else message.bot.id
+        key = (bot_id, message.chat.id, message.media_group_id)
+
+        group = self._groups.get(key)
+        if group is not None:
+            group.append(message)
+            return None
+
+        self._check_collected(key)
+        group = self._groups[key] = [message]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_group_wait
+
+        try:
+            collected = 0
+            while collected != len(group) and loop.time() < deadline:
+                collected = len(group)
+                await asyncio.sleep(self.group_window)
+
+        finally:
+            del self._groups[key]
+            self._collected[key] = None
+            self._collected.move_to_end(key)
+            while len(self._collected) > MAX_COLLECTED_GROUPS:
+                self._collected.popitem(last=False)
+
+        logger.debug(f"Collected {len(group)} messages of {message.media_group_id}")
+        return sorted(group, key=lambda item: item.message_id)
+
+    async def handle_messages(
+        self,
+        messages: list[Message],
+        form_data: dict[str, Any],
+        state: FSMContext,
+        **kwargs,
+    ):
+        await super(FileField, self).handle_message(
+            messages[0], form_data, state, **kwargs
+        )
+
+        errors: list[str] = []
+        received = await asyncio.gather(
+            *(
+                self.receive(message, errors=errors, **kwargs)
+                for message in messages[: self.max_files]
+            )
+        )
+        files = [metadata for metadata in received if metadata is not None]
+        if self.continues_album(messages[0], form_data):
+            files = (form_data.get(self.name) or []) + files
+            files = files[: self.max_files]
+
+        if files:
+            form_data[self.name] = files
+            form_data[self.group_key] = messages[0].media_group_id
+
+        for error in dict.fromkeys(errors):
+            await self.send_error(messages[0], error, **kwargs)
+
+    async def handle_message(
+        self, message: Message, form_data: dict[str, Any], state: FSMContext, **kwargs
+    ):
+        await self.handle_messages([message], form_data, state, **kwargs)
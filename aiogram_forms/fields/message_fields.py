@@ -1,5 +1,7 @@
 import dataclasses
-from typing import Any, Sequence
+import logging
+from typing import Any, Protocol, Sequence
+import uuid
 
 from aiogram import F
 from aiogram.filters import Filter
@@ -8,6 +10,9 @@ from aiogram.types import Message
 from aiogram.utils.magic_filter import MagicFilter
 
 from aiogram_forms.fields.abstract_fields import MessageReplyField
+from aiogram_forms.i18n import N_
+
+logger = logging.getLogger(__name__)
 
 
 @dataclasses.dataclass
@@ -29,6 +34,12 @@ class StringField(MessageReplyField):
         form_data[self.name] = text
 
 
+class TextStore(Protocol):
+    async def append(self, key: str, text: str, **kwargs) -> None: ...
+
+    async def clear(self, key: str, **kwargs) -> None: ...
+
+
 @dataclasses.dataclass
 class MultiStringField(StringField):
     clear_message: str = dataclasses.field(kw_only=True)
@@ -37,6 +48,15 @@ class MultiStringField(StringField):
 
     one_time_state: bool = False
 
+    max_lines: int = dataclasses.field(kw_only=True, default=0)
+    max_chars: int = dataclasses.field(kw_only=True, default=0)
+    max_bytes: int = dataclasses.field(kw_only=True, default=0)
+    preview_length: int = dataclasses.field(kw_only=True, default=0)
+    text_store: TextStore | None = dataclasses.field(kw_only=True, default=None)
+    limit_text: str = dataclasses.field(
+        kw_only=True, default=N_("😢 The text is too long, the line was not added")
+    )
+
     def __post_init__(self):
         super().__post_init__()
 
@@ -62,17 +82,107 @@ class MultiStringField(StringField):
             end_text = end_text.lower()
 
         if text == clear_text:
-            form_data[self.name] = None
+            await self.clear_text(form_data, **kwargs)
             return
 
         if text == end_text:
             await state.set_state(None)
             return
 
-        await self.handle_text(message.text, form_data)
+        if not await self.handle_text(message.text, form_data, **kwargs):
+            await self.send_error(message, self.limit_text, **kwargs)
 
-    async def handle_text(self, text: str, form_data: dict[str, Any], **kwargs):
-        if form_data.get(self.name) is None:
-            form_data[self.name] = []
+    @property
+    def holds_external_data(self) -> bool:
+        return self.text_store is not None
+
+    @property
+    def stats_key(self) -> str:
+        return f"{self.name}-stats"
+
+    @property
+    def preview_key(self) -> str:
+        return f"{self.name}-preview"
+
+    def get_stats(self, form_data: dict[str, Any]) -> dict[str, int]:
+        stats = form_data.get(self.stats_key)
+        if stats is not None:
+            return stats
+
+        lines = form_data.get(self.name)
+        if not isinstance(lines, list):
+            lines = []
+
+        return {
+            "lines": len(lines),
+            "chars": sum(len(line) for line in lines),
+            "bytes": sum(len(line.encode()) for line in lines),
+        }
+
+    def fits_limits(self, stats: dict[str, int]) -> bool:
+        if self.max_lines > 0 and stats["lines"] > self.max_lines:
+            return False
+
+        if self.max_chars > 0 and stats["chars"] > self.max_chars:
+            return False
+
+        if self.max_bytes > 0 and stats["bytes"] > self.max_bytes:
+            return False
+
+        return True
+
+    def update_preview(self, text: str, form_data: dict[str, Any]):
+        preview = form_data.get(self.preview_key)
+        preview = text if not preview else f"{preview}\n{text}"
+
+        if len(preview) > self.preview_length:
+            preview = "…" + preview[len(preview) - self.preview_length + 1 :]
+
+        form_data[self.preview_key] = preview
+
+    async def release(self, form_data: dict[str, Any], **kwargs):
+        key = form_data.get(self.name)
+        if self.text_store is not None and isinstance(key, str):
+            await self.text_store.clear(key, **kwargs)
+
+    async def clear_text(self, form_data: dict[str, Any], **kwargs):
+        await self.release(form_data, **kwargs)
+
+        form_data[self.name] = None
+        form_data.pop(self.stats_key, None)
+        form_data.pop(self.preview_key, None)
+
+    async def handle_text(
+        self, text: str, form_data: dict[str, Any], **kwargs
+    ) -> bool:
+        stats = self.get_stats(form_data)
+        stats = {
+            "lines": stats["lines"] + 1,
+            "chars": stats["chars"] + len(text),
+            "bytes": stats["bytes"] + len(text.encode()),
+        }
+
+        if not self.fits_limits(stats):
+            logger.debug(f"Text for {self.name} exceeds limits and is ignored")
+            return False
+
+        if self.text_store is None:
+            if form_data.get(self.name) is None:
+                form_data[self.name] = []
+
+            form_data[self.name].append(text)
+
+        else:
+            if form_data.get(self.name) is None:
+                form_data[self.name] = (
+                    f"{self.parent_form_name}-{self.name}-{uuid.uuid4().hex}"
+                )
+
+            await self.text_store.append(form_data[self.name], text, **kwargs)
+
+        form_data[self.stats_key] = stats
+
+        if self.preview_length > 0:
+            self.update_preview(text, form_data)
 
-        form_data[self.name].append(text)
+        return True
@@ -0,0 +1,45 @@
+from functools import lru_cache
+import gettext
+from pathlib import Path
+
+LOCALES_DIR = Path(__file__).resolve().parent / "translations"
+DOMAIN = "messages"
+
+
+def N_(text: str) -> str:
+    return text
+
+
+def configure_translations(locales_dir: str | Path, domain: str = DOMAIN):
+    global LOCALES_DIR, DOMAIN
+
+    LOCALES_DIR = Path(locales_dir)
+    DOMAIN = domain
+
+    get_translations.cache_clear()
+
+
+@lru_cache(maxsize=128)
+def get_translations(locale: str) -> gettext.NullTranslations:
+    return gettext.translation(
+        DOMAIN, LOCALES_DIR, languages=[locale.replace("-", "_")], fallback=True
+    )
+
+
+def get_locale(**kwargs) -> str | None:
+    locale = kwargs.get("locale")
+    if locale is not None:
+        return locale
+
+    user = kwargs.get("event_from_user")
+    if user is None:
+        return None
+
+    return user.language_code
+
+
+def translate(text: str, locale: str | None = None) -> str:
+    if locale is None:
+        return gettext.gettext(text)
+
+    return get_translations(locale).gettext(text)
@@ -1,10 +1,12 @@
 from abc import ABC, abstractmethod
 import dataclasses
-from gettext import gettext as _
-from typing import Any, Hashable
+from pathlib import Path
+from typing import Any, Hashable, Sequence
 
 import jinja2
 
+from aiogram_forms.i18n import N_, get_locale, translate
+
 
 class MessageFormatter(ABC):
     @abstractmethod
@@ -23,14 +25,18 @@ class FixedTextFormatter(MessageFormatter):
 class ConditionalMessageFormatter(MessageFormatter):
     value_name: str
     options: dict[Hashable, str]
-    default_text: str = _("😢 Text is missing")
+    default_text: str = N_("😢 Text is missing")
 
     async def __call__(self, form_data: dict[str, Any], **kwargs) -> str:
         value = form_data.get(self.value_name)
         if value is None:
-            return self.default_text
+            return translate(self.default_text, get_locale(**kwargs))
+
+        text = self.options.get(value)
+        if text is None:
+            return translate(self.default_text, get_locale(**kwargs))
 
-        return self.options.get(value, self.default_text)
+        return text
 
 
 class FormDataFormatter(MessageFormatter):
@@ -38,12 +44,56 @@ class FormDataFormatter(MessageFormatter):
         return str(form_data)
 
 
+def template_environment(
+    search_path: str | Path | Sequence[str | Path],
+    cache_directory: str | Path | None = None,
+    auto_reload: bool = False,
+    **kwargs: Any,
+) -> jinja2.Environment:
+    bytecode_cache = None
+    if cache_directory is not None:
+        Path(cache_directory).mkdir(parents=True, exist_ok=True)
+        bytecode_cache = jinja2.FileSystemBytecodeCache(str(cache_directory))
+
+    return jinja2.Environment(
+        loader=jinja2.FileSystemLoader(search_path),
+        bytecode_cache=bytecode_cache,
+        auto_reload=auto_reload,
+        **kwargs,
+    )
+
+
 @dataclasses.dataclass
 class JinjaFormatter(MessageFormatter):
-    template: str
+    template: str | None = None
     extra_values: dict[str, Any] = dataclasses.field(default_factory=dict)
+    template_name: str | None = dataclasses.field(kw_only=True, default=None)
+    environment: jinja2.Environment | None = dataclasses.field(
+        kw_only=True, default=None
+    )
+
+    _compiled: jinja2.Template | None = dataclasses.field(
+        init=False, default=None, repr=False, compare=False
+    )
+
+    def __post_init__(self):
+        if (self.template is None) == (self.template_name is None):
+            raise ValueError("Exactly one of template and template_name is required")
+
+        if self.template_name is not None and self.environment is None:
+            raise ValueError("Environment is required to load templates by name")
+
+    def get_template(self) -> jinja2.Template:
+        if self.template_name is not None and self.environment is not None:
+            return self.environment.get_template(self.template_name)
+
+        if self._compiled is None:
+            environment = self.environment or jinja2.Environment()
+            self._compiled = environment.from_string(self.template or "")
+
+        return self._compiled
 
     async def __call__(self, form_data: dict[str, Any], **kwargs) -> str:
-        return jinja2.Template(self.template).render(
-            **{**self.extra_values, **form_data}
+        return self.get_template().render(
+            **{"form_data": form_data, **self.extra_values, **form_data}
         )
@@ -1,6 +1,11 @@
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 import dataclasses
-from typing import Any, Callable
+import hashlib
+from types import CodeType
+from typing import Any, Callable, Hashable, Mapping, Sequence
+
+Predicate = Callable[[dict[str, Any]], bool]
 
 
 class FieldVisible(ABC):
@@ -8,6 +13,17 @@ class FieldVisible(ABC):
     def __call__(self, form_data: dict[str, Any], **kwargs) -> bool:
         pass
 
+    def predicates(self) -> Mapping[Hashable, Predicate] | None:
+        return None
+
+
+def _field_present(name: str) -> Predicate:
+    return lambda form_data: name in form_data
+
+
+def _field_value(name: str, validator: Callable[[Any], bool]) -> Predicate:
+    return lambda form_data: validator(form_data.get(name))
+
 
 @dataclasses.dataclass
 class RequiredFieldsVisible(FieldVisible):
@@ -20,6 +36,11 @@ class RequiredFieldsVisible(FieldVisible):
 
         return True
 
+    def predicates(self):
+        return {
+            ("present", field): _field_present(field) for field in self.required_fields
+        }
+
 
 @dataclasses.dataclass
 class RequireValueVisible(FieldVisible):
@@ -31,6 +52,13 @@ class RequireValueVisible(FieldVisible):
 
         return self.value_validator(value)
 
+    def predicates(self):
+        return {
+            ("value", self.value_name, self.value_validator): _field_value(
+                self.value_name, self.value_validator
+            )
+        }
+
 
 @dataclasses.dataclass
 class FormConditionVisible(FieldVisible):
@@ -38,3 +66,161 @@ class FormConditionVisible(FieldVisible):
 
     def __call__(self, form_data: dict[str, Any], **kwargs):
         return self.validator(form_data)
+
+    def predicates(self):
+        return {("condition", self.validator): self.validator}
+
+
+def _code_digest(code: CodeType) -> str:
+    digest = hashlib.sha1(code.co_code)
+    digest.update(repr(code.co_names).encode())
+
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            digest.update(_code_digest(const).encode())
+        elif isinstance(const, frozenset):
+            digest.update(repr(sorted(map(repr, const))).encode())
+        else:
+            digest.update(repr(const).encode())
+
+    return digest.hexdigest()
+
+
+def _stable_key(key: Any) -> str:
+    if isinstance(key, tuple):
+        return repr(tuple(_stable_key(part) for part in key))
+
+    if not callable(key):
+        return repr(key)
+
+    name = f"{getattr(key, '__module__', '')}.{getattr(key, '__qualname__', '')}"
+    code = getattr(key, "__code__", None)
+    if code is None:
+        return name
+
+    closure = []
+    for cell in getattr(key, "__closure__", None) or ():
+        try:
+            closure.append(_stable_key(cell.cell_contents))
+        except ValueError:
+            closure.append("")
+
+    defaults = getattr(key, "__defaults__", None) or ()
+    return repr((name, _code_digest(code), tuple(closure), _stable_key(defaults)))
+
+
+class CompiledVisibility:
+    cache_size: int
+
+    _predicates: list[Predicate]
+    _indexes: dict[Hashable, int]
+    _plans: dict[str, tuple[tuple[int, ...], tuple[FieldVisible, ...]]]
+    _results: OrderedDict[str, dict[int, bool]]
+
+    def __init__(self, cache_size: int = 1024):
+        self.cache_size = cache_size
+
+        self._predicates = []
+        self._indexes = {}
+        self._plans = {}
+        self._results = OrderedDict()
+
+    def add(self, name: str, visibles: Sequence[FieldVisible]):
+        compiled: list[int] = []
+        custom: list[FieldVisible] = []
+
+        for visible in visibles:
+            predicates = visible.predicates()
+            if predicates is None:
+                custom.append(visible)
+                continue
+
+            for key, predicate in predicates.items():
+                if key not in self._indexes:
+                    self._indexes[key] = len(self._predicates)
+                    self._predicates.append(predicate)
+
+                compiled.append(self._indexes[key])
+
+        self._plans[name] = (tuple(dict.fromkeys(compiled)), tuple(custom))
+
+    @property
+    def fingerprint(self) -> str:
+        layout = [_stable_key(key) for key in self._indexes]
+        layout.extend(
+            f"{name}:{compiled}:{len(custom)}"
+            for name, (compiled, custom) in self._plans.items()
+        )
+
+        return hashlib.sha1("\n".join(layout).encode()).hexdigest()
+
+    def dump_cache(self) -> dict[str, Any]:
+        return {
+            "fingerprint": self.fingerprint,
+            "results": [
+                [version, list(results.items())]
+                for version, results in self._results.items()
+            ],
+        }
+
+    def load_cache(self, data: dict[str, Any]):
+        if data.get("fingerprint") != self.fingerprint:
+            return
+
+        for version, results in data.get("results", []):
+            self._results[version] = {index: result for index, result in results}
+
+        while len(self._results) > self.cache_size:
+            self._results.popitem(last=False)
+
+    def _memo(self, version: str | None) -> dict[int, bool]:
+        if version is None:
+            return {}
+
+        results = self._results.get(version)
+        if results is None:
+            results = self._results[version] = {}
+            if len(self._results) > self.cache_size:
+                self._results.popitem(last=False)
+        else:
+            self._results.move_to_end(version)
+
+        return results
+
+    def _check(
+        self,
+        name: str,
+        form_data: dict[str, Any],
+        results: dict[int, bool],
+        **kwargs,
+    ) -> bool:
+        compiled, custom = self._plans[name]
+
+        for index in compiled:
+            result = results.get(index)
+            if result is None:
+                result = results[index] = bool(self._predicates[index](form_data))
+
+            if not result:
+                return False
+
+        return all(visible(form_data, **kwargs) for visible in custom)
+
+    def is_visible(
+        self,
+        name: str,
+        form_data: dict[str, Any],
+        version: str | None = None,
+        **kwargs,
+    ) -> bool:
+        return self._check(name, form_data, self._memo(version), **kwargs)
+
+    def evaluate(
+        self, form_data: dict[str, Any], version: str | None = None, **kwargs
+    ) -> dict[str, bool]:
+        results = self._memo(version)
+
+        return {
+            name: self._check(name, form_data, results, **kwargs)
+            for name in self._plans
+        }
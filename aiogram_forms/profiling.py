@@ -0,0 +1,236 @@
+import asyncio
+from collections import Counter
+import cProfile
+import functools
+import logging
+import os
+from pathlib import Path
+import random
+import re
+import time
+from typing import Any, Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+PROFILE_SUFFIXES = (".pstats", ".collapsed")
+
+Handler = Callable[..., Awaitable[Any]]
+
+
+def _task_stacks(task: asyncio.Task, stack: list[str]) -> list[list[str]]:
+    coro: Any = task.get_coro()
+
+    while coro is not None:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None)
+        if frame is None:
+            break
+
+        code = frame.f_code
+        filename = os.path.basename(code.co_filename)
+        stack.append(f"{code.co_qualname} ({filename}:{frame.f_lineno})")
+
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None)
+
+    waiter = getattr(task, "_fut_waiter", None)
+    if isinstance(waiter, asyncio.Task):
+        children = [waiter]
+    else:
+        children = getattr(waiter, "_children", None) or []
+
+    stacks = [
+        child_stack
+        for child in children
+        if isinstance(child, asyncio.Task) and not child.done()
+        for child_stack in _task_stacks(child, list(stack))
+    ]
+
+    return stacks or [stack]
+
+
+class _StackSampler:
+    interval: float
+    samples: Counter[str]
+
+    _task: asyncio.Task
+    _handle: asyncio.TimerHandle | None
+
+    def __init__(self, task: asyncio.Task, interval: float):
+        self.interval = interval
+        self.samples = Counter()
+
+        self._task = task
+        self._handle = None
+
+    def start(self):
+        if self._task.done():
+            return
+
+        for stack in _task_stacks(self._task, []):
+            if stack:
+                self.samples[";".join(stack)] += 1
+
+        self._handle = asyncio.get_running_loop().call_later(self.interval, self.start)
+
+    def stop(self):
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+
+class UpdateProfiler:
+    directory: Path
+    sample_rate: float
+    slow_threshold: float | None
+    sample_interval: float
+    max_files: int
+
+    _profiling: bool
+    _active: int
+    _overlapped: int
+    _counter: int
+    _writes: set[asyncio.Future]
+
+    def __init__(
+        self,
+        directory: str | Path,
+        sample_rate: float = 0.001,
+        slow_threshold: float | None = 1.0,
+        sample_interval: float = 0.01,
+        max_files: int = 200,
+    ):
+        self.directory = Path(directory)
+        self.sample_rate = sample_rate
+        self.slow_threshold = slow_threshold
+        self.sample_interval = sample_interval
+        self.max_files = max_files
+
+        self._profiling = False
+        self._active = 0
+        self._overlapped = 0
+        self._counter = 0
+        self._writes = set()
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def wrap(
+        self,
+        handler: Handler,
+        form_name: str,
+        field_name: str | None,
+        handler_type: str,
+    ) -> Handler:
+        tag = "-".join(
+            re.sub(r"[^\w.]+", "_", part)
+            for part in (form_name, field_name or "menu", handler_type)
+        )
+
+        @functools.wraps(handler)
+        async def profiled(*args, **kwargs):
+            return await self.run(tag, handler(*args, **kwargs))
+
+        return profiled
+
+    def _start_profile(self) -> cProfile.Profile | None:
+        if self._profiling or random.random() >= self.sample_rate:
+            return None
+
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            return None
+
+        self._profiling = True
+        self._overlapped = self._active
+        return profile
+
+    async def run(self, tag: str, call: Awaitable[Any]) -> Any:
+        sampler = timer = None
+        task = asyncio.current_task()
+        if self.slow_threshold is not None and task is not None:
+            sampler = _StackSampler(task, self.sample_interval)
+            timer = asyncio.get_running_loop().call_later(
+                self.slow_threshold, sampler.start
+            )
+
+        profile = self._start_profile()
+        if profile is None and self._profiling:
+            self._overlapped += 1
+
+        self._active += 1
+        started = time.perf_counter()
+
+        try:
+            return await call
+
+        finally:
+            duration = time.perf_counter() - started
+            self._active -= 1
+
+            if profile is not None:
+                profile.disable()
+                self._profiling = False
+
+                name = tag
+                if self._overlapped:
+                    logger.info(
+                        f"Profile of {tag} includes {self._overlapped} other updates"
+                    )
+                    name = f"{tag}-shared"
+
+                self._write(name, duration, ".pstats", profile.dump_stats)
+
+            if timer is not None and sampler is not None:
+                timer.cancel()
+                sampler.stop()
+
+                if sampler.samples:
+                    logger.warning(f"Update {tag} took {duration:.3f}s")
+                    self._write(
+                        tag,
+                        duration,
+                        ".collapsed",
+                        functools.partial(self._dump_samples, sampler.samples),
+                    )
+
+    @staticmethod
+    def _dump_samples(samples: Counter[str], path: Path):
+        with open(path, "w") as file:
+            for stack, count in samples.most_common():
+                file.write(f"{stack} {count}\n")
+
+    def _write(
+        self, tag: str, duration: float, suffix: str, dump: Callable[[Path], Any]
+    ):
+        self._counter += 1
+        name = (
+            f"{time.strftime('%Y%m%d-%H%M%S')}-{self._counter:06d}-"
+            f"{duration * 1000:.0f}ms-{tag}{suffix}"
+        )
+
+        future = asyncio.get_running_loop().run_in_executor(
+            None, self._dump, dump, self.directory / name
+        )
+        self._writes.add(future)
+        future.add_done_callback(self._writes.discard)
+
+    def _dump(self, dump: Callable[[Path], Any], path: Path):
+        try:
+            dump(path)
+            self.rotate()
+        except OSError:
+            logger.exception(f"Failed to write profile {path}")
+
+    def rotate(self):
+        files = sorted(
+            path
+            for path in self.directory.iterdir()
+            if path.suffix in PROFILE_SUFFIXES
+        )
+
+        for path in files[: max(0, len(files) - self.max_files)]:
+            path.unlink(missing_ok=True)
+
+    async def flush(self):
+        if self._writes:
+            await asyncio.gather(*self._writes)
@@ -0,0 +1,199 @@
+import asyncio
+from collections import deque
+import contextlib
+import contextvars
+import dataclasses
+import enum
+import inspect
+import logging
+from typing import Any, AsyncIterator, Awaitable, Coroutine, Iterator, TypeVar
+
+from aiogram import Bot
+from aiogram.client.session.middlewares.base import (
+    BaseRequestMiddleware,
+    NextRequestMiddlewareType,
+)
+from aiogram.methods import Response, TelegramMethod
+from aiogram.methods.base import TelegramType
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class Priority(enum.IntEnum):
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+current_priority: contextvars.ContextVar[Priority] = contextvars.ContextVar(
+    "aiogram_forms_priority", default=Priority.INTERACTIVE
+)
+
+
+@contextlib.contextmanager
+def priority(value: Priority) -> Iterator[None]:
+    token = current_priority.set(value)
+    try:
+        yield
+    finally:
+        current_priority.reset(token)
+
+
+@dataclasses.dataclass
+class QueueStats:
+    submitted: int = 0
+    completed: int = 0
+    promoted: int = 0
+    waiting: int = 0
+    max_waiting: int = 0
+    wait_time: float = 0.0
+    max_wait: float = 0.0
+
+    @property
+    def mean_wait(self) -> float:
+        return self.wait_time / self.submitted if self.submitted else 0.0
+
+
+class PriorityScheduler:
+    concurrency: int
+    max_background_wait: float
+    stats: dict[Priority, QueueStats]
+
+    _active: int
+    _queues: dict[Priority, deque[tuple[float, asyncio.Future]]]
+    _tasks: set[asyncio.Task]
+
+    def __init__(self, concurrency: int = 16, max_background_wait: float = 1.0):
+        self.concurrency = concurrency
+        self.max_background_wait = max_background_wait
+        self.stats = {value: QueueStats() for value in Priority}
+
+        self._active = 0
+        self._queues = {value: deque() for value in Priority}
+        self._tasks = set()
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    def _record_wait(self, stats: QueueStats, waited: float):
+        stats.wait_time += waited
+        stats.max_wait = max(stats.max_wait, waited)
+
+    async def acquire(self, value: Priority | None = None):
+        if value is None:
+            value = current_priority.get()
+
+        stats = self.stats[value]
+        stats.submitted += 1
+
+        if self._active < self.concurrency and not any(self._queues.values()):
+            self._active += 1
+            return
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        queued_at = loop.time()
+        self._queues[value].append((queued_at, future))
+
+        stats.waiting += 1
+        stats.max_waiting = max(stats.max_waiting, stats.waiting)
+        self._wake()
+
+        try:
+            await future
+
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()
+
+            raise
+
+        finally:
+            stats.waiting -= 1
+            self._record_wait(stats, loop.time() - queued_at)
+
+    def release(self):
+        self._active -= 1
+        self._wake()
+
+    def _next(self) -> asyncio.Future | None:
+        for queue in self._queues.values():
+            while queue and queue[0][1].done():
+                queue.popleft()
+
+        background = self._queues[Priority.BACKGROUND]
+        if (
+            background
+            and self._queues[Priority.INTERACTIVE]
+            and asyncio.get_running_loop().time() - background[0][0]
+            >= self.max_background_wait
+        ):
+            self.stats[Priority.BACKGROUND].promoted += 1
+            logger.debug("Background work promoted after waiting too long")
+            return background.popleft()[1]
+
+        for queue in self._queues.values():
+            if queue:
+                return queue.popleft()[1]
+
+        return None
+
+    def _wake(self):
+        while self._active < self.concurrency:
+            future = self._next()
+            if future is None:
+                return
+
+            self._active += 1
+            future.set_result(None)
+
+    @contextlib.asynccontextmanager
+    async def slot(self, value: Priority | None = None) -> AsyncIterator[None]:
+        if value is None:
+            value = current_priority.get()
+
+        await self.acquire(value)
+        try:
+            yield
+        finally:
+            self.release()
+            self.stats[value].completed += 1
+
+    async def run(self, call: Awaitable[T], value: Priority | None = None) -> T:
+        try:
+            async with self.slot(value):
+                return await call
+
+        finally:
+            if inspect.iscoroutine(call):
+                call.close()
+
+    def spawn(
+        self, coro: Coroutine[Any, Any, T], value: Priority = Priority.BACKGROUND
+    ) -> asyncio.Task[T]:
+        context = contextvars.copy_context()
+        context.run(current_priority.set, value)
+
+        task = asyncio.get_running_loop().create_task(coro, context=context)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+        return task
+
+
+class ScheduledRequestMiddleware(BaseRequestMiddleware):
+    scheduler: PriorityScheduler
+
+    def __init__(self, scheduler: PriorityScheduler):
+        self.scheduler = scheduler
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        async with self.scheduler.slot():
+            return await make_request(bot, method)
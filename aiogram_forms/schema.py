@@ -0,0 +1,218 @@
+import dataclasses
+import logging
+import types
+from typing import Any, Callable, ClassVar, Iterable, Mapping, Union
+import typing
+
+from aiogram_forms.fields.abstract_fields import FormField
+from aiogram_forms.fields.click_fields import SubmitField, ToggleField, ToggleManyField
+from aiogram_forms.fields.inline_fields import ChoiceField, StaticChoiceField
+from aiogram_forms.fields.message_fields import MultiStringField, StringField
+from aiogram_forms.utils import FORM_VERSION_KEY
+
+logger = logging.getLogger(__name__)
+
+FINISHED_KEY = "finished"
+
+SCALAR_TYPES = (bool, int, float, str)
+
+Converter = Callable[[Any], Any]
+
+_UNSET: Any = object()
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _scalar_converter(expected: type) -> Converter:
+    def convert(value: Any) -> Any:
+        if type(value) is expected:
+            return value
+
+        if expected is float and type(value) is int:
+            return float(value)
+
+        raise TypeError(f"Expected {expected.__name__}, got {type(value).__name__}")
+
+    return convert
+
+
+def _list_converter(item: Converter) -> Converter:
+    def convert(value: Any) -> Any:
+        if not isinstance(value, (list, tuple)):
+            raise TypeError(f"Expected list, got {type(value).__name__}")
+
+        return [None if element is None else item(element) for element in value]
+
+    return convert
+
+
+def _union_converter(options: list[Converter]) -> Converter:
+    def convert(value: Any) -> Any:
+        for option in options:
+            try:
+                return option(value)
+            except (TypeError, ValueError):
+                continue
+
+        raise TypeError(f"Unexpected value of type {type(value).__name__}")
+
+    return convert
+
+
+def converter(annotation: Any) -> Converter:
+    if annotation in SCALAR_TYPES:
+        return _scalar_converter(annotation)
+
+    origin = typing.get_origin(annotation)
+    args = typing.get_args(annotation)
+
+    if origin in (list, tuple) and args:
+        return _list_converter(converter(args[0]))
+
+    if origin in (list, tuple):
+        return _list_converter(_identity)
+
+    if origin in (Union, types.UnionType):
+        options = [converter(arg) for arg in args if arg is not type(None)]
+        return options[0] if len(options) == 1 else _union_converter(options)
+
+    return _identity
+
+
+def field_type(field: FormField) -> Any:
+    if isinstance(field, SubmitField):
+        return None
+
+    if isinstance(field, ToggleField):
+        return bool
+
+    if isinstance(field, ToggleManyField):
+        option_types = {type(option) for option in field.options}
+        return option_types.pop() if len(option_types) == 1 else Any
+
+    if isinstance(field, StaticChoiceField):
+        if field.store_as_bitmap:
+            return int
+
+        key_types = {type(key) for key in field.choices}
+        return list[key_types.pop()] if len(key_types) == 1 else list[Any]
+
+    if isinstance(field, ChoiceField):
+        if field.option_data_type in SCALAR_TYPES:
+            return list[field.option_data_type]  # type: ignore
+
+        return list[Any]
+
+    if isinstance(field, MultiStringField):
+        return Any
+
+    if isinstance(field, StringField):
+        return str
+
+    return Any
+
+
+def _record_property(name: str) -> property:
+    def getter(record: "FormRecord") -> Any:
+        return record.get(name)
+
+    def setter(record: "FormRecord", value: Any):
+        record[name] = value
+
+    return property(getter, setter)
+
+
+class FormRecord(dict):
+    __slots__ = ()
+
+    __record_fields__: ClassVar[tuple[str, ...]] = ()
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict.__repr__(self)})"
+
+
+class FormSchema:
+    name: str
+    field_types: dict[str, Any]
+    record_type: type[FormRecord]
+
+    _converters: dict[str, Converter]
+    _checks: tuple[tuple[str, type | None], ...]
+
+    def __init__(self, name: str, field_types: Mapping[str, Any]):
+        self.name = name
+        self.field_types = {FORM_VERSION_KEY: str, FINISHED_KEY: bool, **field_types}
+
+        names = tuple(self.field_types)
+        namespace: dict[str, Any] = {"__slots__": (), "__record_fields__": names}
+        for field_name in names:
+            if field_name.isidentifier() and not hasattr(FormRecord, field_name):
+                namespace[field_name] = _record_property(field_name)
+
+        self.record_type = type(f"{name}_record", (FormRecord,), namespace)
+
+        self._converters = {
+            field_name: converter(tp) for field_name, tp in self.field_types.items()
+        }
+        self._checks = tuple(
+            (field_name, tp if tp in SCALAR_TYPES else None)
+            for field_name, tp in self.field_types.items()
+            if self._converters[field_name] is not _identity
+        )
+
+    @classmethod
+    def from_fields(cls, name: str, fields: Iterable[FormField]) -> "FormSchema":
+        return cls(
+            name,
+            {
+                field.name: tp
+                for field in fields
+                if (tp := field_type(field)) is not None
+            },
+        )
+
+    @classmethod
+    def from_dataclass(cls, struct: type) -> "FormSchema":
+        hints = typing.get_type_hints(struct)
+
+        return cls(
+            struct.__name__,
+            {field.name: hints[field.name] for field in dataclasses.fields(struct)},
+        )
+
+    def _convert(self, name: str, value: Any) -> Any:
+        try:
+            return self._converters[name](value)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Dropping invalid value of {self.name}.{name}: {e}")
+            return _UNSET
+
+    def record(self, form_data: Mapping[str, Any] | None = None) -> FormRecord:
+        if isinstance(form_data, self.record_type):
+            return form_data
+
+        record = self.record_type(form_data or ())
+        for name, scalar_type in self._checks:
+            value = record.get(name)
+            if value is None or type(value) is scalar_type:
+                continue
+
+            value = self._convert(name, value)
+            if value is _UNSET:
+                del record[name]
+            else:
+                record[name] = value
+
+        return record
+
+    def decode(self, payload: Any) -> FormRecord:
+        if payload is not None and not isinstance(payload, dict):
+            logger.warning(f"Stored data of form {self.name} is not a mapping")
+            payload = None
+
+        return self.record(payload)
+
+    def encode(self, form_data: Mapping[str, Any]) -> dict[str, Any]:
+        return dict(form_data)
@@ -0,0 +1,338 @@
+import abc
+import asyncio
+import csv
+import datetime
+import json
+import logging
+from pathlib import Path
+import time
+from typing import IO, Any, Iterable, Sequence
+
+from aiogram.types import Chat, User
+
+from aiogram_forms.fields.abstract_fields import FormField
+from aiogram_forms.fields.click_fields import SubmitField, ToggleField
+from aiogram_forms.scheduling import Priority, PriorityScheduler
+
+logger = logging.getLogger(__name__)
+
+SUBMITTED_AT_COLUMN = "submitted_at"
+CHAT_ID_COLUMN = "chat_id"
+USER_ID_COLUMN = "user_id"
+
+METADATA_SCHEMA: dict[str, type] = {
+    SUBMITTED_AT_COLUMN: str,
+    CHAT_ID_COLUMN: int,
+    USER_ID_COLUMN: int,
+}
+
+
+def schema_from_fields(fields: Iterable[FormField]) -> dict[str, type]:
+    schema = dict(METADATA_SCHEMA)
+
+    for field in fields:
+        if isinstance(field, SubmitField):
+            continue
+
+        schema[field.name] = bool if isinstance(field, ToggleField) else str
+
+    return schema
+
+
+def _coerce(value: Any, column_type: type) -> Any:
+    if value is None or type(value) is column_type:
+        return value
+
+    if column_type is str:
+        return json.dumps(value, ensure_ascii=False, default=str)
+
+    try:
+        return column_type(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class SubmissionSink(abc.ABC):
+    directory: Path
+    prefix: str
+    schema: dict[str, type]
+    batch_size: int
+    flush_interval: float
+    max_bytes: int | None
+    max_age: float | None
+    scheduler: PriorityScheduler | None
+
+    _rows: list[list[Any]]
+    _timer: asyncio.TimerHandle | None
+    _tasks: set[asyncio.Task]
+    _lock: asyncio.Lock
+    _counter: int
+    _path: Path | None
+    _opened_at: float
+
+    suffix: str
+
+    def __init__(
+        self,
+        directory: str | Path,
+        schema: dict[str, type],
+        prefix: str = "submissions",
+        batch_size: int = 1000,
+        flush_interval: float = 5.0,
+        max_bytes: int | None = 64 * 1024 * 1024,
+        max_age: float | None = 3600.0,
+        scheduler: PriorityScheduler | None = None,
+    ):
+        self.directory = Path(directory)
+        self.prefix = prefix
+        self.schema = schema
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.scheduler = scheduler
+
+        self._rows = []
+        self._timer = None
+        self._tasks = set()
+        self._lock = asyncio.Lock()
+        self._counter = 0
+        self._path = None
+        self._opened_at = 0.0
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def columns(self) -> list[str]:
+        return list(self.schema)
+
+    @property
+    def path(self) -> Path | None:
+        return self._path
+
+    def row(self, form_data: dict[str, Any], **kwargs) -> list[Any]:
+        user: User | None = kwargs.get("event_from_user")
+        chat: Chat | None = kwargs.get("event_chat")
+
+        values = {
+            SUBMITTED_AT_COLUMN: datetime.datetime.now(datetime.UTC).isoformat(),
+            CHAT_ID_COLUMN: None if chat is None else chat.id,
+            USER_ID_COLUMN: None if user is None else user.id,
+        }
+
+        return [
+            _coerce(values.get(column, form_data.get(column)), column_type)
+            for column, column_type in self.schema.items()
+        ]
+
+    async def __call__(self, form_data: dict[str, Any], **kwargs):
+        await self.write(form_data, **kwargs)
+
+    async def write(self, form_data: dict[str, Any], **kwargs):
+        self._rows.append(self.row(form_data, **kwargs))
+
+        if len(self._rows) >= self.batch_size:
+            await self.flush()
+
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(
+                self.flush_interval, self._flush_later
+            )
+
+    def _flush_later(self):
+        self._timer = None
+
+        task = asyncio.ensure_future(self._flush_in_background())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _flush_in_background(self):
+        try:
+            await self.flush()
+        except Exception:
+            logger.exception(
+                f"Failed to write submissions, {len(self._rows)} rows are kept "
+                f"for the next flush"
+            )
+
+            if self._rows and self._timer is None:
+                self._timer = asyncio.get_running_loop().call_later(
+                    self.flush_interval, self._flush_later
+                )
+
+    async def flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        async with self._lock:
+            rows, self._rows = self._rows, []
+            if not rows:
+                return
+
+            write = self._flush_rows(rows)
+            if self.scheduler is not None:
+                write = self.scheduler.run(write, Priority.BACKGROUND)
+
+            try:
+                await write
+            except BaseException:
+                self._rows[:0] = rows
+                raise
+
+    async def _flush_rows(self, rows: list[list[Any]]):
+        await asyncio.get_running_loop().run_in_executor(None, self._write_batch, rows)
+
+    async def close(self):
+        await self.flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks)
+
+        async with self._lock:
+            await asyncio.get_running_loop().run_in_executor(None, self._rotate)
+
+    def _should_rotate(self) -> bool:
+        if self._path is None:
+            return True
+
+        if self.max_age is not None and time.time() - self._opened_at >= self.max_age:
+            return True
+
+        if self.max_bytes is not None:
+            try:
+                return self._path.stat().st_size >= self.max_bytes
+            except FileNotFoundError:
+                return True
+
+        return False
+
+    def _rotate(self):
+        if self._path is None:
+            return
+
+        path, self._path = self._path, None
+        self._close_file()
+        logger.info(f"Closed submissions file {path}")
+
+    def _write_batch(self, rows: list[list[Any]]):
+        if self._should_rotate():
+            self._rotate()
+
+            self._counter += 1
+            path = self.directory / (
+                f"{self.prefix}-{time.strftime('%Y%m%d-%H%M%S')}-"
+                f"{self._counter:04d}{self.suffix}"
+            )
+            self._open_file(path)
+            self._path = path
+            self._opened_at = time.time()
+
+        try:
+            self._write_rows(rows)
+        except BaseException:
+            logger.warning(f"Failed to write {len(rows)} submissions to {self._path}")
+            self._rotate()
+            raise
+
+    @abc.abstractmethod
+    def _open_file(self, path: Path): ...
+
+    @abc.abstractmethod
+    def _write_rows(self, rows: Sequence[list[Any]]): ...
+
+    @abc.abstractmethod
+    def _close_file(self): ...
+
+
+class _TextSink(SubmissionSink):
+    _file: IO[str] | None = None
+
+    def _open_file(self, path: Path):
+        self._file = open(path, "a", newline="", encoding="utf-8")
+
+    def _close_file(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class CSVSink(_TextSink):
+    suffix = ".csv"
+
+    _writer: Any = None
+
+    def _open_file(self, path: Path):
+        super()._open_file(path)
+
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(self.columns)
+
+    def _write_rows(self, rows: Sequence[list[Any]]):
+        self._writer.writerows(rows)
+        if self._file is not None:
+            self._file.flush()
+
+
+class JsonLinesSink(_TextSink):
+    suffix = ".jsonl"
+
+    def _write_rows(self, rows: Sequence[list[Any]]):
+        if self._file is None:
+            return
+
+        columns = self.columns
+        self._file.write(
+            "".join(
+                json.dumps(dict(zip(columns, row)), ensure_ascii=False) + "\n"
+                for row in rows
+            )
+        )
+        self._file.flush()
+
+
+class ParquetSink(SubmissionSink):
+    suffix = ".parquet"
+
+    _pa: Any
+    _pq: Any
+    _arrow_schema: Any
+    _writer: Any = None
+
+    def __init__(self, directory: str | Path, schema: dict[str, type], **kwargs):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as e:
+            raise ImportError("ParquetSink requires pyarrow to be installed") from e
+
+        self._pa = pyarrow
+        self._pq = pyarrow.parquet
+
+        types = {
+            bool: pyarrow.bool_(),
+            int: pyarrow.int64(),
+            float: pyarrow.float64(),
+            str: pyarrow.string(),
+        }
+        self._arrow_schema = pyarrow.schema(
+            [(column, types[column_type]) for column, column_type in schema.items()]
+        )
+
+        super().__init__(directory, schema, **kwargs)
+
+    def _open_file(self, path: Path):
+        self._writer = self._pq.ParquetWriter(path, self._arrow_schema)
+
+    def _write_rows(self, rows: Sequence[list[Any]]):
+        arrays = [
+            self._pa.array(list(values), type=field.type)
+            for values, field in zip(zip(*rows), self._arrow_schema)
+        ]
+        self._writer.write_table(
+            self._pa.Table.from_arrays(arrays, schema=self._arrow_schema)
+        )
+
+    def _close_file(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
@@ -0,0 +1,76 @@
+import json
+import logging
+import mmap
+import os
+from pathlib import Path
+import struct
+from typing import Iterable
+
+from aiogram_forms.builder import FormBuilder
+from aiogram_forms.utils import sent_messages
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_MAGIC = b"AGFS"
+SNAPSHOT_VERSION = 2
+
+_HEADER = struct.Struct("<4sHQ")
+
+
+def save_snapshot(path: str | Path, forms: Iterable[FormBuilder]):
+    path = Path(path)
+    payload = json.dumps(
+        {
+            "forms": {form.name: form.dump_caches() for form in forms},
+            "messages": sent_messages.dump(),
+        },
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ).encode()
+
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    with open(tmp_path, "wb") as file:
+        file.write(_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(payload)))
+        file.write(payload)
+        file.flush()
+        os.fsync(file.fileno())
+
+    os.replace(tmp_path, path)
+
+
+def load_snapshot(path: str | Path, forms: Iterable[FormBuilder]) -> int:
+    try:
+        file = open(path, "rb")
+    except FileNotFoundError:
+        return 0
+
+    with file:
+        if os.fstat(file.fileno()).st_size < _HEADER.size:
+            logger.warning(f"Snapshot {path} is truncated, ignoring it")
+            return 0
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            magic, version, size = _HEADER.unpack_from(data)
+
+            if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+                logger.warning(f"Snapshot {path} has unsupported format, ignoring it")
+                return 0
+
+            if len(data) < _HEADER.size + size:
+                logger.warning(f"Snapshot {path} is truncated, ignoring it")
+                return 0
+
+            payload = json.loads(data[_HEADER.size : _HEADER.size + size])
+
+    sent_messages.load(payload.get("messages", []))
+
+    restored = 0
+    for form in forms:
+        caches = payload["forms"].get(form.name)
+        if caches is None:
+            continue
+
+        form.load_caches(caches)
+        restored += 1
+
+    return restored
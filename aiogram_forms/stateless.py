@@ -0,0 +1,196 @@
+import base64
+import binascii
+import hashlib
+import hmac
+import logging
+from typing import Any
+
+from aiogram.types import InlineKeyboardButton, Message
+
+from aiogram_forms.buttons import STATE_TARGET_CLOSE, create_state_button
+from aiogram_forms.callbacks.factories import FormStateCallback
+from aiogram_forms.fields.abstract_fields import FormField
+from aiogram_forms.fields.click_fields import SubmitField, ToggleField, ToggleManyField
+from aiogram_forms.fields.inline_fields import StaticChoiceField
+from aiogram_forms.utils import FORM_VERSION_KEY
+
+logger = logging.getLogger(__name__)
+
+STATE_VERSION = 1
+SIGNATURE_SIZE = 8
+
+STATELESS_FIELDS = (ToggleField, ToggleManyField, StaticChoiceField, SubmitField)
+
+
+def _field_width(field: FormField) -> int:
+    if isinstance(field, ToggleField):
+        return 1
+
+    if isinstance(field, ToggleManyField):
+        return max(1, (len(field.options) - 1).bit_length())
+
+    if isinstance(field, StaticChoiceField):
+        return len(field.choices)
+
+    return 0
+
+
+def _encode_token(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _decode_token(token: str) -> bytes:
+    return base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+
+
+class StateCodec:
+    form_name: str
+
+    _prefix: str
+    _secret: bytes
+    _fields: list[FormField]
+    _bits: int
+    _layout: bytes
+
+    def __init__(self, form_name: str, secret: bytes):
+        self.form_name = form_name
+
+        separator = FormStateCallback.__separator__
+        self._prefix = (
+            f"{FormStateCallback.__prefix__}{separator}{form_name}{separator}"
+        )
+        self._secret = secret
+        self._fields = []
+        self._bits = 0
+        self._layout = b""
+
+    def add(self, field: FormField):
+        if not isinstance(field, STATELESS_FIELDS):
+            raise ValueError(
+                f"Field {field.name} of type {type(field).__name__} "
+                "can not be used in stateless form"
+            )
+
+        self._fields.append(field)
+        self._bits += _field_width(field)
+
+        layout = hashlib.sha1(self._layout)
+        layout.update(
+            repr((type(field).__name__, field.name, _field_width(field))).encode()
+        )
+        self._layout = layout.digest()
+
+        FormStateCallback.pack_values(
+            form_name=self.form_name,
+            target=STATE_TARGET_CLOSE,
+            state="A" * len(_encode_token(bytes(self.token_size))),
+        )
+
+    @property
+    def token_size(self) -> int:
+        return 1 + (self._bits + 7) // 8 + SIGNATURE_SIZE
+
+    def _sign(self, data: bytes) -> bytes:
+        return hmac.digest(
+            self._secret,
+            self.form_name.encode() + self._layout + data,
+            "sha256",
+        )[:SIGNATURE_SIZE]
+
+    def encode(self, form_data: dict[str, Any]) -> str:
+        value = 0
+        shift = 0
+
+        for field in self._fields:
+            if isinstance(field, ToggleField):
+                item = int(bool(form_data.get(field.name, False)))
+            elif isinstance(field, ToggleManyField):
+                current = form_data.get(field.name)
+                item = field.options.index(current) if current in field.options else 0
+            elif isinstance(field, StaticChoiceField):
+                item = field.get_bitmap(form_data)
+            else:
+                item = 0
+
+            value |= item << shift
+            shift += _field_width(field)
+
+        data = bytes([STATE_VERSION]) + value.to_bytes((shift + 7) // 8, "little")
+
+        return _encode_token(data + self._sign(data))
+
+    def decode(self, token: str) -> dict[str, Any] | None:
+        try:
+            raw = _decode_token(token)
+        except (binascii.Error, ValueError):
+            return None
+
+        if len(raw) != self.token_size or raw[0] != STATE_VERSION:
+            return None
+
+        data, signature = raw[:-SIGNATURE_SIZE], raw[-SIGNATURE_SIZE:]
+        if not hmac.compare_digest(signature, self._sign(data)):
+            return None
+
+        value = int.from_bytes(data[1:], "little")
+        form_data: dict[str, Any] = {}
+
+        for field in self._fields:
+            width = _field_width(field)
+            item = value & ((1 << width) - 1)
+            value >>= width
+
+            if isinstance(field, ToggleField):
+                form_data[field.name] = bool(item)
+            elif isinstance(field, ToggleManyField):
+                if item >= len(field.options):
+                    return None
+
+                form_data[field.name] = field.options[item]
+                form_data[f"{field.name}-id"] = item + 1
+            elif isinstance(field, StaticChoiceField):
+                field.set_bitmap(form_data, item)
+
+        form_data[FORM_VERSION_KEY] = token
+        return form_data
+
+    def stamp(self, form_data: dict[str, Any]) -> str:
+        token = self.encode(form_data)
+        form_data[FORM_VERSION_KEY] = token
+
+        return token
+
+    @property
+    def initial_form_data(self) -> dict[str, Any]:
+        form_data = {
+            field.name: field.default_value
+            for field in self._fields
+            if field.default_value is not None
+        }
+        self.stamp(form_data)
+
+        return form_data
+
+    def read(self, message: Message | None) -> dict[str, Any]:
+        markup = None if message is None else message.reply_markup
+
+        if markup is not None:
+            for row in markup.inline_keyboard:
+                for button in row:
+                    data = button.callback_data
+                    if data is None or not data.startswith(self._prefix):
+                        continue
+
+                    form_data = self.decode(FormStateCallback.unpack(data).state)
+                    if form_data is not None:
+                        return form_data
+
+        logger.warning(f"State of form {self.form_name} is missing or invalid")
+        return self.initial_form_data
+
+    def button(
+        self, form_data: dict[str, Any], target: str, locale: str | None = None
+    ) -> InlineKeyboardButton:
+        return create_state_button(
+            self.form_name, target, self.encode(form_data), locale
+        )
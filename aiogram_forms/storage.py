@@ -0,0 +1,344 @@
+import asyncio
+from collections import OrderedDict
+import copy
+import dataclasses
+import json
+import logging
+import time
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Protocol
+import uuid
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, StateType, StorageKey
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+    from redis.asyncio.client import PubSub
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "aiogram_forms:invalidate"
+
+_MISSING: Any = object()
+
+
+class CacheInvalidator(Protocol):
+    async def publish(self, message: str) -> None: ...
+
+    async def subscribe(
+        self, on_message: Callable[[str], None], on_reset: Callable[[], None]
+    ) -> None: ...
+
+    async def close(self) -> None: ...
+
+
+@dataclasses.dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+@dataclasses.dataclass(slots=True)
+class _CacheEntry:
+    version: str
+    expires_at: float
+    state: Any = _MISSING
+    data: Any = _MISSING
+
+
+class CachedStorage(BaseStorage):
+    storage: BaseStorage
+    max_entries: int
+    ttl: float
+    invalidator: CacheInvalidator | None
+    stats: CacheStats
+
+    _entries: OrderedDict[StorageKey, _CacheEntry]
+    _epoch: int
+    _subscription: asyncio.Future | None
+
+    def __init__(
+        self,
+        storage: BaseStorage,
+        max_entries: int = 10_000,
+        ttl: float = 60.0,
+        invalidator: CacheInvalidator | None = None,
+    ):
+        self.storage = storage
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.invalidator = invalidator
+        self.stats = CacheStats()
+
+        self._entries = OrderedDict()
+        self._epoch = 0
+        self._subscription = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self):
+        self._entries.clear()
+        self._epoch += 1
+
+    def invalidate(self, key: StorageKey):
+        if self._entries.pop(key, None) is not None:
+            self.stats.invalidations += 1
+
+    async def _ensure_subscribed(self) -> bool:
+        if self.invalidator is None:
+            return True
+
+        if self._subscription is None:
+            self._subscription = asyncio.ensure_future(
+                self.invalidator.subscribe(self._on_message, self.clear)
+            )
+
+        subscription = self._subscription
+        try:
+            await asyncio.shield(subscription)
+
+        except asyncio.CancelledError:
+            if not subscription.cancelled():
+                raise
+
+            return False
+
+        except Exception:
+            if self._subscription is subscription:
+                logger.exception(
+                    "Failed to subscribe to cache invalidations, "
+                    "storage is used without cache until subscribed"
+                )
+                self._subscription = None
+                self.clear()
+
+            return False
+
+        return True
+
+    def _on_message(self, message: str):
+        try:
+            version, *fields = json.loads(message)
+            key = StorageKey(*fields)
+        except (ValueError, TypeError):
+            logger.warning(f"Malformed invalidation message {message!r}")
+            return
+
+        self._epoch += 1
+
+        entry = self._entries.get(key)
+        if entry is not None and entry.version != version:
+            self.invalidate(key)
+
+    async def _publish(self, key: StorageKey, version: str):
+        if self.invalidator is None:
+            return
+
+        message = json.dumps([version, *dataclasses.astuple(key)])
+        try:
+            await self.invalidator.publish(message)
+        except Exception:
+            logger.exception(f"Failed to publish invalidation of {key}")
+
+    def _lookup(self, key: StorageKey) -> _CacheEntry | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        if entry.expires_at <= time.monotonic():
+            del self._entries[key]
+            self.stats.expirations += 1
+            return None
+
+        self._entries.move_to_end(key)
+        return entry
+
+    def _store(self, key: StorageKey, version: str, **values: Any):
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = _CacheEntry(version=version, expires_at=0)
+        else:
+            self._entries.move_to_end(key)
+
+        entry.version = version
+        entry.expires_at = time.monotonic() + self.ttl
+        for name, value in values.items():
+            setattr(entry, name, value)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def _fill(self, key: StorageKey, version: str | None, epoch: int, **values: Any):
+        if epoch != self._epoch:
+            return
+
+        entry = self._entries.get(key)
+        if entry is None:
+            if version is None:
+                self._store(key, uuid.uuid4().hex, **values)
+            return
+
+        if entry.version == version:
+            for name, value in values.items():
+                setattr(entry, name, value)
+
+    async def _write(
+        self, key: StorageKey, call: Awaitable[None], cache: bool, **values: Any
+    ):
+        try:
+            await call
+        except BaseException:
+            self._entries.pop(key, None)
+            raise
+
+        version = uuid.uuid4().hex
+        if cache:
+            self._store(key, version, **values)
+        else:
+            self._entries.pop(key, None)
+
+        await self._publish(key, version)
+
+    async def _cached(
+        self,
+        key: StorageKey,
+        name: str,
+        load: Callable[[StorageKey], Awaitable[Any]],
+    ) -> Any:
+        if not await self._ensure_subscribed():
+            self.stats.misses += 1
+            return await load(key)
+
+        entry = self._lookup(key)
+        if entry is not None:
+            value = getattr(entry, name)
+            if value is not _MISSING:
+                self.stats.hits += 1
+                return value
+
+        self.stats.misses += 1
+
+        version = None if entry is None else entry.version
+        epoch = self._epoch
+        value = await load(key)
+        self._fill(key, version, epoch, **{name: value})
+
+        return value
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        cache = await self._ensure_subscribed()
+        await self._write(
+            key,
+            self.storage.set_state(key, state),
+            cache,
+            state=state.state if isinstance(state, State) else state,
+        )
+
+    async def get_state(self, key: StorageKey) -> str | None:
+        return await self._cached(key, "state", self.storage.get_state)
+
+    async def set_data(self, key: StorageKey, data: dict[str, Any]) -> None:
+        cache = await self._ensure_subscribed()
+        await self._write(
+            key, self.storage.set_data(key, data), cache, data=copy.deepcopy(data)
+        )
+
+    async def get_data(self, key: StorageKey) -> dict[str, Any]:
+        data = await self._cached(key, "data", self.storage.get_data)
+        return copy.deepcopy(data)
+
+    async def get_value(
+        self, storage_key: StorageKey, dict_key: str, default: Any | None = None
+    ) -> Any | None:
+        data = await self._cached(storage_key, "data", self.storage.get_data)
+        return copy.deepcopy(data.get(dict_key, default))
+
+    async def close(self) -> None:
+        if self._subscription is not None and not self._subscription.done():
+            self._subscription.cancel()
+
+        if self.invalidator is not None:
+            await self.invalidator.close()
+
+        self.clear()
+        await self.storage.close()
+
+
+class RedisInvalidator:
+    redis: "Redis"
+    channel: str
+    reconnect_delay: float
+
+    _pubsub: "PubSub | None"
+    _task: asyncio.Task | None
+
+    def __init__(
+        self,
+        redis: "Redis",
+        channel: str = INVALIDATION_CHANNEL,
+        reconnect_delay: float = 1.0,
+    ):
+        self.redis = redis
+        self.channel = channel
+        self.reconnect_delay = reconnect_delay
+
+        self._pubsub = None
+        self._task = None
+
+    async def publish(self, message: str) -> None:
+        await self.redis.publish(self.channel, message)
+
+    async def subscribe(
+        self, on_message: Callable[[str], None], on_reset: Callable[[], None]
+    ) -> None:
+        pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(self.channel)
+        except BaseException:
+            await pubsub.aclose()
+            raise
+
+        self._pubsub = pubsub
+        self._task = asyncio.create_task(self._listen(on_message, on_reset))
+
+    async def _listen(
+        self, on_message: Callable[[str], None], on_reset: Callable[[], None]
+    ):
+        assert self._pubsub is not None
+
+        while True:
+            try:
+                async for message in self._pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+
+                    data = message["data"]
+                    on_message(data.decode() if isinstance(data, bytes) else data)
+
+            except asyncio.CancelledError:
+                raise
+
+            except Exception:
+                logger.exception(f"Lost subscription to {self.channel}")
+
+            on_reset()
+            await asyncio.sleep(self.reconnect_delay)
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+            self._pubsub = None
@@ -0,0 +1,158 @@
+from collections import OrderedDict
+import dataclasses
+import logging
+import time
+from typing import Any
+
+from aiogram import Bot
+from aiogram.client.default import DefaultBotProperties
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.session.base import BaseSession
+from aiogram.client.session.middlewares.base import (
+    BaseRequestMiddleware,
+    NextRequestMiddlewareType,
+)
+from aiogram.exceptions import TelegramAPIError, TelegramRetryAfter
+from aiogram.methods import Response, TelegramMethod
+from aiogram.methods.base import TelegramType
+
+from aiogram_forms.broadcast import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass
+class TenantStats:
+    requests: int = 0
+    errors: int = 0
+    flood_errors: int = 0
+    request_time: float = 0.0
+    throttle_time: float = 0.0
+
+    @property
+    def mean_request_time(self) -> float:
+        return self.request_time / self.requests if self.requests else 0.0
+
+
+class TenantRequestMiddleware(BaseRequestMiddleware):
+    pool: "TenantPool"
+
+    def __init__(self, pool: "TenantPool"):
+        self.pool = pool
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        stats = self.pool.stats_for(bot.id)
+        bucket = self.pool.bucket_for(bot.id)
+
+        started = time.perf_counter()
+        if bucket is not None:
+            await bucket.acquire()
+
+        sent = time.perf_counter()
+        stats.throttle_time += sent - started
+        stats.requests += 1
+
+        try:
+            return await make_request(bot, method)
+
+        except TelegramRetryAfter as e:
+            stats.errors += 1
+            stats.flood_errors += 1
+            if bucket is not None:
+                bucket.pause(e.retry_after)
+
+            logger.warning(f"Bot {bot.id} hit flood limit for {e.retry_after}s")
+            raise
+
+        except TelegramAPIError:
+            stats.errors += 1
+            raise
+
+        finally:
+            stats.request_time += time.perf_counter() - sent
+
+
+class TenantPool:
+    session: BaseSession
+    rate: float | None
+    max_bots: int
+    default: DefaultBotProperties | None
+    rates: dict[int, float | None]
+    stats: dict[int, TenantStats]
+
+    _bots: OrderedDict[str, Bot]
+    _buckets: dict[int, TokenBucket]
+    _owns_session: bool
+
+    def __init__(
+        self,
+        session: BaseSession | None = None,
+        limit: int = 100,
+        rate: float | None = 30.0,
+        max_bots: int = 10_000,
+        default: DefaultBotProperties | None = None,
+    ):
+        self._owns_session = session is None
+        self.session = AiohttpSession(limit=limit) if session is None else session
+        self.rate = rate
+        self.max_bots = max_bots
+        self.default = default
+        self.rates = {}
+        self.stats = {}
+
+        self._bots = OrderedDict()
+        self._buckets = {}
+
+        self.session.middleware(TenantRequestMiddleware(self))
+
+    def bot(self, token: str, **kwargs: Any) -> Bot:
+        bot = self._bots.get(token)
+        if bot is not None:
+            self._bots.move_to_end(token)
+            return bot
+
+        bot = Bot(token, session=self.session, default=self.default, **kwargs)
+        self._bots[token] = bot
+        if len(self._bots) > self.max_bots:
+            _, evicted = self._bots.popitem(last=False)
+            self.stats.pop(evicted.id, None)
+            self._buckets.pop(evicted.id, None)
+
+        return bot
+
+    @property
+    def bots(self) -> list[Bot]:
+        return list(self._bots.values())
+
+    def set_rate(self, bot_id: int, rate: float | None):
+        self.rates[bot_id] = rate
+        self._buckets.pop(bot_id, None)
+
+    def stats_for(self, bot_id: int) -> TenantStats:
+        stats = self.stats.get(bot_id)
+        if stats is None:
+            stats = self.stats[bot_id] = TenantStats()
+
+        return stats
+
+    def bucket_for(self, bot_id: int) -> TokenBucket | None:
+        bucket = self._buckets.get(bot_id)
+        if bucket is not None:
+            return bucket
+
+        rate = self.rates.get(bot_id, self.rate)
+        if rate is None:
+            return None
+
+        bucket = self._buckets[bot_id] = TokenBucket(rate)
+        return bucket
+
+    async def close(self):
+        self._bots.clear()
+        if self._owns_session:
+            await self.session.close()
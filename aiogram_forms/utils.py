@@ -1,11 +1,85 @@
+import asyncio
+from collections import OrderedDict
 import logging
+from typing import Any, Awaitable, Mapping, TypeVar
+import uuid
 
 from aiogram import Bot
 from aiogram.exceptions import TelegramBadRequest
-from aiogram.types import InlineKeyboardMarkup
+from aiogram.methods import AnswerCallbackQuery
+from aiogram.types import CallbackQuery, InlineKeyboardMarkup
 
 logger = logging.getLogger(__name__)
 
+FORM_VERSION_KEY = "form-version"
+MAX_CONCURRENT_CALLS = 4
+MAX_DELETE_BATCH = 100
+MAX_SENT_MESSAGES = 10_000
+
+T = TypeVar("T")
+
+
+def stamp_form_data(form_data: dict[str, Any]):
+    form_data[FORM_VERSION_KEY] = uuid.uuid4().hex
+
+
+def user_form_data(form_data: Mapping[str, Any]) -> dict[str, Any]:
+    return {key: value for key, value in form_data.items() if key != FORM_VERSION_KEY}
+
+
+def _dump_markup(markup: InlineKeyboardMarkup | None) -> dict[str, Any] | None:
+    return None if markup is None else markup.model_dump(exclude_none=True)
+
+
+class SentMessages:
+    max_size: int
+
+    _messages: OrderedDict[
+        tuple[int, int, int], tuple[str | None, dict[str, Any] | None]
+    ]
+
+    def __init__(self, max_size: int = MAX_SENT_MESSAGES):
+        self.max_size = max_size
+
+        self._messages = OrderedDict()
+
+    def get(
+        self, bot_id: int, chat_id: int, message_id: int
+    ) -> tuple[str | None, dict[str, Any] | None] | None:
+        return self._messages.get((bot_id, chat_id, message_id))
+
+    def remember(
+        self,
+        bot_id: int,
+        chat_id: int,
+        message_id: int,
+        text: str | None,
+        markup: InlineKeyboardMarkup | None,
+    ):
+        key = (bot_id, chat_id, message_id)
+        self._messages[key] = (text, _dump_markup(markup))
+        self._messages.move_to_end(key)
+
+        while len(self._messages) > self.max_size:
+            self._messages.popitem(last=False)
+
+    def forget(self, bot_id: int, chat_id: int, message_id: int):
+        self._messages.pop((bot_id, chat_id, message_id), None)
+
+    def dump(self) -> list[list[Any]]:
+        return [[*key, text, markup] for key, (text, markup) in self._messages.items()]
+
+    def load(self, data: list[list[Any]]):
+        for bot_id, chat_id, message_id, text, markup in data:
+            key = (bot_id, chat_id, message_id)
+            self._messages.setdefault(key, (text, markup))
+
+        while len(self._messages) > self.max_size:
+            self._messages.popitem(last=False)
+
+
+sent_messages = SentMessages()
+
 
 async def edit_message(
     chat_id: int,
@@ -17,6 +91,18 @@ async def edit_message(
     if text is None and inline_markup is None:
         raise ValueError("text and inline_markup cannot be both None")
 
+    sent_text = None
+    sent = sent_messages.get(bot.id, chat_id, message_id)
+    if sent is not None:
+        sent_text, sent_markup = sent
+        if text is not None and text == sent_text:
+            text = None
+
+        if text is None and _dump_markup(inline_markup) == sent_markup:
+            return True
+
+    text_shown = sent_text if text is None else text
+
     try:
         if text is None:
             await bot.edit_message_reply_markup(
@@ -31,21 +117,30 @@ async def edit_message(
                 text=text,
                 reply_markup=inline_markup,
             )
+        sent_messages.remember(bot.id, chat_id, message_id, text_shown, inline_markup)
         return True
     except TelegramBadRequest as e:
         if (
             e.message
             == "Bad Request: message is not modified: specified new message content and reply markup are exactly the same as a current content and reply markup of the message"
         ):
+            sent_messages.remember(
+                bot.id, chat_id, message_id, text_shown, inline_markup
+            )
             return True
         logger.warning(f"Exception {e} raised when editing message")
 
     except Exception as e:
         logger.warning(f"Exception {e} raised when editing message")
 
+    sent_messages.forget(bot.id, chat_id, message_id)
     return False
 
 
+async def delete_message(chat_id: int, bot: Bot, message_id: int):
+    sent_messages.forget(bot.id, chat_id, message_id)
+
+
 async def delete_message(chat_id: int, bot: Bot, message_id: int):
     try:
         await bot.delete_message(
@@ -57,3 +152,135 @@ async def delete_message(chat_id: int, bot: Bot, message_id: int):
         logger.warning(f"Exception {e} raised when deleting message")
 
     return False
+
+
+async def delete_messages(chat_id: int, bot: Bot, message_ids: list[int]):
+    try:
+        for i in range(0, len(message_ids), MAX_DELETE_BATCH):
+            await bot.delete_messages(
+                chat_id=chat_id,
+                message_ids=message_ids[i : i + MAX_DELETE_BATCH],
+            )
+        return True
+    except Exception as e:
+        logger.warning(f"Exception {e} raised when deleting messages")
+
+    return False
+
+
+class MessageDeleter:
+    delay: float
+    max_batch: int
+
+    _pending: dict[tuple[int, int], tuple[Bot, list[int]]]
+    _timers: dict[tuple[int, int], asyncio.TimerHandle]
+    _tasks: set[asyncio.Task]
+
+    def __init__(self, delay: float = 1.0, max_batch: int = MAX_DELETE_BATCH):
+        self.delay = delay
+        self.max_batch = max_batch
+
+        self._pending = {}
+        self._timers = {}
+        self._tasks = set()
+
+    async def schedule(self, chat_id: int, bot: Bot, message_id: int):
+        key = (bot.id, chat_id)
+        _, message_ids = self._pending.setdefault(key, (bot, []))
+        message_ids.append(message_id)
+
+        if len(message_ids) >= self.max_batch:
+            await self.flush_chat(key)
+
+        elif key not in self._timers:
+            self._timers[key] = asyncio.get_running_loop().call_later(
+                self.delay, self._flush_later, key
+            )
+
+    def _flush_later(self, key: tuple[int, int]):
+        task = asyncio.ensure_future(self.flush_chat(key))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def flush_chat(self, key: tuple[int, int]):
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+
+        pending = self._pending.pop(key, None)
+        if pending is None:
+            return
+
+        bot, message_ids = pending
+        await delete_messages(chat_id=key[1], bot=bot, message_ids=message_ids)
+
+    async def flush(self):
+        await gather_calls(*(self.flush_chat(key) for key in list(self._pending)))
+        if self._tasks:
+            await asyncio.gather(*self._tasks)
+
+
+class RenderTracker:
+    superseded: int
+
+    _renders: dict[tuple[int, int, int], asyncio.Task]
+
+    def __init__(self):
+        self.superseded = 0
+
+        self._renders = {}
+
+    def cancel(self, bot_id: int, chat_id: int, message_id: int):
+        task = self._renders.pop((bot_id, chat_id, message_id), None)
+        if task is not None and not task.done():
+            task.cancel()
+            self.superseded += 1
+
+    async def run(
+        self, bot_id: int, chat_id: int, message_id: int, render: Awaitable[T]
+    ) -> T | None:
+        key = (bot_id, chat_id, message_id)
+        self.cancel(*key)
+
+        task = asyncio.ensure_future(render)
+        self._renders[key] = task
+
+        try:
+            return await task
+
+        except asyncio.CancelledError:
+            current = asyncio.current_task()
+            if current is not None and current.cancelling():
+                raise
+
+            logger.debug(f"Render of message {message_id} in {chat_id} superseded")
+            return None
+
+        finally:
+            if self._renders.get(key) is task:
+                del self._renders[key]
+
+
+async def gather_calls(
+    *calls: Awaitable[Any], limit: int = MAX_CONCURRENT_CALLS
+) -> list[Any]:
+    semaphore = asyncio.Semaphore(limit)
+
+    async def limited(call: Awaitable[Any]) -> Any:
+        async with semaphore:
+            return await call
+
+    return await asyncio.gather(*(limited(call) for call in calls))
+
+
+async def answer_callback(
+    callback_query: CallbackQuery,
+    *calls: Awaitable[Any],
+    webhook_reply: bool = False,
+) -> AnswerCallbackQuery | None:
+    if webhook_reply:
+        await gather_calls(*calls)
+        return callback_query.answer()
+
+    await gather_calls(*calls, callback_query.answer())
+    return None
@@ -0,0 +1,96 @@
+import asyncio
+import timeit
+
+from aiogram import F
+from aiogram.filters.callback_data import CallbackData, CallbackQueryFilter
+from aiogram.types import CallbackQuery, User
+
+from aiogram_forms.callbacks.factories import (
+    FormChoiceFieldCallback,
+    FormFieldActionCallback,
+    FormFieldCallback,
+    FormPageCallback,
+)
+
+NUMBER = 20_000
+
+FORM_NAME = "register_user"
+FIELDS = ["name", "abstract", "work_type", "work_place", "teacher", "agree"]
+
+CALLBACK = FormChoiceFieldCallback(
+    form_name=FORM_NAME, field_name="teacher", data=42, current_page=3
+)
+QUERY = CallbackQuery(
+    id="1",
+    from_user=User(id=1, is_bot=False, first_name="user"),
+    chat_instance="1",
+    data=CALLBACK.pack(),
+)
+
+
+def create_filters(fast: bool) -> list[CallbackQueryFilter]:
+    filters = []
+
+    for cls in (
+        FormFieldCallback,
+        FormFieldActionCallback,
+        FormChoiceFieldCallback,
+        FormPageCallback,
+    ):
+        for field_name in FIELDS:
+            for rule in (F.form_name == FORM_NAME, F.field_name == field_name):
+                if fast:
+                    filters.append(cls.filter(rule))
+                else:
+                    filters.append(CallbackQueryFilter(callback_data=cls, rule=rule))
+
+    return filters
+
+
+def run_filters(filters: list[CallbackQueryFilter]):
+    async def check():
+        for query_filter in filters:
+            await query_filter(QUERY)
+
+    loop = asyncio.new_event_loop()
+
+    def run():
+        loop.run_until_complete(check())
+
+    return run
+
+
+def report(name: str, base, fast, number: int = NUMBER):
+    base_time = timeit.timeit(base, number=number)
+    fast_time = timeit.timeit(fast, number=number)
+
+    print(
+        f"{name}: {base_time / number * 1e6:.2f} us -> "
+        f"{fast_time / number * 1e6:.2f} us ({base_time / fast_time:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    report("pack", lambda: CallbackData.pack(CALLBACK), CALLBACK.pack)
+    report(
+        "build and pack",
+        lambda: CallbackData.pack(
+            FormChoiceFieldCallback(
+                form_name=FORM_NAME, field_name="teacher", data=42, current_page=3
+            )
+        ),
+        lambda: FormChoiceFieldCallback.pack_values(
+            form_name=FORM_NAME, field_name="teacher", data=42, current_page=3
+        ),
+    )
+    report(
+        "unpack",
+        lambda: CallbackData.unpack.__func__(FormChoiceFieldCallback, QUERY.data),
+        lambda: FormChoiceFieldCallback.unpack(QUERY.data),
+    )
+    report(
+        f"filters of one update ({len(create_filters(False))})",
+        run_filters(create_filters(False)),
+        run_filters(create_filters(True)),
+        number=NUMBER // 10,
+    )
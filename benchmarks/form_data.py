@@ -0,0 +1,74 @@
+import json
+import timeit
+
+from aiogram_forms.schema import FormSchema
+
+NUMBER = 20_000
+
+SCHEMA = FormSchema(
+    "register_user",
+    {
+        "name": str,
+        "abstract": str,
+        "work_type": str,
+        "work_place": list[str],
+        "teacher": list[int],
+        "company_name": list[int],
+        "agree": bool,
+    },
+)
+
+FORM_DATA = {
+    "form-version": "7b8158cecad34e24bc964f5e9060bc6b",
+    "name": "Bob",
+    "abstract": "A study of " * 10,
+    "work_type": "science",
+    "work_place": ["mit"],
+    "teacher": [1, 2, 3],
+    "agree": True,
+    "teacher-filter": "smith",
+}
+
+PAYLOAD = json.dumps(FORM_DATA)
+
+
+def update(form_data):
+    form_data["agree"] = not form_data.get("agree")
+    form_data["form-version"] = "0" * 32
+
+
+def dict_roundtrip():
+    form_data = json.loads(PAYLOAD)
+    update(form_data)
+    return json.dumps(form_data)
+
+
+def schema_roundtrip():
+    form_data = SCHEMA.decode(json.loads(PAYLOAD))
+    update(form_data)
+    return json.dumps(SCHEMA.encode(form_data))
+
+
+def report(name: str, base, checked, number: int = NUMBER):
+    base_time = timeit.timeit(base, number=number)
+    checked_time = timeit.timeit(checked, number=number)
+
+    print(
+        f"{name}: {base_time / number * 1e6:.2f} us -> "
+        f"{checked_time / number * 1e6:.2f} us "
+        f"(+{(checked_time - base_time) / number * 1e6:.2f} us)"
+    )
+
+
+if __name__ == "__main__":
+    report(
+        "load",
+        lambda: json.loads(PAYLOAD),
+        lambda: SCHEMA.decode(json.loads(PAYLOAD)),
+    )
+    report("update roundtrip", dict_roundtrip, schema_roundtrip)
+
+    form_data = json.loads(PAYLOAD)
+    record = SCHEMA.decode(json.loads(PAYLOAD))
+    report("get", lambda: form_data.get("name"), lambda: record.get("name"))
+    report("attribute", lambda: form_data["name"], lambda: record.name)
@@ -0,0 +1,49 @@
+import asyncio
+import datetime
+import itertools
+
+from aiogram import Bot
+from aiogram.client.session.base import BaseSession
+from aiogram.methods import GetMe, SendMessage
+from aiogram.types import Chat, Message, User
+import pytest
+
+
+class FakeSession(BaseSession):
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+        self.message_ids = itertools.count(100)
+
+    async def close(self):
+        pass
+
+    async def make_request(self, bot, method, timeout=None):
+        self.calls.append(method)
+        await asyncio.sleep(0)
+
+        if isinstance(method, SendMessage):
+            return Message(
+                message_id=next(self.message_ids),
+                date=datetime.datetime.now(),
+                chat=Chat(id=method.chat_id, type="private"),
+                text=method.text,
+            )
+
+        if isinstance(method, GetMe):
+            return User(id=42, is_bot=True, first_name="bot", username="bot")
+
+        return True
+
+    async def stream_content(self, *args, **kwargs):
+        yield b""
+
+
+@pytest.fixture
+def session():
+    return FakeSession()
+
+
+@pytest.fixture
+def bot(session):
+    return Bot("42:TEST", session=session)
@@ -0,0 +1,172 @@
+import asyncio
+import json
+
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from aiogram_forms import accounting
+from aiogram_forms.accounting import (
+    SizeHistogram,
+    SizeRecorder,
+    record_memory_storage,
+    scan_redis,
+)
+from aiogram_forms.builder import FormBuilder
+from aiogram_forms.fields.click_fields import ToggleField
+from aiogram_forms.fields.inline_fields import StaticChoiceField
+from aiogram_forms.modifiers.formatters import FixedTextFormatter
+from aiogram_forms.schema import FormSchema
+
+
+def test_histogram_quantiles_are_bucket_bounds():
+    histogram = SizeHistogram()
+    for size in (1, 2, 3, 100, 1000):
+        histogram.add(size)
+
+    assert histogram.count == 5
+    assert histogram.mean == 221.2
+    assert histogram.buckets == {1: 1, 2: 2, 7: 1, 10: 1}
+    assert histogram.quantile(0.5) == 3
+    assert histogram.quantile(0.8) == 127
+    assert histogram.quantile(1.0) == 1000
+    assert SizeHistogram().quantile(0.5) == 0
+
+
+def test_recorder_measures_serialized_size():
+    recorder = SizeRecorder()
+    form_data = {"name": "Ann", "tags": ["a", "b"]}
+
+    total = recorder.record("profile", form_data, "1:1")
+
+    assert total == 33
+    assert recorder.forms["profile"].total == total
+    assert recorder.fields[("profile", "name")].total == len('"name": "Ann"')
+    assert recorder.fields[("profile", "tags")].total == len('"tags": ["a", "b"]')
+    assert [key for key, _ in recorder.form_fields("profile")] == ["tags", "name"]
+
+
+def test_largest_sessions_are_bounded():
+    recorder = SizeRecorder(top=2)
+    for i in range(20):
+        recorder.record("profile", {"text": "x" * i}, f"{i}:{i}")
+
+    assert recorder.largest_sessions() == [
+        ("profile", "19:19", 31),
+        ("profile", "18:18", 30),
+    ]
+    assert len(recorder._largest) <= 8
+    assert "19:19" in recorder.format_report()
+
+
+def test_sampled_out_writes_are_not_recorded():
+    recorder = SizeRecorder(sample_rate=0.0)
+
+    assert recorder.record("profile", {"name": "Ann"}) is None
+    assert recorder.forms == {}
+
+
+class PackedSchema(FormSchema):
+    def encode(self, form_data):
+        return {"packed": 1}
+
+
+def test_form_records_encoded_payload():
+    recorder = SizeRecorder()
+    form = FormBuilder(
+        "poll",
+        FixedTextFormatter("Menu"),
+        size_recorder=recorder,
+        schema=PackedSchema("poll", {"agree": bool}),
+    )
+    form.add_field(ToggleField("agree", "Agree"))
+    key = StorageKey(bot_id=42, chat_id=1, user_id=1)
+    state = FSMContext(MemoryStorage(), key)
+
+    asyncio.run(form.update_form_data(state, {"agree": True, "note": "x" * 100}))
+
+    assert list(recorder.fields) == [("poll", "packed")]
+    assert recorder.forms["poll"].total == len(json.dumps({"packed": 1}))
+    assert recorder.largest_sessions() == [("poll", "1:1", 13)]
+
+
+def test_field_records_encoded_payload():
+    recorder = SizeRecorder()
+    field = StaticChoiceField("level", "Level", choices={1: "Low", 2: "High"})
+    field.parent_form_name = "poll"
+    field.form_schema = PackedSchema("poll", {"level": list[int]})
+    field.size_recorder = recorder
+    state = FSMContext(MemoryStorage(), StorageKey(bot_id=42, chat_id=1, user_id=1))
+
+    asyncio.run(field.update_parent_form_data(state, {"level": [1, 2]}))
+
+    assert list(recorder.fields) == [("poll", "packed")]
+
+
+def test_memory_storage_is_scanned():
+    storage = MemoryStorage()
+    recorder = SizeRecorder()
+
+    async def run():
+        await storage.set_data(
+            StorageKey(bot_id=42, chat_id=1, user_id=2),
+            {"poll": {"agree": True}, "poll-root_message": 5, "other": {"a": 1}},
+        )
+
+    asyncio.run(run())
+    record_memory_storage(recorder, storage, forms=["poll"])
+
+    assert list(recorder.forms) == ["poll"]
+    assert recorder.largest_sessions() == [("poll", "1:2", 15)]
+
+
+class FakeRedis:
+    def __init__(self, values):
+        self.values = values
+        self.batches = []
+
+    async def scan_iter(self, match, count):
+        for key in self.values:
+            yield key
+
+    async def mget(self, keys):
+        self.batches.append(len(keys))
+        return [self.values[key] for key in keys]
+
+
+def test_redis_keys_are_scanned_in_batches():
+    redis = FakeRedis(
+        {
+            b"fsm:42:1:1:data": json.dumps({"poll": {"agree": True}}),
+            b"fsm:42:2:2:data": "not json",
+            b"fsm:42:3:3:data": None,
+            b"fsm:42:4:4:data": json.dumps({"poll": {"agree": False}}),
+        }
+    )
+
+    async def run():
+        return [item async for item in scan_redis(redis, batch=3)]
+
+    assert asyncio.run(run()) == [
+        ("42:1:1", {"poll": {"agree": True}}),
+        ("42:4:4", {"poll": {"agree": False}}),
+    ]
+    assert redis.batches == [3, 1]
+
+
+def test_cli_prints_report(monkeypatch, capsys):
+    calls = []
+
+    async def scan(url, prefix, top, forms):
+        calls.append((url, prefix, top, forms))
+        recorder = SizeRecorder(top=top)
+        recorder.record("poll", {"agree": True}, "42:1:1")
+        return recorder
+
+    monkeypatch.setattr(accounting, "scan", scan)
+    accounting.main(["redis://localhost", "--top", "5", "--form", "poll"])
+
+    assert calls == [("redis://localhost", "fsm", 5, ["poll"])]
+    output = capsys.readouterr().out
+    assert output.splitlines()[1].split()[:3] == ["poll", "1", "15"]
+    assert "42:1:1" in output
@@ -0,0 +1,171 @@
+import asyncio
+
+from aiogram.exceptions import TelegramForbiddenError, TelegramRetryAfter
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.methods import SendMessage
+
+from aiogram_forms.broadcast import BROADCAST_ERROR, Broadcaster, JsonLinesProgress
+from aiogram_forms.builder import FormBuilder
+from aiogram_forms.fields.click_fields import ToggleField
+from aiogram_forms.modifiers.formatters import FixedTextFormatter
+
+
+def make_form() -> FormBuilder:
+    form = FormBuilder("poll", FixedTextFormatter("Menu"))
+    form.add_field(ToggleField("agree", "Agree"))
+    return form
+
+
+def key(chat_id: int) -> StorageKey:
+    return StorageKey(bot_id=42, chat_id=chat_id, user_id=chat_id)
+
+
+async def save(batch):
+    pass
+
+
+def test_broadcast_sends_to_every_chat(bot, session):
+    report = asyncio.run(
+        Broadcaster(bot, rate=1000).run(range(1, 11), "Hi", None, save)
+    )
+
+    assert report.sent == 10
+    assert sorted(call.chat_id for call in session.calls) == list(range(1, 11))
+
+
+def test_flood_retries_are_capped(bot, session, tmp_path):
+    async def make_request(bot, method, timeout=None):
+        raise TelegramRetryAfter(method=method, message="flood", retry_after=0)
+
+    session.make_request = make_request
+    progress = JsonLinesProgress(tmp_path / "progress.jsonl")
+    broadcaster = Broadcaster(
+        bot, rate=1000, per_chat_interval=0, max_flood_retries=2, progress=progress
+    )
+
+    report = asyncio.run(broadcaster.run([1], "Hi", None, save))
+
+    assert report.sent == 0
+    assert report.failed == 1
+    assert report.retries == 2
+    assert BROADCAST_ERROR in (tmp_path / "progress.jsonl").read_text()
+
+
+def test_errors_and_chat_times_are_bounded(bot, session):
+    async def make_request(bot, method, timeout=None):
+        raise TelegramForbiddenError(method=method, message="blocked")
+
+    session.make_request = make_request
+    broadcaster = Broadcaster(
+        bot, rate=1000, per_chat_interval=0, concurrency=2, max_errors=3
+    )
+
+    report = asyncio.run(broadcaster.run(range(100), "Hi", None, save))
+
+    assert report.failed == 100
+    assert len(report.errors) == 3
+    assert len(broadcaster._last_sent) <= 2
+
+
+def test_form_data_is_written_before_send(bot, session):
+    form = make_form()
+    storage = MemoryStorage()
+    prepared = []
+    make_request = session.make_request
+
+    async def checked_request(bot, method, timeout=None):
+        if isinstance(method, SendMessage):
+            data = await storage.get_data(key(method.chat_id))
+            prepared.append(data.get(form.name) is not None)
+
+        return await make_request(bot, method, timeout)
+
+    session.make_request = checked_request
+    report = asyncio.run(
+        form.broadcast(Broadcaster(bot, rate=1000), storage, [1, 2, 3])
+    )
+
+    assert report.sent == 3
+    assert prepared == [True, True, True]
+
+
+def test_existing_sessions_are_kept(bot, session):
+    form = make_form()
+    storage = MemoryStorage()
+    make_request = session.make_request
+
+    async def opening_request(bot, method, timeout=None):
+        message = await make_request(bot, method, timeout)
+        if isinstance(method, SendMessage) and method.chat_id == 2:
+            await storage.update_data(key(2), {form.root_message_name: 7})
+
+        return message
+
+    async def run():
+        await storage.update_data(
+            key(1), {form.name: {"agree": True}, form.root_message_name: 5}
+        )
+        session.make_request = opening_request
+        await form.broadcast(
+            Broadcaster(bot, rate=1000, write_batch=10), storage, [1, 2, 3]
+        )
+
+        return [await storage.get_data(key(chat_id)) for chat_id in (1, 2, 3)]
+
+    first, second, third = asyncio.run(run())
+
+    assert first == {form.name: {"agree": True}, form.root_message_name: 5}
+    assert second[form.root_message_name] == 7
+    assert third[form.root_message_name] is not None
+    assert third[form.name]["agree"] is False
+
+
+def test_chats_are_prepared_ahead_with_bounded_writes(bot, session):
+    active = 0
+    max_active = 0
+    prepared = set()
+    overlapped = []
+    make_request = session.make_request
+
+    async def prepare(chat_id):
+        nonlocal active, max_active
+        active += 1
+        max_active = max(max_active, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        prepared.add(chat_id)
+
+    async def checked_request(bot, method, timeout=None):
+        assert method.chat_id in prepared
+        message = await make_request(bot, method, timeout)
+        overlapped.append(active > 0)
+        return message
+
+    session.make_request = checked_request
+    report = asyncio.run(
+        Broadcaster(bot, rate=1000, write_batch=8).run(
+            range(1, 41), "Hi", None, save, prepare=prepare, write_concurrency=4
+        )
+    )
+
+    assert report.sent == 40
+    assert max_active == 4
+    assert any(overlapped)
+
+
+def test_failed_prepare_fails_only_its_chat(bot, session):
+    async def prepare(chat_id):
+        if chat_id == 2:
+            raise ValueError("storage is down")
+
+    report = asyncio.run(
+        Broadcaster(bot, rate=1000, write_batch=2).run(
+            [1, 2, 3], "Hi", None, save, prepare=prepare
+        )
+    )
+
+    assert report.sent == 2
+    assert report.failed == 1
+    assert report.errors == {2: "storage is down"}
+    assert sorted(call.chat_id for call in session.calls) == [1, 3]
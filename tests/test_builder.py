@@ -0,0 +1,128 @@
+import asyncio
+import datetime
+from typing import Any
+
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.types import CallbackQuery, Chat, Message, User
+
+from aiogram_forms.builder import FormBuilder
+from aiogram_forms.callbacks.factories import FormFieldActionCallback
+from aiogram_forms.fields.abstract_fields import Action
+from aiogram_forms.fields.click_fields import SubmitField, ToggleField
+from aiogram_forms.fields.inline_fields import DynamicChoiceField
+from aiogram_forms.modifiers.formatters import (
+    FixedTextFormatter,
+    FormDataFormatter,
+    MessageFormatter,
+)
+from aiogram_forms.utils import FORM_VERSION_KEY, stamp_form_data
+
+
+class SlowFormatter(MessageFormatter):
+    def __init__(self):
+        self.delay = 0.0
+
+    async def __call__(self, form_data: dict[str, Any], **kwargs) -> str:
+        await asyncio.sleep(self.delay)
+        return "Agree" if form_data.get("agree") else "Disagree"
+
+
+def test_timed_out_button_keeps_previous_text():
+    formatter = SlowFormatter()
+    form = FormBuilder("poll", FixedTextFormatter("Menu"), render_timeout=0.05)
+    form.add_field(ToggleField("agree", formatter))
+
+    async def render(form_data):
+        stamp_form_data(form_data)
+        markup = await form._menu_keyboard(form_data, locale="en")
+        return markup.inline_keyboard[0][0].text
+
+    async def run():
+        first = await render({"agree": True})
+        formatter.delay = 1.0
+        return first, await render({"agree": False})
+
+    assert asyncio.run(run()) == ("Agree", "Agree")
+
+
+def test_form_version_is_not_passed_to_user_code():
+    submitted = []
+
+    async def submit(form_data, **kwargs):
+        submitted.append(form_data)
+
+    form = FormBuilder("poll", FormDataFormatter())
+    form.add_field(SubmitField("submit", "Submit", form_action=submit))
+    form_data = {"agree": True}
+    stamp_form_data(form_data)
+
+    async def run():
+        await form._fields["submit"].handle_click(form_data)
+        return await form._render_text(form_data)
+
+    text = asyncio.run(run())
+
+    assert FORM_VERSION_KEY in form_data
+    assert submitted == [{"agree": True, "finished": True}]
+    assert text == str({"agree": True, "finished": True})
+
+
+def test_form_version_is_not_passed_to_loaders_and_actions(bot):
+    received = []
+
+    async def load(form_data, offset=0, limit=5, **kwargs):
+        received.append(dict(form_data))
+        return ["a", "b"]
+
+    class Mark(Action):
+        name = "mark"
+        button_text = "Mark"
+
+        def prepare_value(self, field, form_data, **kwargs):
+            received.append(dict(form_data))
+            return None
+
+        async def __call__(self, field, form_data, value=None, **kwargs):
+            received.append(dict(form_data))
+            form_data["marked"] = True
+
+    form = FormBuilder("poll", FixedTextFormatter("Menu"))
+    form.add_field(
+        DynamicChoiceField(
+            "letter", "Letter", choices_loader=load, additional_actions=[Mark()]
+        )
+    )
+    storage = MemoryStorage()
+    state = FSMContext(storage, StorageKey(bot_id=42, chat_id=1, user_id=1))
+    message = Message(
+        message_id=1,
+        date=datetime.datetime.now(),
+        chat=Chat(id=1, type="private"),
+        text="Menu",
+    ).as_(bot)
+    callback_data = FormFieldActionCallback.unpack(
+        FormFieldActionCallback.pack_values(
+            form_name="poll", field_name="letter", action="mark"
+        )
+    )
+    query = CallbackQuery(
+        id="1",
+        from_user=User(id=1, is_bot=False, first_name="User"),
+        chat_instance="chat",
+        message=message,
+        data=callback_data.pack(),
+    ).as_(bot)
+
+    async def run():
+        await form.update_form_data(state, {"agree": True})
+        await form._fields["letter"].inline_handler(query, callback_data, state)
+        return await form.get_form_data(state)
+
+    stored = asyncio.run(run())
+
+    assert received
+    assert all(FORM_VERSION_KEY not in data for data in received)
+    assert stored["marked"] is True
+    assert FORM_VERSION_KEY in stored
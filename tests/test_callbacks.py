@@ -0,0 +1,16 @@
+from aiogram_forms.callbacks.factories import FormFieldCallback, FormPageCallback
+
+
+def test_pack_roundtrip():
+    packed = FormPageCallback.pack_values(form_name="form", field_name="field")
+
+    assert packed == "formpage:form:field:0:10"
+    assert FormPageCallback.unpack(packed).pack() == packed
+    assert FormFieldCallback.unpack("form:form:").field_name is None
+
+
+def test_unpacked_data_is_not_shared():
+    callback_data = FormPageCallback.unpack("formpage:form:field:1:5")
+    callback_data.page = 9
+
+    assert FormPageCallback.unpack("formpage:form:field:1:5").page == 1
@@ -0,0 +1,81 @@
+import asyncio
+
+from aiogram_forms.callbacks.factories import FormChoiceFieldCallback
+from aiogram_forms.fields.inline_fields import DynamicChoiceField, StaticChoiceField
+
+
+def click(field, data) -> FormChoiceFieldCallback:
+    return FormChoiceFieldCallback.unpack(
+        FormChoiceFieldCallback.pack_values(
+            form_name="form", field_name=field.name, data=data, current_page=0
+        )
+    )
+
+
+def press(field, form_data, *values):
+    async def run():
+        for value in values:
+            await field.field_action(click(field, value), form_data)
+
+    asyncio.run(run())
+
+
+async def load_numbers(form_data, offset=0, limit=5, **kwargs):
+    return list(range(offset, offset + limit))
+
+
+def test_converted_choice_is_toggled_off():
+    field = DynamicChoiceField(
+        "numbers",
+        "Numbers",
+        max_options=3,
+        choices_loader=load_numbers,
+        option_data_type=int,
+        option_to_data=lambda option: option,
+    )
+    form_data = {}
+
+    press(field, form_data, 1, 2, 1)
+
+    assert form_data["numbers"] == [2]
+
+
+def test_static_keys_keep_their_type():
+    field = StaticChoiceField("level", "Level", choices={1: "Low", 2: "High"})
+    form_data = {}
+
+    press(field, form_data, 1, 2)
+
+    assert form_data["level"] == [2]
+
+
+def test_bitmap_selection():
+    field = StaticChoiceField(
+        "colors",
+        "Colors",
+        choices={"r": "Red", "g": "Green", "b": "Blue"},
+        max_options=2,
+        store_as_bitmap=True,
+    )
+    form_data = {}
+
+    press(field, form_data, "b", "r")
+    assert form_data["colors"] == 0b101
+    assert field.get_values(form_data) == ["r", "b"]
+
+    press(field, form_data, "g")
+    assert field.get_values(form_data) == ["g", "b"]
+
+    press(field, form_data, "b")
+    assert form_data["colors"] == 0b010
+
+
+def test_unknown_choices_are_ignored():
+    field = StaticChoiceField(
+        "colors", "Colors", choices={"r": "Red"}, store_as_bitmap=True
+    )
+    form_data = {"colors": 1}
+
+    press(field, form_data, 7, "x")
+
+    assert form_data == {"colors": 1}
@@ -0,0 +1,105 @@
+import asyncio
+import os
+import time
+
+import jinja2
+import pytest
+
+from aiogram_forms.modifiers.formatters import JinjaFormatter, template_environment
+
+
+def write_templates(directory):
+    (directory / "macros.j2").write_text(
+        "{% macro hello(name) %}Hello, {{ name }}!{% endmacro %}"
+    )
+    (directory / "base.j2").write_text("[{% block body %}{% endblock %}]")
+    (directory / "prompt.j2").write_text(
+        '{% extends "base.j2" %}{% from "macros.j2" import hello %}'
+        "{% block body %}{{ hello(name) }} {{ end }}{% endblock %}"
+    )
+
+
+def touch_later(path, text):
+    path.write_text(text)
+    later = time.time() + 5
+    os.utime(path, (later, later))
+
+
+def test_named_templates_are_rendered(tmp_path):
+    write_templates(tmp_path)
+    environment = template_environment(tmp_path)
+    formatter = JinjaFormatter(
+        template_name="prompt.j2", environment=environment, extra_values={"end": "!"}
+    )
+    inline = JinjaFormatter(
+        '{% extends "base.j2" %}{% block body %}{{ form_data.name }}{% endblock %}',
+        environment=environment,
+    )
+
+    async def run():
+        return await formatter({"name": "Ann"}), await inline({"name": "Bob"})
+
+    assert asyncio.run(run()) == ("[Hello, Ann! !]", "[Bob]")
+
+
+def test_files_are_not_checked_by_default(tmp_path):
+    write_templates(tmp_path)
+    cached = template_environment(tmp_path)
+    reloaded = template_environment(tmp_path, auto_reload=True)
+
+    async def run():
+        results = []
+        for environment in (cached, reloaded):
+            formatter = JinjaFormatter(
+                template_name="prompt.j2", environment=environment
+            )
+            await formatter({"name": "Ann"})
+        touch_later(tmp_path / "base.j2", "<{% block body %}{% endblock %}>")
+        for environment in (cached, reloaded):
+            formatter = JinjaFormatter(
+                template_name="prompt.j2", environment=environment
+            )
+            results.append(await formatter({"name": "Ann", "end": ""}))
+
+        return results
+
+    assert asyncio.run(run()) == ["[Hello, Ann! ]", "<Hello, Ann! >"]
+
+
+def test_compiled_templates_are_reused_from_cache(tmp_path):
+    templates = tmp_path / "templates"
+    cache = tmp_path / "cache"
+    templates.mkdir()
+    write_templates(templates)
+
+    def render(environment):
+        formatter = JinjaFormatter(template_name="prompt.j2", environment=environment)
+        return asyncio.run(formatter({"name": "Ann", "end": "."}))
+
+    assert render(template_environment(templates, cache)) == "[Hello, Ann! .]"
+    assert len(list(cache.iterdir())) == 3
+
+    environment = template_environment(templates, cache)
+
+    def compile(*args, **kwargs):
+        raise AssertionError("template compiled again")
+
+    environment.compile = compile
+
+    assert render(environment) == "[Hello, Ann! .]"
+
+
+def test_template_arguments_are_checked(tmp_path):
+    environment = template_environment(tmp_path)
+
+    with pytest.raises(ValueError):
+        JinjaFormatter()
+
+    with pytest.raises(ValueError):
+        JinjaFormatter("x", template_name="x.j2", environment=environment)
+
+    with pytest.raises(ValueError):
+        JinjaFormatter(template_name="x.j2")
+
+    with pytest.raises(jinja2.TemplateNotFound):
+        JinjaFormatter(template_name="x.j2", environment=environment).get_template()
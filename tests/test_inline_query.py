@@ -0,0 +1,121 @@
+import asyncio
+import datetime
+
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.methods import AnswerInlineQuery
+from aiogram.types import InlineQuery, Message, User
+
+from aiogram_forms.fields.complex_fields import InlineQueryChoiceField
+
+CITIES = [f"city{i}" for i in range(5)]
+
+
+def make_field(loaded: list, **kwargs) -> InlineQueryChoiceField:
+    async def load(form_data, filter_str, offset=0, limit=5, **kwargs):
+        loaded.append((dict(form_data), filter_str, offset, limit))
+        cities = [city for city in CITIES if filter_str is None or filter_str in city]
+        if form_data.get("reverse"):
+            cities.reverse()
+
+        return cities[offset : offset + limit]
+
+    field = InlineQueryChoiceField(
+        "city",
+        "City",
+        choices_loader=load,
+        option_to_data=str,
+        results_limit=2,
+        **kwargs,
+    )
+    field.parent_form_name = "profile"
+    return field
+
+
+def inline_query(bot, query: str = "", offset: str = "", user_id: int = 1):
+    return InlineQuery(
+        id="1",
+        from_user=User(id=user_id, is_bot=False, first_name="User"),
+        query=query,
+        offset=offset,
+    ).as_(bot)
+
+
+def test_search_results_are_cached_per_query_and_form_data(bot):
+    loaded = []
+    field = make_field(loaded)
+
+    async def run():
+        return [
+            await field.search({}, inline_query(bot, "city"), 0),
+            await field.search({}, inline_query(bot, "city"), 0),
+            await field.search({"city": ["city0"]}, inline_query(bot, "city"), 0),
+            await field.search({}, inline_query(bot, "city", user_id=2), 0),
+            await field.search({"reverse": True}, inline_query(bot, "city"), 0),
+        ]
+
+    results = asyncio.run(run())
+
+    assert results[:4] == [(["city0", "city1"], True)] * 4
+    assert results[4] == (["city4", "city3"], True)
+    assert [entry[0] for entry in loaded] == [{}, {}, {"reverse": True}]
+
+
+def test_results_are_paged_with_offsets(bot, session):
+    field = make_field([])
+    state = FSMContext(MemoryStorage(), StorageKey(bot_id=42, chat_id=1, user_id=1))
+
+    async def run():
+        await state.update_data({"profile": {"city": ["city2"]}})
+        for offset in ("", "2", "4"):
+            await field.inline_query_handler(inline_query(bot, offset=offset), state)
+
+    asyncio.run(run())
+
+    answers = [call for call in session.calls if isinstance(call, AnswerInlineQuery)]
+    assert [answer.next_offset for answer in answers] == ["2", "4", ""]
+    assert [[result.id for result in answer.results] for answer in answers] == [
+        ["0", "1"],
+        ["2", "3"],
+        ["4"],
+    ]
+    assert answers[1].results[0].title == "✅ city2"
+
+
+def chosen_message(bot, text: str, via_bot_id: int = 42) -> Message:
+    return Message.model_validate(
+        {
+            "message_id": 1,
+            "date": datetime.datetime.now(),
+            "chat": {"id": 1, "type": "private"},
+            "via_bot": {"id": via_bot_id, "is_bot": True, "first_name": "bot"},
+            "text": text,
+        }
+    ).as_(bot)
+
+
+def test_chosen_results_are_parsed(bot):
+    field = make_field([])
+    other = make_field([])
+    other.parent_form_name = "other"
+    state = FSMContext(MemoryStorage(), StorageKey(bot_id=42, chat_id=1, user_id=1))
+    form_data = {}
+
+    async def run():
+        for text in (
+            "not a callback",
+            other.result_text("city1"),
+            field.result_text("city3"),
+        ):
+            await field.handle_message(chosen_message(bot, text), form_data, state)
+
+        await field.handle_message(
+            chosen_message(bot, field.result_text("city4"), via_bot_id=7),
+            form_data,
+            state,
+        )
+
+    asyncio.run(run())
+
+    assert form_data == {"city": ["city3"]}
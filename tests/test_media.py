@@ -0,0 +1,172 @@
+import asyncio
+import datetime
+import logging
+
+from aiogram import Dispatcher, Router
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.methods import GetFile, SendMessage
+from aiogram.types import CallbackQuery, File, Message, Update, User
+
+from aiogram_forms.builder import FormBuilder
+from aiogram_forms.callbacks.factories import FormFieldCallback
+from aiogram_forms.fields.media_fields import (
+    DirectorySink,
+    DownloadLimiter,
+    FileField,
+    MediaGroupField,
+)
+from aiogram_forms.modifiers.formatters import FixedTextFormatter
+
+
+def document_message(
+    bot, size: int | None = None, message_id: int = 1, media_group_id: str | None = None
+) -> Message:
+    return Message.model_validate(
+        {
+            "message_id": message_id,
+            "date": datetime.datetime.now(),
+            "chat": {"id": 1, "type": "private"},
+            "media_group_id": media_group_id,
+            "document": {
+                "file_id": "doc",
+                "file_unique_id": f"unique{message_id}",
+                "file_name": "cv.pdf",
+                "mime_type": "application/pdf",
+                "file_size": size,
+            },
+        }
+    ).as_(bot)
+
+
+def serve_file(session, size: int):
+    make_request = session.make_request
+
+    async def request(bot, method, timeout=None):
+        if isinstance(method, GetFile):
+            return File(file_id="doc", file_unique_id="unique", file_path="cv.pdf")
+
+        return await make_request(bot, method, timeout)
+
+    async def stream_content(url, chunk_size=65536, **kwargs):
+        for _ in range(size):
+            yield b"x"
+
+    session.make_request = request
+    session.stream_content = stream_content
+
+
+def test_file_is_downloaded(bot, session, tmp_path):
+    serve_file(session, 10)
+    field = FileField("cv", "CV", sink=DirectorySink(tmp_path), max_size=100)
+
+    metadata = asyncio.run(field.receive(document_message(bot)))
+
+    assert metadata is not None
+    assert (tmp_path / "unique1.pdf").read_bytes() == b"x" * 10
+
+
+def test_oversized_download_is_reported(bot, session, tmp_path):
+    serve_file(session, 10)
+    field = FileField("cv", "CV", sink=DirectorySink(tmp_path), max_size=5)
+
+    metadata = asyncio.run(field.receive(document_message(bot)))
+
+    assert metadata is None
+    assert list(tmp_path.iterdir()) == []
+    assert [call.text for call in session.calls if isinstance(call, SendMessage)] == [
+        field.too_large_text
+    ]
+
+
+def test_limiters_are_not_shared():
+    first = FileField("first", "First")
+    second = FileField("second", "Second")
+
+    assert first.download_limiter is not second.download_limiter
+
+
+def test_limiter_works_across_event_loops():
+    limiter = DownloadLimiter(max_downloads=1)
+
+    async def download(chat_id: int):
+        async with limiter.slot(chat_id):
+            await asyncio.sleep(0)
+
+    async def run():
+        await asyncio.wait_for(asyncio.gather(download(1), download(2)), 1)
+
+    asyncio.run(run())
+    asyncio.run(run())
+
+
+def test_sequential_album_items_are_merged(bot, session, tmp_path, caplog):
+    serve_file(session, 10)
+    field = MediaGroupField(
+        "album", "Album", sink=DirectorySink(tmp_path), group_window=0.01
+    )
+    state = FSMContext(MemoryStorage(), StorageKey(bot_id=42, chat_id=1, user_id=1))
+    form_data = {}
+
+    async def run():
+        for message_id in (1, 2, 3):
+            message = document_message(bot, message_id=message_id, media_group_id="g")
+            messages = await field.collect_messages(message)
+            await field.handle_messages(messages, form_data, state)
+
+    with caplog.at_level(logging.WARNING):
+        asyncio.run(run())
+
+    assert [item["file_unique_id"] for item in form_data["album"]] == [
+        "unique1",
+        "unique2",
+        "unique3",
+    ]
+    assert len(caplog.records) == 1
+
+
+def test_sequential_album_items_are_routed(bot, session, tmp_path):
+    serve_file(session, 10)
+    form = FormBuilder("profile", FixedTextFormatter("Menu"))
+    form.add_field(
+        MediaGroupField(
+            "album", "Album", sink=DirectorySink(tmp_path), group_window=0.01
+        )
+    )
+    router = Router()
+    form.create_callbacks_handlers(router)
+    dispatcher = Dispatcher()
+    dispatcher.include_router(router)
+    key = StorageKey(bot_id=42, chat_id=1, user_id=1)
+    user = User(id=1, is_bot=False, first_name="User")
+    click = CallbackQuery(
+        id="1",
+        from_user=user,
+        chat_instance="chat",
+        message=document_message(bot, message_id=100),
+        data=FormFieldCallback.pack_values(form_name="profile", field_name="album"),
+    )
+
+    async def run():
+        await dispatcher.storage.set_data(key, {form.root_message_name: 100})
+        await dispatcher.feed_update(bot, Update(update_id=1, callback_query=click))
+        state = await dispatcher.storage.get_state(key)
+
+        for message_id in (1, 2, 3):
+            message = document_message(bot, message_id=message_id, media_group_id="g")
+            message = message.model_copy(update={"from_user": user})
+            await dispatcher.feed_update(
+                bot, Update(update_id=message_id + 1, message=message)
+            )
+
+        return state, await dispatcher.storage.get_data(key)
+
+    state, data = asyncio.run(run())
+
+    assert state is not None
+    assert [item["file_unique_id"] for item in data["profile"]["album"]] == [
+        "unique1",
+        "unique2",
+        "unique3",
+    ]
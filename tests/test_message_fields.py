@@ -0,0 +1,180 @@
+import asyncio
+import datetime
+
+from aiogram import Dispatcher, Router
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.types import CallbackQuery, Message, Update, User
+
+from aiogram_forms.builder import FormBuilder
+from aiogram_forms.callbacks.factories import FormFieldCallback
+from aiogram_forms.fields.click_fields import SubmitField
+from aiogram_forms.fields.message_fields import MultiStringField
+from aiogram_forms.modifiers.formatters import FixedTextFormatter
+
+
+class DictStore:
+    def __init__(self):
+        self.texts = {}
+
+    async def append(self, key: str, text: str, **kwargs) -> None:
+        self.texts.setdefault(key, []).append(text)
+
+    async def clear(self, key: str, **kwargs) -> None:
+        self.texts.pop(key, None)
+
+
+def make_field(**kwargs) -> MultiStringField:
+    field = MultiStringField(
+        "notes", "Notes", clear_message="Clear", end_of_input_message="Done", **kwargs
+    )
+    field.parent_form_name = "profile"
+    return field
+
+
+def text_message(bot, text: str, message_id: int = 1) -> Message:
+    return Message.model_validate(
+        {
+            "message_id": message_id,
+            "date": datetime.datetime.now(),
+            "chat": {"id": 1, "type": "private"},
+            "from": {"id": 1, "is_bot": False, "first_name": "User"},
+            "text": text,
+        }
+    ).as_(bot)
+
+
+def make_state(bot) -> FSMContext:
+    return FSMContext(MemoryStorage(), StorageKey(bot_id=42, chat_id=1, user_id=1))
+
+
+def test_lines_over_limits_are_reported(bot, session):
+    field = make_field(max_lines=2)
+    state = make_state(bot)
+    form_data = {}
+
+    async def run():
+        for message_id, text in enumerate(["one", "two", "three"]):
+            message = text_message(bot, text, message_id)
+            await field.handle_message(message, form_data, state)
+
+    asyncio.run(run())
+
+    assert form_data["notes"] == ["one", "two"]
+    assert form_data["notes-stats"] == {"lines": 2, "chars": 6, "bytes": 6}
+    assert [call.text for call in session.calls] == [field.limit_text]
+
+
+def test_chars_and_bytes_limits():
+    by_chars = make_field(max_chars=5)
+    by_bytes = make_field(max_bytes=5)
+    chars_data = {}
+    bytes_data = {}
+
+    async def run():
+        return [
+            await by_chars.handle_text("abc", chars_data),
+            await by_chars.handle_text("def", chars_data),
+            await by_bytes.handle_text("аб", bytes_data),
+            await by_bytes.handle_text("в", bytes_data),
+        ]
+
+    assert asyncio.run(run()) == [True, False, True, False]
+    assert chars_data["notes"] == ["abc"]
+    assert bytes_data["notes"] == ["аб"]
+
+
+def test_preview_keeps_last_characters():
+    field = make_field(preview_length=8)
+    form_data = {}
+
+    async def run():
+        for text in ["first", "second", "third"]:
+            await field.handle_text(text, form_data)
+
+    asyncio.run(run())
+
+    assert form_data["notes-preview"] == "…d\nthird"
+    assert len(form_data["notes-preview"]) == 8
+
+
+def test_store_keeps_text_out_of_form_data():
+    store = DictStore()
+    field = make_field(text_store=store)
+    form_data = {}
+
+    async def run():
+        await field.handle_text("one", form_data)
+        await field.handle_text("two", form_data)
+        texts = dict(store.texts)
+        await field.clear_text(form_data)
+        return texts
+
+    texts = asyncio.run(run())
+
+    assert list(texts.values()) == [["one", "two"]]
+    assert next(iter(texts)).startswith("profile-notes-")
+    assert form_data["notes"] is None
+    assert store.texts == {}
+
+
+async def submit(form_data, **kwargs):
+    pass
+
+
+def make_routed_form(store: DictStore) -> tuple[FormBuilder, Dispatcher]:
+    form = FormBuilder("profile", FixedTextFormatter("Menu"))
+    form.add_field(
+        MultiStringField(
+            "notes",
+            "Notes",
+            clear_message="Clear",
+            end_of_input_message="Done",
+            text_store=store,
+        )
+    )
+    form.add_field(SubmitField("submit", "Submit", form_action=submit))
+    router = Router()
+    form.create_callbacks_handlers(router)
+    dispatcher = Dispatcher()
+    dispatcher.include_router(router)
+    return form, dispatcher
+
+
+def click(bot, field_name: str | None) -> Update:
+    query = CallbackQuery(
+        id="1",
+        from_user=User(id=1, is_bot=False, first_name="User"),
+        chat_instance="chat",
+        message=text_message(bot, "Menu", 100),
+        data=FormFieldCallback.pack_values(form_name="profile", field_name=field_name),
+    )
+    return Update(update_id=1, callback_query=query)
+
+
+def test_store_is_cleared_on_restart_and_finish(bot, session):
+    store = DictStore()
+    form, dispatcher = make_routed_form(store)
+    key = StorageKey(bot_id=42, chat_id=1, user_id=1)
+
+    async def start(text_key: str):
+        store.texts[text_key] = ["line"]
+        await dispatcher.storage.set_data(
+            key, {"profile": {"notes": text_key}, form.root_message_name: 100}
+        )
+
+    async def run():
+        await start("restarted")
+        await dispatcher.feed_update(bot, click(bot, None))
+        restarted = dict(store.texts)
+
+        await start("finished")
+        await dispatcher.feed_update(bot, click(bot, "submit"))
+        return restarted, dict(store.texts), await dispatcher.storage.get_data(key)
+
+    restarted, finished, data = asyncio.run(run())
+
+    assert restarted == {}
+    assert finished == {}
+    assert data["profile"] is None
@@ -0,0 +1,105 @@
+import asyncio
+import pstats
+
+from aiogram_forms.profiling import UpdateProfiler
+
+
+async def quick_handler(value):
+    return value
+
+
+async def slow_handler():
+    await asyncio.sleep(0.1)
+    return "done"
+
+
+def files(profiler: UpdateProfiler, suffix: str) -> list[str]:
+    return sorted(path.name for path in profiler.directory.glob(f"*{suffix}"))
+
+
+def test_sampled_updates_are_profiled(tmp_path):
+    profiler = UpdateProfiler(tmp_path, sample_rate=1.0, slow_threshold=None)
+    handler = profiler.wrap(quick_handler, "poll", None, "click")
+
+    async def run():
+        result = await handler(5)
+        await profiler.flush()
+        return result
+
+    assert asyncio.run(run()) == 5
+    [name] = files(profiler, ".pstats")
+    assert name.endswith("-poll-menu-click.pstats")
+    stats = pstats.Stats(str(tmp_path / name))
+    assert any(func[2] == "quick_handler" for func in stats.stats)
+
+
+def test_unsampled_updates_are_not_profiled(tmp_path):
+    profiler = UpdateProfiler(tmp_path, sample_rate=0.0, slow_threshold=None)
+    handler = profiler.wrap(quick_handler, "poll", "agree", "click")
+
+    async def run():
+        await handler(1)
+        await profiler.flush()
+
+    asyncio.run(run())
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_overlapping_profiles_are_marked_shared(tmp_path):
+    profiler = UpdateProfiler(tmp_path, sample_rate=1.0, slow_threshold=None)
+    handler = profiler.wrap(slow_handler, "poll", "agree", "click")
+
+    async def run():
+        await asyncio.gather(handler(), handler())
+        await handler()
+        await profiler.flush()
+
+    asyncio.run(run())
+
+    names = files(profiler, ".pstats")
+    assert len(names) == 2
+    assert names[0].endswith("-poll-agree-click-shared.pstats")
+    assert names[1].endswith("-poll-agree-click.pstats")
+
+
+def test_slow_updates_are_sampled(tmp_path):
+    profiler = UpdateProfiler(
+        tmp_path, sample_rate=0.0, slow_threshold=0.02, sample_interval=0.01
+    )
+    slow = profiler.wrap(slow_handler, "poll", "agree/x", "message")
+    quick = profiler.wrap(quick_handler, "poll", "agree", "message")
+
+    async def run():
+        await quick(1)
+        await slow()
+        await profiler.flush()
+
+    asyncio.run(run())
+
+    [name] = files(profiler, ".collapsed")
+    assert name.endswith("-poll-agree_x-message.collapsed")
+    lines = (tmp_path / name).read_text().splitlines()
+    assert lines
+    assert all("slow_handler (test_profiling.py:" in line for line in lines)
+    assert sum(int(line.rsplit(" ", 1)[1]) for line in lines) >= 3
+
+
+def test_old_files_are_rotated(tmp_path):
+    profiler = UpdateProfiler(
+        tmp_path, sample_rate=1.0, slow_threshold=None, max_files=2
+    )
+    handler = profiler.wrap(quick_handler, "poll", None, "click")
+    (tmp_path / "notes.txt").write_text("kept")
+
+    async def run():
+        for i in range(4):
+            await handler(i)
+            await profiler.flush()
+
+    asyncio.run(run())
+
+    names = files(profiler, ".pstats")
+    assert len(names) == 2
+    assert [name.split("-")[2] for name in names] == ["000003", "000004"]
+    assert (tmp_path / "notes.txt").exists()
@@ -0,0 +1,110 @@
+import asyncio
+
+from aiogram_forms.scheduling import (
+    Priority,
+    PriorityScheduler,
+    ScheduledRequestMiddleware,
+    current_priority,
+    priority,
+)
+
+
+async def queue_jobs(scheduler: PriorityScheduler, jobs: list[tuple[str, Priority]]):
+    order = []
+    blocker = asyncio.Event()
+
+    async def job(name: str):
+        async with scheduler.slot():
+            order.append(name)
+            if name == "first":
+                await blocker.wait()
+
+    tasks = [asyncio.create_task(job("first"))]
+    await asyncio.sleep(0)
+
+    for name, value in jobs:
+        with priority(value):
+            tasks.append(asyncio.create_task(job(name)))
+
+    await asyncio.sleep(0)
+    blocker.set()
+    await asyncio.gather(*tasks)
+
+    return order
+
+
+def test_interactive_work_goes_first():
+    scheduler = PriorityScheduler(concurrency=1, max_background_wait=60)
+    jobs = [
+        ("b0", Priority.BACKGROUND),
+        ("b1", Priority.BACKGROUND),
+        ("i0", Priority.INTERACTIVE),
+        ("i1", Priority.INTERACTIVE),
+    ]
+
+    order = asyncio.run(queue_jobs(scheduler, jobs))
+
+    assert order == ["first", "i0", "i1", "b0", "b1"]
+    assert scheduler.stats[Priority.BACKGROUND].promoted == 0
+    assert scheduler.active == 0
+
+
+def test_waiting_background_work_is_promoted():
+    scheduler = PriorityScheduler(concurrency=1, max_background_wait=0)
+    jobs = [("b0", Priority.BACKGROUND), ("i0", Priority.INTERACTIVE)]
+
+    order = asyncio.run(queue_jobs(scheduler, jobs))
+
+    assert order == ["first", "b0", "i0"]
+    assert scheduler.stats[Priority.BACKGROUND].promoted == 1
+
+
+def test_cancelled_waiters_do_not_leak_slots():
+    scheduler = PriorityScheduler(concurrency=1)
+
+    async def run():
+        blocker = asyncio.Event()
+        holder = asyncio.create_task(scheduler.run(blocker.wait()))
+        await asyncio.sleep(0)
+
+        waiter = asyncio.create_task(scheduler.run(asyncio.sleep(0)))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        blocker.set()
+        await holder
+
+        await asyncio.wait_for(scheduler.run(asyncio.sleep(0)), 1)
+
+    asyncio.run(run())
+
+    assert scheduler.active == 0
+    assert scheduler.stats[Priority.INTERACTIVE].waiting == 0
+
+
+def test_spawned_tasks_run_in_background():
+    scheduler = PriorityScheduler()
+
+    async def read_priority():
+        return current_priority.get()
+
+    async def run():
+        return await scheduler.spawn(read_priority()), current_priority.get()
+
+    spawned, caller = asyncio.run(run())
+
+    assert spawned is Priority.BACKGROUND
+    assert caller is Priority.INTERACTIVE
+
+
+def test_requests_are_scheduled(bot):
+    scheduler = PriorityScheduler()
+    bot.session.middleware(ScheduledRequestMiddleware(scheduler))
+
+    async def run():
+        with priority(Priority.BACKGROUND):
+            await bot.send_message(1, "Hi")
+
+    asyncio.run(run())
+
+    assert scheduler.stats[Priority.BACKGROUND].completed == 1
+    assert scheduler.stats[Priority.INTERACTIVE].submitted == 0
@@ -0,0 +1,62 @@
+import ast
+import asyncio
+import json
+
+from aiogram_forms.builder import FormBuilder
+from aiogram_forms.fields.click_fields import SubmitField, ToggleField
+from aiogram_forms.fields.message_fields import StringField
+from aiogram_forms.modifiers.formatters import FormDataFormatter
+from aiogram_forms.schema import FormSchema
+
+SCHEMA = FormSchema("profile", {"name": str, "agree": bool})
+
+
+def test_record_roundtrip():
+    payload = json.loads(json.dumps(SCHEMA.encode({"name": "Bob", "note": 1})))
+    record = SCHEMA.decode(payload)
+
+    assert isinstance(record, dict)
+    assert record.name == "Bob"
+    assert record.agree is None
+    assert "agree" not in record
+    assert record == {"name": "Bob", "note": 1}
+
+
+def test_wrong_types_are_dropped():
+    record = SCHEMA.decode({"name": 1, "agree": True})
+
+    assert record == {"agree": True}
+
+
+def test_data_survives_form_changes():
+    payload = SCHEMA.encode({"name": "Bob", "agree": True})
+    edited = FormSchema("profile", {"age": int, "agree": bool, "name": list[str]})
+
+    record = edited.decode(payload)
+
+    assert record == {"agree": True}
+    assert FormSchema("profile", {}).decode(payload) == payload
+
+
+def test_user_code_receives_plain_dict():
+    submitted = []
+
+    async def submit(form_data, **kwargs):
+        submitted.append(form_data)
+
+    form = FormBuilder("profile", FormDataFormatter())
+    form.add_field(StringField("name", "Name"))
+    form.add_field(ToggleField("agree", "Agree"))
+    form.add_field(SubmitField("submit", "Submit", form_action=submit))
+    form.set_schema()
+
+    record = form.schema.decode({"name": "Bob"})
+
+    async def run():
+        await form._fields["submit"].handle_click(record)
+        return await form._render_text(record)
+
+    text = asyncio.run(run())
+
+    assert type(submitted[0]) is dict
+    assert ast.literal_eval(text) == {"name": "Bob", "finished": True}
@@ -0,0 +1,124 @@
+import asyncio
+import csv
+import json
+
+import pytest
+
+from aiogram_forms.fields.click_fields import SubmitField, ToggleField
+from aiogram_forms.fields.message_fields import StringField
+from aiogram_forms.sinks import CSVSink, JsonLinesSink, schema_from_fields
+
+
+async def submit(form_data, **kwargs):
+    pass
+
+
+SCHEMA = schema_from_fields(
+    [
+        StringField("name", "Name"),
+        ToggleField("agree", "Agree"),
+        SubmitField("submit", "Submit", form_action=submit),
+    ]
+)
+
+
+class FailingSink(JsonLinesSink):
+    failures = 1
+
+    def _write_rows(self, rows):
+        if self.failures:
+            self.failures -= 1
+            raise OSError("disk full")
+
+        super()._write_rows(rows)
+
+
+def read_jsonl(directory):
+    return [
+        json.loads(line)
+        for path in sorted(directory.glob("*.jsonl"))
+        for line in path.read_text().splitlines()
+    ]
+
+
+def test_schema_from_fields():
+    assert list(SCHEMA) == ["submitted_at", "chat_id", "user_id", "name", "agree"]
+    assert SCHEMA["agree"] is bool
+
+
+def test_rows_are_written_in_batches(tmp_path):
+    async def run():
+        sink = JsonLinesSink(tmp_path, SCHEMA, batch_size=2, flush_interval=60)
+        await sink({"name": "Bob", "agree": True})
+        written = read_jsonl(tmp_path)
+        await sink({"name": ["Alice"]})
+        await sink.close()
+
+        return written
+
+    assert asyncio.run(run()) == []
+
+    rows = read_jsonl(tmp_path)
+    assert [row["name"] for row in rows] == ["Bob", '["Alice"]']
+    assert rows[0]["agree"] is True
+
+
+def test_rows_are_flushed_after_interval(tmp_path):
+    async def run():
+        sink = CSVSink(tmp_path, SCHEMA, flush_interval=0.01)
+        await sink({"name": "Bob"})
+        await asyncio.sleep(0.1)
+
+        return sink.path
+
+    path = asyncio.run(run())
+
+    with open(path, newline="") as file:
+        header, row = csv.reader(file)
+
+    assert header == list(SCHEMA)
+    assert row[3] == "Bob"
+
+
+def test_files_are_rotated(tmp_path):
+    async def run():
+        sink = JsonLinesSink(tmp_path, SCHEMA, batch_size=1, max_bytes=1)
+        for name in ("a", "b", "c"):
+            await sink({"name": name})
+
+        await sink.close()
+
+    asyncio.run(run())
+
+    assert len(list(tmp_path.glob("*.jsonl"))) == 3
+    assert [row["name"] for row in read_jsonl(tmp_path)] == ["a", "b", "c"]
+
+
+def test_failed_rows_are_kept(tmp_path):
+    async def run():
+        sink = FailingSink(tmp_path, SCHEMA, flush_interval=60)
+        await sink({"name": "Bob"})
+
+        with pytest.raises(OSError):
+            await sink.flush()
+
+        await sink({"name": "Alice"})
+        await sink.close()
+
+    asyncio.run(run())
+
+    assert [row["name"] for row in read_jsonl(tmp_path)] == ["Bob", "Alice"]
+
+
+def test_failed_open_keeps_rows(tmp_path):
+    async def run():
+        sink = JsonLinesSink(tmp_path / "exports", SCHEMA, flush_interval=0.01)
+        (tmp_path / "exports").rmdir()
+        await sink({"name": "Bob"})
+        await asyncio.sleep(0.05)
+        (tmp_path / "exports").mkdir()
+        await sink.close()
+
+    asyncio.run(run())
+
+    assert [row["name"] for row in read_jsonl(tmp_path / "exports")] == ["Bob"]
@@ -0,0 +1,75 @@
+import asyncio
+
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
+
+from aiogram_forms.builder import FormBuilder
+from aiogram_forms.fields.click_fields import ToggleField
+from aiogram_forms.modifiers.formatters import FixedTextFormatter
+from aiogram_forms.modifiers.visibles import FormConditionVisible, RequireValueVisible
+from aiogram_forms.snapshot import load_snapshot, save_snapshot
+from aiogram_forms.utils import edit_message, sent_messages
+
+
+def make_form(condition) -> FormBuilder:
+    form = FormBuilder("survey", FixedTextFormatter("Menu"))
+    form.add_field(ToggleField("agree", "Agree"))
+    form.add_field(
+        ToggleField(
+            "subscribe",
+            "Subscribe",
+            visible=[
+                RequireValueVisible("agree"),
+                FormConditionVisible(condition),
+            ],
+        )
+    )
+    return form
+
+
+def test_fingerprint_follows_condition_code():
+    first = make_form(lambda form_data: "agree" in form_data)
+    same = make_form(lambda form_data: "agree" in form_data)
+    edited = make_form(lambda form_data: "subscribe" in form_data)
+
+    assert first._visibility.fingerprint == same._visibility.fingerprint
+    assert first._visibility.fingerprint != edited._visibility.fingerprint
+
+
+def test_fingerprint_follows_closure_values():
+    def condition(name):
+        return lambda form_data: name in form_data
+
+    first = make_form(condition("agree"))
+    edited = make_form(condition("subscribe"))
+
+    assert first._visibility.fingerprint != edited._visibility.fingerprint
+
+
+def test_snapshot_skips_changed_visibility(tmp_path):
+    path = tmp_path / "forms.snapshot"
+    form = make_form(lambda form_data: True)
+    form._visibility.evaluate({"agree": True}, version="1")
+    save_snapshot(path, [form])
+
+    restored = make_form(lambda form_data: True)
+    edited = make_form(lambda form_data: False)
+    load_snapshot(path, [restored])
+    load_snapshot(path, [edited])
+
+    assert len(restored._visibility._results) == 1
+    assert len(edited._visibility._results) == 0
+
+
+def test_snapshot_restores_sent_messages(tmp_path, bot, session):
+    path = tmp_path / "forms.snapshot"
+    markup = InlineKeyboardMarkup(
+        inline_keyboard=[[InlineKeyboardButton(text="Agree", callback_data="a")]]
+    )
+
+    asyncio.run(edit_message(1, 20, bot, "Menu", markup))
+    save_snapshot(path, [])
+    sent_messages.forget(bot.id, 1, 20)
+    load_snapshot(path, [])
+    asyncio.run(edit_message(1, 20, bot, "Menu", markup))
+
+    assert len(session.calls) == 1
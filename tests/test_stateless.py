@@ -0,0 +1,84 @@
+import datetime
+
+from aiogram.types import Chat, InlineKeyboardMarkup, Message
+import pytest
+
+from aiogram_forms.buttons import STATE_TARGET_CLOSE
+from aiogram_forms.fields.click_fields import ToggleField, ToggleManyField
+from aiogram_forms.fields.inline_fields import StaticChoiceField
+from aiogram_forms.fields.message_fields import StringField
+from aiogram_forms.stateless import StateCodec
+from aiogram_forms.utils import FORM_VERSION_KEY, user_form_data
+
+
+def make_codec(secret: bytes = b"secret") -> StateCodec:
+    codec = StateCodec("order", secret)
+    codec.add(ToggleField("agree", "Agree"))
+    codec.add(ToggleManyField("kind", "Kind", options=["a", "b", "c"]))
+    codec.add(
+        StaticChoiceField(
+            "color",
+            "Color",
+            choices={"r": "Red", "g": "Green", "b": "Blue"},
+            max_options=2,
+        )
+    )
+    return codec
+
+
+def test_state_roundtrip():
+    codec = make_codec()
+    form_data = {"agree": True, "kind": "c"}
+
+    token = codec.encode(form_data)
+    decoded = codec.decode(token)
+
+    assert decoded is not None
+    assert decoded[FORM_VERSION_KEY] == token
+    assert decoded["agree"] is True
+    assert decoded["kind"] == "c"
+    assert codec.encode(user_form_data(decoded)) == token
+
+
+def test_tampered_state_is_rejected():
+    codec = make_codec()
+    token = codec.encode({"agree": True})
+    tampered = token[:-1] + ("A" if token[-1] != "A" else "B")
+
+    assert codec.decode(tampered) is None
+    assert codec.decode("not a token!") is None
+    assert make_codec(b"other").decode(token) is None
+
+
+def test_layout_change_invalidates_state():
+    token = make_codec().encode({"agree": True})
+    codec = make_codec()
+    codec.add(ToggleField("extra", "Extra"))
+
+    assert codec.decode(token) is None
+
+
+def test_only_stateless_fields_are_accepted():
+    with pytest.raises(ValueError):
+        make_codec().add(StringField("name", "Name"))
+
+
+def test_state_is_read_from_markup():
+    codec = make_codec()
+    form_data = {"agree": True, "kind": "b"}
+    markup = InlineKeyboardMarkup(
+        inline_keyboard=[[codec.button(form_data, STATE_TARGET_CLOSE)]]
+    )
+
+    message = Message(
+        message_id=1,
+        date=datetime.datetime.now(),
+        chat=Chat(id=1, type="private"),
+        reply_markup=markup,
+    )
+
+    read = codec.read(message)
+
+    assert read["agree"] is True
+    assert read["kind"] == "b"
+    assert codec.read(None) == codec.initial_form_data
@@ -0,0 +1,104 @@
+import asyncio
+
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from aiogram_forms.storage import CachedStorage
+
+KEY = StorageKey(bot_id=42, chat_id=1, user_id=1)
+
+
+class MemoryInvalidator:
+    def __init__(self, bus: list, failures: int = 0):
+        self.bus = bus
+        self.failures = failures
+        self.subscriptions = 0
+
+    async def publish(self, message: str) -> None:
+        for on_message in self.bus:
+            on_message(message)
+
+    async def subscribe(self, on_message, on_reset) -> None:
+        self.subscriptions += 1
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("unavailable")
+
+        self.bus.append(on_message)
+
+    async def close(self) -> None:
+        pass
+
+
+def test_reads_are_cached():
+    async def run():
+        inner = MemoryStorage()
+        storage = CachedStorage(inner)
+        await storage.set_data(KEY, {"name": "Bob"})
+        await inner.set_data(KEY, {"name": "Alice"})
+
+        return await storage.get_data(KEY), storage.stats
+
+    data, stats = asyncio.run(run())
+
+    assert data == {"name": "Bob"}
+    assert stats.hits == 1
+
+
+def test_cached_data_is_copied():
+    async def run():
+        storage = CachedStorage(MemoryStorage())
+        await storage.set_data(KEY, {"items": [1]})
+        (await storage.get_data(KEY))["items"].append(2)
+
+        return await storage.get_data(KEY)
+
+    assert asyncio.run(run()) == {"items": [1]}
+
+
+def test_writes_invalidate_other_workers():
+    async def run():
+        inner = MemoryStorage()
+        bus: list = []
+        first = CachedStorage(inner, invalidator=MemoryInvalidator(bus))
+        second = CachedStorage(inner, invalidator=MemoryInvalidator(bus))
+
+        await first.set_data(KEY, {"step": 1})
+        assert await second.get_data(KEY) == {"step": 1}
+        await first.set_data(KEY, {"step": 2})
+
+        return await second.get_data(KEY)
+
+    assert asyncio.run(run()) == {"step": 2}
+
+
+def test_failed_subscription_bypasses_cache_and_retries():
+    async def run():
+        inner = MemoryStorage()
+        invalidator = MemoryInvalidator([], failures=1)
+        storage = CachedStorage(inner, invalidator=invalidator)
+
+        await storage.set_data(KEY, {"step": 1})
+        assert len(storage) == 0
+
+        await inner.set_data(KEY, {"step": 2})
+
+        return await storage.get_data(KEY), len(storage), invalidator.subscriptions
+
+    data, cached, subscriptions = asyncio.run(run())
+
+    assert data == {"step": 2}
+    assert cached == 1
+    assert subscriptions == 2
+
+
+def test_entries_are_evicted():
+    async def run():
+        storage = CachedStorage(MemoryStorage(), max_entries=2)
+        for chat_id in range(3):
+            key = StorageKey(bot_id=42, chat_id=chat_id, user_id=chat_id)
+            await storage.set_data(key, {})
+
+        return len(storage), storage.stats.evictions
+
+    assert asyncio.run(run()) == (2, 1)
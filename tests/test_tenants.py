@@ -0,0 +1,117 @@
+import asyncio
+import time
+
+from aiogram.exceptions import TelegramBadRequest, TelegramRetryAfter
+
+from aiogram_forms.tenants import TenantPool
+
+
+def test_bots_share_one_session(session):
+    pool = TenantPool(session=session)
+
+    first = pool.bot("1:A")
+    second = pool.bot("2:B")
+
+    assert pool.bot("1:A") is first
+    assert first.session is second.session is session
+    assert pool.bots == [second, first]
+
+
+def test_requests_are_counted_per_bot(session):
+    pool = TenantPool(session=session, rate=None)
+    first = pool.bot("1:A")
+    second = pool.bot("2:B")
+
+    async def make_request(bot, method, timeout=None):
+        if bot.id == 2:
+            raise TelegramBadRequest(method=method, message="bad")
+
+        return True
+
+    session.make_request = make_request
+
+    async def run():
+        await first.delete_message(chat_id=1, message_id=1)
+        await first.delete_message(chat_id=1, message_id=2)
+        try:
+            await second.delete_message(chat_id=1, message_id=1)
+        except TelegramBadRequest:
+            pass
+
+    asyncio.run(run())
+
+    assert pool.stats[1].requests == 2
+    assert pool.stats[1].errors == 0
+    assert pool.stats[2].requests == 1
+    assert pool.stats[2].errors == 1
+    assert pool.stats[2].flood_errors == 0
+
+
+def test_rates_are_set_per_bot(session):
+    pool = TenantPool(session=session, rate=30)
+
+    default = pool.bucket_for(1)
+    pool.set_rate(2, 5)
+    pool.set_rate(3, None)
+
+    assert default is pool.bucket_for(1)
+    assert default.rate == 30
+    assert pool.bucket_for(2).rate == 5
+    assert pool.bucket_for(3) is None
+
+    pool.set_rate(1, 10)
+
+    assert pool.bucket_for(1) is not default
+    assert pool.bucket_for(1).rate == 10
+
+
+def test_requests_are_throttled(session):
+    pool = TenantPool(session=session, rate=20)
+    bot = pool.bot("1:A")
+    pool.bucket_for(1)._tokens = 0
+
+    async def run():
+        started = time.monotonic()
+        await bot.delete_message(chat_id=1, message_id=1)
+        await bot.delete_message(chat_id=1, message_id=2)
+        return time.monotonic() - started
+
+    assert asyncio.run(run()) >= 0.09
+    assert pool.stats[1].throttle_time >= 0.09
+
+
+def test_flood_errors_pause_the_bot(session):
+    pool = TenantPool(session=session)
+    bot = pool.bot("1:A")
+
+    async def make_request(bot, method, timeout=None):
+        raise TelegramRetryAfter(method=method, message="flood", retry_after=5)
+
+    session.make_request = make_request
+
+    async def run():
+        try:
+            await bot.delete_message(chat_id=1, message_id=1)
+        except TelegramRetryAfter:
+            pass
+
+    asyncio.run(run())
+
+    assert pool.stats[1].flood_errors == 1
+    assert pool.bucket_for(1)._paused_until > time.monotonic() + 4
+
+
+def test_evicted_bots_drop_stats_and_buckets(session):
+    pool = TenantPool(session=session, max_bots=2)
+    pool.set_rate(1, 5)
+
+    async def run():
+        for token in ("1:A", "2:B", "3:C"):
+            await pool.bot(token).delete_message(chat_id=1, message_id=1)
+
+    asyncio.run(run())
+
+    assert [bot.id for bot in pool.bots] == [2, 3]
+    assert sorted(pool.stats) == [2, 3]
+    assert sorted(pool._buckets) == [2, 3]
+    assert pool.rates == {1: 5}
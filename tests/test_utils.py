@@ -0,0 +1,54 @@
+import asyncio
+
+from aiogram.methods import EditMessageReplyMarkup, EditMessageText
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
+
+from aiogram_forms.utils import edit_message, sent_messages
+
+
+def markup(text: str) -> InlineKeyboardMarkup:
+    return InlineKeyboardMarkup(
+        inline_keyboard=[[InlineKeyboardButton(text=text, callback_data=text)]]
+    )
+
+
+def test_edits_compare_with_last_sent_text(bot, session):
+    async def run():
+        await edit_message(1, 10, bot, "T1", markup("A"))
+        await edit_message(1, 10, bot, "T0", markup("B"))
+        await edit_message(1, 10, bot, "T0", markup("C"))
+        await edit_message(1, 10, bot, "T0", markup("C"))
+        await edit_message(1, 10, bot, "<b>T0</b>", markup("C"))
+
+    asyncio.run(run())
+
+    assert [type(call) for call in session.calls] == [
+        EditMessageText,
+        EditMessageText,
+        EditMessageReplyMarkup,
+        EditMessageText,
+    ]
+    assert session.calls[1].text == "T0"
+    assert session.calls[3].text == "<b>T0</b>"
+
+
+def test_failed_edit_forgets_sent_text(bot, session):
+    make_request = session.make_request
+
+    async def failing_request(bot, method, timeout=None):
+        if method.text == "T2":
+            raise RuntimeError("network")
+
+        return await make_request(bot, method, timeout)
+
+    session.make_request = failing_request
+
+    async def run():
+        await edit_message(1, 11, bot, "T1", markup("A"))
+        assert not await edit_message(1, 11, bot, "T2", markup("A"))
+        await edit_message(1, 11, bot, "T1", markup("A"))
+
+    asyncio.run(run())
+
+    assert sent_messages.get(bot.id, 1, 11) is not None
+    assert [call.text for call in session.calls] == ["T1", "T1"]